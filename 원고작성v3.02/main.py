@@ -3,6 +3,7 @@ from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QVBoxLayout,
 from page1_model.model_page import ModelPage
 from page2_checks.checks_page import ChecksPage
 from page3_manual_checks.manual_checks_page import ManualChecksPage
+from page3_manual_checks.morph_analyzer import get_morph_analyzer
 from page4_export.export_page import ExportPage
 
 class MainWindow(QMainWindow):
@@ -33,9 +34,12 @@ class MainWindow(QMainWindow):
 
     def update_checks_page(self, model_name):
         self.checks_page.set_model_name(model_name)
+        self.manual_checks_page.set_model_name(model_name)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    # 형태소 분석기(JVM)는 창을 띄우는 동안 백그라운드에서 미리 준비한다
+    get_morph_analyzer().warm_up()
     window = MainWindow()
     window.showMaximized()
     sys.exit(app.exec_())
@@ -1,10 +1,15 @@
 import pandas as pd
 import os
+import sys
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QMessageBox, QApplication, QAbstractItemView, QAction
 )
 from PyQt5.QtCore import Qt
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.keyword_store import get_keyword_store
+
 class KeywordTableWidget(QTableWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -21,8 +26,8 @@ class KeywordTableWidget(QTableWidget):
         self.addAction(self.create_action("붙여넣기", self.paste_selection, "Ctrl+V"))
         self.addAction(self.create_action("삭제", self.delete_selection, "Delete"))
 
-        # Connect cell change signal to the save function
-        self.cellChanged.connect(self.save_keywords)
+        # 셀이 바뀌면 해당 셀만 keywords.db에 저장
+        self.cellChanged.connect(self.save_cell)
 
     def create_action(self, name, method, shortcut):
         action = QAction(name, self)
@@ -31,45 +36,49 @@ class KeywordTableWidget(QTableWidget):
         return action
 
     def load_keywords(self):
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        keywords_path = os.path.join(base_dir, 'data', 'keywords.xlsx')
-        
+        # 불러오는 동안에는 cellChanged가 셀마다 저장하지 않도록 신호를 막는다 (사용자 편집만 저장)
+        self.blockSignals(True)
         try:
-            df = pd.read_excel(keywords_path)
+            df = get_keyword_store().load_dataframe()
             self.setColumnCount(len(df.columns))
             self.setHorizontalHeaderLabels(df.columns)
 
-            # Set row count to maximum of 50 or the length of the dataframe
-            row_count = max(50, len(df))
+            # Set row count to maximum of 50 or the last stored row
+            row_count = max(50, int(df.index.max()) + 1 if len(df) else 0)
             self.setRowCount(row_count)
             
+            for row in range(row_count):
+                for col in range(self.columnCount()):
+                    self.setItem(row, col, QTableWidgetItem(""))
+
+            # 인덱스가 keywords.db의 position이므로 같은 행에 표시
             for index, row in df.iterrows():
                 for col_index, value in enumerate(row):
                     self.setItem(index, col_index, QTableWidgetItem(str(value) if pd.notna(value) else ""))
 
-            # Fill remaining rows with empty cells
-            for row in range(len(df), row_count):
-                for col in range(self.columnCount()):
-                    self.setItem(row, col, QTableWidgetItem(""))
-
         except Exception as e:
             QMessageBox.critical(self, "로드 실패", str(e))
+        finally:
+            self.blockSignals(False)
 
-    def save_keywords(self):
-        rows = []
-        for row in range(self.rowCount()):
-            row_data = {}
-            for col in range(self.columnCount()):
-                item = self.item(row, col)
-                row_data[self.horizontalHeaderItem(col).text()] = item.text() if item else ""
-            rows.append(row_data)
-        df = pd.DataFrame(rows)
+    def cell_value(self, row, col):
+        item = self.item(row, col)
+        return (item.text() if item else "") or None
+
+    def save_cells(self, cells):
         try:
-            df.to_excel(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'keywords.xlsx'), index=False)
-            # QMessageBox.information(self, "저장 성공", "키워드가 성공적으로 저장되었습니다.") # 저장 성공 메시지 제거
+            get_keyword_store().update_cells([
+                (row, self.horizontalHeaderItem(col).text(), self.cell_value(row, col)) for row, col in cells
+            ])
         except Exception as e:
             QMessageBox.critical(self, "저장 실패", str(e))
 
+    def save_cell(self, row, col):
+        self.save_cells([(row, col)])
+
+    def save_keywords(self):
+        self.save_cells([(row, col) for row in range(self.rowCount()) for col in range(self.columnCount())])
+
     def copy_selection(self):
         selected_ranges = self.selectedRanges()
         if not selected_ranges:
@@ -100,16 +109,30 @@ class KeywordTableWidget(QTableWidget):
         start_row = selected_ranges[0].topRow()
         start_col = selected_ranges[0].leftColumn()
         
+        # 붙여넣은 셀은 한 번의 트랜잭션으로 저장
+        changed_cells = []
+        self.blockSignals(True)
         for row_offset, row_data in enumerate(pasted_data.split('\n')):
             for col_offset, cell_data in enumerate(row_data.split('\t')):
-                self.setItem(start_row + row_offset, start_col + col_offset, QTableWidgetItem(cell_data))
+                row, col = start_row + row_offset, start_col + col_offset
+                if row >= self.rowCount() or col >= self.columnCount():
+                    continue
+                self.setItem(row, col, QTableWidgetItem(cell_data))
+                changed_cells.append((row, col))
+        self.blockSignals(False)
+        self.save_cells(changed_cells)
 
     def delete_selection(self):
         selected_ranges = self.selectedRanges()
+        changed_cells = []
+        self.blockSignals(True)
         for selected_range in selected_ranges:
             for row in range(selected_range.topRow(), selected_range.bottomRow() + 1):
                 for col in range(selected_range.leftColumn(), selected_range.rightColumn() + 1):
                     self.setItem(row, col, QTableWidgetItem(""))
+                    changed_cells.append((row, col))
+        self.blockSignals(False)
+        self.save_cells(changed_cells)
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.keyword_store import get_keyword_store
+from scripts.metrics import metrics, collect_metrics
+from scripts.workspace import get_workspace_dir, find_draft_path, read_paragraphs
+
+def load_check_list(model_name):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    check_list_path = os.path.join(base_dir, 'data', 'model', model_name, 'check_list.json')
+    if not os.path.exists(check_list_path):
+        raise FileNotFoundError(f"Check list settings file does not exist: {check_list_path}")
+    with open(check_list_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def is_check_enabled(check_list, check_name):
+    settings = check_list.get(check_name)
+    return isinstance(settings, dict) and settings.get("enabled", True) is not False
+
+def load_paragraphs(doc_path):
+    return read_paragraphs(doc_path)
+
+def get_check_workers(model_config):
+    value = str((model_config or {}).get("check_workers", "")).strip().lower()
+    if value in ("auto", "0"):
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(value))
+    except ValueError:
+        return 1
+
+def split_chunks(items, workers, chunks_per_worker=4):
+    # 작업자마다 여러 덩어리를 주어 문서 길이 차이로 한 작업자만 늦게 끝나는 것을 줄인다
+    chunk_size = max(1, -(-len(items) // (workers * chunks_per_worker)))
+    return [items[index:index + chunk_size] for index in range(0, len(items), chunk_size)]
+
+def check_document(doc_path, checks, check_list):
+    paragraphs = load_paragraphs(doc_path)
+    outcomes = {}
+    with metrics.timer("check_document_seconds"):
+        for module in checks:
+            is_valid, detail = module.run_check(paragraphs, check_list[module.CHECK_NAME])
+            outcomes[module.CHECK_NAME] = ('O' if is_valid else 'X', detail)
+    return paragraphs, outcomes
+
+def check_documents(module_names, check_list, documents):
+    # 프로세스 풀 작업자에서 실행: [(title, doc_path)] 덩어리를 검사해 결과만 돌려준다
+    checks = [importlib.import_module(name) for name in module_names]
+    return [(title, doc_path) + check_document(doc_path, checks, check_list) for title, doc_path in documents]
+
+class CheckEngine:
+    # 문서를 한 번만 읽고 활성화된 모든 검사를 같은 텍스트에 실행한다
+    def __init__(self, model_name, check_modules, workers=1):
+        self.model_name = model_name
+        self.check_modules = [module for _, module in check_modules if hasattr(module, 'run_check')]
+        self.workers = max(1, workers)
+        self.executor = None
+        self.paragraphs = {}
+        # 검사별 세부 결과 (글자수, 금지어 위치 등)
+        self.details = {}
+
+        self.workspace_dir = get_workspace_dir()
+
+    def enabled_checks(self, check_list=None):
+        if check_list is None:
+            check_list = load_check_list(self.model_name)
+        return [module for module in self.check_modules if is_check_enabled(check_list, module.CHECK_NAME)]
+
+    def status_columns(self):
+        return [module.STATUS_COLUMN for module in self.enabled_checks()]
+
+    def get_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def check_all(self, documents, checks, check_list):
+        if self.workers <= 1 or len(documents) <= 1:
+            for title, doc_path in documents:
+                yield (title, doc_path) + check_document(doc_path, checks, check_list)
+            return
+
+        module_names = [module.__name__ for module in checks]
+        executor = self.get_executor()
+        futures = [executor.submit(collect_metrics, check_documents, module_names, check_list, chunk)
+                   for chunk in split_chunks(documents, self.workers)]
+        for future in futures:
+            # 작업자 프로세스에서 기록된 검사 시간, 읽은 바이트 등을 부모 프로세스 지표에 합친다
+            results, worker_metrics = future.result()
+            metrics.merge(worker_metrics)
+            yield from results
+
+    def run(self, titles=None):
+        check_list = load_check_list(self.model_name)
+        checks = self.enabled_checks(check_list)
+        store = get_keyword_store()
+        keywords_df = store.load_dataframe()
+
+        results = {module.CHECK_NAME: {} for module in checks}
+        for module in checks:
+            self.details.setdefault(module.CHECK_NAME, {})
+
+        documents = []
+        for title in keywords_df['제목']:
+            if not isinstance(title, str) or not title:
+                continue
+            # titles가 주어지면 해당 문서만 다시 검사하고 나머지는 이전 결과를 유지
+            if titles is not None and title not in titles:
+                continue
+            doc_path = find_draft_path(self.workspace_dir, title)
+            if doc_path is None:
+                print(f"Document not found for title: {title}")
+                self.paragraphs.pop(title, None)
+                for module in checks:
+                    results[module.CHECK_NAME][title] = 'X'
+                    self.details[module.CHECK_NAME].pop(title, None)
+                continue
+            documents.append((title, doc_path))
+
+        for title, doc_path, paragraphs, outcomes in self.check_all(documents, checks, check_list):
+            metrics.inc("stage_items_total", stage="check")
+            self.paragraphs[title] = paragraphs
+            for check_name, (result, detail) in outcomes.items():
+                results[check_name][title] = result
+                self.details[check_name][title] = detail
+                print(f"Title: {title}, {check_name}: {result} ({detail})")
+
+        # 모든 문서의 결과를 한 번의 트랜잭션으로 저장
+        with store.transaction():
+            for module in checks:
+                store.update_statuses(module.STATUS_COLUMN, results[module.CHECK_NAME])
+        return results
@@ -1,18 +1,23 @@
 import os
 import sys
+import time
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QListWidget, QSplitter, QPushButton, QLineEdit, QMessageBox, QTextEdit, QTableWidget, QTableWidgetItem, QHBoxLayout, QFormLayout, QListView, QAbstractItemView, QAction, QInputDialog, QListWidgetItem
+    QWidget, QVBoxLayout, QLabel, QListWidget, QSplitter, QPushButton, QLineEdit, QMessageBox, QPlainTextEdit, QTableWidget, QTableWidgetItem, QHBoxLayout, QFormLayout, QListView, QAbstractItemView, QAction, QInputDialog, QListWidgetItem
 )
-from PyQt5.QtCore import Qt, QTimer, QStringListModel
-import subprocess
+from PyQt5.QtCore import Qt, QStringListModel, QProcess, QProcessEnvironment
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))    
 
 from page1_model.model_functions import load_model_settings, save_model_settings
+from scripts.progress_events import parse_event_line
+from scripts.progress_window import LOG_MAX_LINES
 
 class ChecksPage(QWidget):
     def __init__(self, model_name="default_model", parent=None):
         super().__init__(parent)
         self.model_name = model_name
+        self.process = None
+        self.process_started = None
+        self.stdout_buffer = b""
         self.layout = QVBoxLayout(self)
         self.splitter = QSplitter(Qt.Horizontal)
 
@@ -98,14 +103,20 @@ class ChecksPage(QWidget):
         self.right_layout.addLayout(self.substitution_buttons_layout)
 
         self.run_button = QPushButton("Run script")
-        self.run_button.clicked.connect(self.run_scripts)
+        self.run_button.clicked.connect(lambda: self.run_scripts())
         self.right_layout.addWidget(self.run_button)
 
+        self.resume_button = QPushButton("Resume script")
+        self.resume_button.clicked.connect(lambda: self.run_scripts(resume=True))
+        self.right_layout.addWidget(self.resume_button)
+
         self.progress_label = QLabel("진행 상황: 대기 중")
         self.right_layout.addWidget(self.progress_label)
 
-        self.progress_text_edit = QTextEdit()
+        # 검사 로그는 ProgressWindow와 같이 오래된 줄부터 버린다 (키워드가 많아도 위젯이 계속 커지지 않도록)
+        self.progress_text_edit = QPlainTextEdit()
         self.progress_text_edit.setReadOnly(True)
+        self.progress_text_edit.setMaximumBlockCount(LOG_MAX_LINES)
         self.right_layout.addWidget(self.progress_text_edit)
 
         self.splitter.addWidget(self.right_widget)
@@ -229,45 +240,83 @@ class ChecksPage(QWidget):
         self.save_model_setting("substitution_pairs", "substitution_list", substitution_pairs)
         QMessageBox.information(self, "Success", "Substitution pairs saved successfully.")
 
-    def run_scripts(self):
+    def run_scripts(self, resume=False):
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         writing_sequence_script = os.path.join(base_dir, "scripts", "writing_sequence.py")
-        progress_file = os.path.join(base_dir, "data", "progress.txt")
 
-        if os.path.exists(progress_file):
-            os.remove(progress_file)
+        if self.process is not None and self.process.state() != QProcess.NotRunning:
+            QMessageBox.warning(self, "Warning", "이미 실행 중입니다.")
+            return
 
         self.progress_label.setText("진행 상황: 실행 중")
         self.progress_text_edit.clear()
-
-        process = subprocess.Popen(['python', writing_sequence_script, self.model_name], stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding='cp949')
-
-        timer = QTimer(self)
-        timer.timeout.connect(lambda: self.update_progress(process, progress_file))
-        timer.start(1000)
-
-        def on_finished():
-            timer.stop()
-            self.update_progress(process, progress_file, True)
+        self.stdout_buffer = b""
+
+        args = [writing_sequence_script, self.model_name, '--events']
+        if resume:
+            args.append('--resume')
+
+        # stdout에는 JSON lines 이벤트만 나오므로 줄 단위로 읽어 처리한다
+        self.process = QProcess(self)
+        environment = QProcessEnvironment.systemEnvironment()
+        environment.insert("PYTHONIOENCODING", "utf-8")
+        self.process.setProcessEnvironment(environment)
+        self.process.readyReadStandardOutput.connect(self.read_events)
+        self.process.readyReadStandardError.connect(self.read_errors)
+        self.process.finished.connect(self.on_process_finished)
+        # 하위 프로세스가 첫 이벤트를 보낼 때까지 걸린 시간 (인터프리터 시작 + import 비용)
+        self.process_started = time.perf_counter()
+        self.process.start(sys.executable, args)
+
+    def read_events(self):
+        self.stdout_buffer += bytes(self.process.readAllStandardOutput())
+        lines = self.stdout_buffer.split(b"\n")
+        self.stdout_buffer = lines.pop()
+        for line in lines:
+            text = line.decode('utf-8', errors='replace')
+            event = parse_event_line(text)
+            if event is None:
+                if text.strip():
+                    self.progress_text_edit.appendPlainText(text.rstrip())
+            else:
+                if self.process_started is not None:
+                    startup = time.perf_counter() - self.process_started
+                    self.process_started = None
+                    self.progress_text_edit.appendPlainText(f"작업 프로세스 시작 시간: {startup:.2f}초")
+                self.update_progress(event)
+
+    def read_errors(self):
+        text = bytes(self.process.readAllStandardError()).decode('utf-8', errors='replace')
+        if text.strip():
+            self.progress_text_edit.appendPlainText(text.rstrip())
+
+    def update_progress(self, event):
+        event_type = event.get("type")
+        if event_type == "log":
+            self.progress_text_edit.appendPlainText(event["message"])
+        elif event_type == "stage":
+            self.progress_label.setText(f"진행 상황: {event['stage']}")
+        elif event_type == "check_result":
+            message = f"{event['keyword']} - {event['check']}: {event['result']}"
+            hits = event.get("detail")
+            if event['result'] == 'X' and isinstance(hits, list) and hits:
+                # 금지어 검사는 [단어, 시작, 끝] 목록을 보내므로 위치를 함께 표시
+                message += " (" + ", ".join(f"{word}@{start}-{end}" for word, start, end in hits) + ")"
+            self.progress_text_edit.appendPlainText(message)
+        elif event_type == "finished":
             self.progress_label.setText("진행 상황: 완료")
 
-        process.wait()
-        on_finished()
-
-    def update_progress(self, process, progress_file, final_update=False):
-        if os.path.exists(progress_file):
-            with open(progress_file, 'r', encoding='cp949') as f:
-                content = f.read()
-                self.progress_text_edit.setPlainText(content)
-                if final_update:
-                    self.progress_text_edit.append("작업 완료!")
-
-        if final_update:
-            stdout, stderr = process.communicate()
-            if stdout:
-                self.progress_text_edit.append(stdout)
-            if stderr:
-                self.progress_text_edit.append(stderr)
+    def on_process_finished(self, exit_code, exit_status):
+        self.read_events()
+        if self.stdout_buffer.strip():
+            self.stdout_buffer += b"\n"
+            self.read_events()
+        self.read_errors()
+        if exit_code == 0:
+            self.progress_label.setText("진행 상황: 완료")
+            self.progress_text_edit.appendPlainText("작업 완료!")
+        else:
+            self.progress_label.setText(f"진행 상황: 오류 (종료 코드 {exit_code})")
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,108 @@
+import os
+import json
+import threading
+from collections import deque, OrderedDict
+
+MAX_CACHED_MATCHERS = 16
+
+class AhoCorasickMatcher:
+    # 금지어 전체를 하나의 오토마톤으로 만들어 문서를 한 번만 훑는다
+    def __init__(self, words):
+        self.words = [word for word in dict.fromkeys(words) if word]
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        for index, word in enumerate(self.words):
+            node = 0
+            for char in word:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                node = next_node
+            self.output[node] = self.output[node] + (index,)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self.goto[node].items():
+                queue.append(next_node)
+                fail = self.fail[node]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[next_node] = self.goto[fail].get(char, 0)
+                self.output[next_node] = self.output[next_node] + self.output[self.fail[next_node]]
+
+    def find_all(self, text):
+        # [(word, start, end)], 겹치거나 포함된 금지어도 모두 반환
+        goto, fail, output, words = self.goto, self.fail, self.output, self.words
+        hits = []
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                word = words[index]
+                hits.append((word, position - len(word) + 1, position + 1))
+        return hits
+
+    def found_words(self, text):
+        return list(dict.fromkeys(word for word, _, _ in self.find_all(text)))
+
+    def scan(self, chunk, node=0):
+        # 스트리밍용: 이전 조각이 끝난 상태(node)에서 이어서 훑고, (새 상태, 찾은 단어)를 반환
+        goto, fail, output, words = self.goto, self.fail, self.output, self.words
+        found = []
+        for char in chunk:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                found.append(words[index])
+        return node, found
+
+_compiled = OrderedDict()
+_models = {}
+_lock = threading.Lock()
+
+def compile_forbidden_words(words):
+    key = tuple(words)
+    with _lock:
+        matcher = _compiled.get(key)
+        if matcher is not None:
+            _compiled.move_to_end(key)
+            return matcher
+    matcher = AhoCorasickMatcher(key)
+    with _lock:
+        _compiled[key] = matcher
+        while len(_compiled) > MAX_CACHED_MATCHERS:
+            _compiled.popitem(last=False)
+    return matcher
+
+def get_check_list_path(model_name):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, 'data', 'model', model_name, 'check_list.json')
+
+def get_forbidden_matcher(model_name):
+    # check_list.json이 바뀌었을 때만 다시 만든다
+    check_list_path = get_check_list_path(model_name)
+    mtime = os.path.getmtime(check_list_path) if os.path.exists(check_list_path) else None
+    with _lock:
+        cached = _models.get(model_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+    forbidden_words = []
+    if mtime is not None:
+        with open(check_list_path, 'r', encoding='utf-8') as f:
+            check_list = json.load(f)
+        forbidden_words = check_list.get("forbidden_words_check", {}).get("forbidden_words", [])
+    matcher = compile_forbidden_words(forbidden_words)
+    with _lock:
+        _models[model_name] = (mtime, matcher)
+    return matcher
@@ -1,8 +1,17 @@
 import os
+import sys
 import json
+import bisect
+from concurrent.futures import ProcessPoolExecutor
 from docx import Document
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from page2_checks.check_engine import split_chunks
+from scripts.metrics import metrics, file_size, collect_metrics
+from scripts.workspace import get_file_format, list_drafts, read_paragraphs, write_paragraphs
+
 def load_check_list(model_name):
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     check_list_path = os.path.join(base_dir, 'data', 'model', model_name, 'check_list.json')
@@ -12,40 +21,185 @@ def load_check_list(model_name):
     else:
         raise FileNotFoundError(f"The check list file {check_list_path} does not exist.")
 
-def substitute_words(doc, substitution_list):
-    substitutions_made = []
-    for paragraph in doc.paragraphs:
+class Substituter:
+    # substitution_list 전체를 하나의 정규식으로 만들어 문단마다 한 번만 치환한다
+    def __init__(self, substitution_list):
+        self.replacements = {}
         for sub_pair in substitution_list:
             for original, replacement in sub_pair.items():
-                pattern = r'(\w*?)' + re.escape(original) + r'(\w*?)'
-                def replace_func(match):
-                    prefix, suffix = match.group(1), match.group(2)
-                    return prefix + replacement + suffix
-                new_text, count = re.subn(pattern, replace_func, paragraph.text)
-                if count > 0:
-                    substitutions_made.append(f"Substituted: '{original}' with '{replacement}' ({count} occurrences)")
-                paragraph.text = new_text
-    return substitutions_made
-
-def process_documents(model_name):
+                if original and original not in self.replacements:
+                    self.replacements[original] = replacement
+        # 같은 위치에서는 긴 단어가 먼저 맞도록 정렬
+        originals = sorted(self.replacements, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(re.escape(original) for original in originals)) if originals else None
+
+    def find_matches(self, text):
+        if self.pattern is None:
+            return []
+        return [(match.start(), match.end(), match.group()) for match in self.pattern.finditer(text)]
+
+    def has_match(self, paragraphs):
+        return self.pattern is not None and any(self.pattern.search(text) for text in paragraphs)
+
+    def substitute_paragraph(self, paragraph, counts):
+        text = paragraph.text
+        matches = self.find_matches(text)
+        if not matches:
+            return
+        for _, _, original in matches:
+            counts[original] = counts.get(original, 0) + 1
+
+        runs = paragraph.runs
+        if ''.join(run.text for run in runs) != text:
+            # 하이퍼링크 등 run 밖의 텍스트가 있으면 문단 단위로 바꾼다
+            paragraph.text = self.pattern.sub(lambda match: self.replacements[match.group()], text)
+            return
+
+        # 치환 결과를 일치 시작 위치의 run에 넣어 run별 서식을 유지
+        run_starts = []
+        offset = 0
+        for run in runs:
+            run_starts.append(offset)
+            offset += len(run.text)
+        new_texts = [[] for _ in runs]
+
+        def run_at(position):
+            return bisect.bisect_right(run_starts, position) - 1
+
+        def copy_range(start, end):
+            while start < end:
+                index = run_at(start)
+                stop = min(end, run_starts[index] + len(runs[index].text))
+                new_texts[index].append(text[start:stop])
+                start = stop
+
+        position = 0
+        for start, end, original in matches:
+            copy_range(position, start)
+            new_texts[run_at(start)].append(self.replacements[original])
+            position = end
+        copy_range(position, len(text))
+
+        for run, parts in zip(runs, new_texts):
+            new_text = ''.join(parts)
+            if run.text != new_text:
+                run.text = new_text
+
+    def substitute_text(self, text, counts):
+        # json 작업대용: 서식이 없으므로 문자열만 바꾼다
+        matches = self.find_matches(text)
+        for _, _, original in matches:
+            counts[original] = counts.get(original, 0) + 1
+        if not matches:
+            return text
+        return self.pattern.sub(lambda match: self.replacements[match.group()], text)
+
+    def describe(self, counts):
+        return [f"Substituted: '{original}' with '{self.replacements[original]}' ({count} occurrences)"
+                for original, count in counts.items()]
+
+    def substitute_document(self, doc):
+        counts = {}
+        for paragraph in doc.paragraphs:
+            self.substitute_paragraph(paragraph, counts)
+        return self.describe(counts)
+
+    def substitute_paragraphs(self, paragraphs):
+        counts = {}
+        new_paragraphs = [self.substitute_text(text, counts) for text in paragraphs]
+        return new_paragraphs, self.describe(counts)
+
+def substitute_words(doc, substitution_list):
+    return Substituter(substitution_list).substitute_document(doc)
+
+def substitute_docx_file(substituter, docx_path):
+    # 대체할 단어가 있는지는 빠른 추출기로 먼저 보고, 있을 때만 python-docx로 열어 run 단위로 바꾼다 (서식 유지)
+    if not substituter.has_match(read_paragraphs(docx_path)):
+        return []
+    with metrics.timer("draft_read_seconds", format="docx"):
+        doc = Document(docx_path)
+    metrics.inc("file_read_bytes_total", file_size(docx_path), kind="docx")
+    substitutions = substituter.substitute_document(doc)
+    if substitutions:
+        with metrics.timer("draft_write_seconds", format="docx"):
+            doc.save(docx_path)
+        metrics.inc("file_write_bytes_total", file_size(docx_path), kind="docx")
+    return substitutions
+
+def substitute_text_file(substituter, path):
+    paragraphs, substitutions = substituter.substitute_paragraphs(read_paragraphs(path))
+    if substitutions:
+        write_paragraphs(path, paragraphs)
+    return substitutions
+
+def substitute_file(substituter, docx_path):
+    # 바뀐 내용이 없는 문서는 저장하지 않는다
+    if get_file_format(docx_path) == "json":
+        substitutions = substitute_text_file(substituter, docx_path)
+    else:
+        substitutions = substitute_docx_file(substituter, docx_path)
+    if substitutions:
+        print(f"Processed and saved: {os.path.basename(docx_path)}")
+    else:
+        print(f"Processed without changes: {os.path.basename(docx_path)}")
+    for sub in substitutions:
+        print(sub)
+    return substitutions
+
+def substitute_files(substitution_list, docx_paths):
+    # 프로세스 풀 작업자에서 실행
+    substituter = Substituter(substitution_list)
+    return [substitute_file(substituter, docx_path) for docx_path in docx_paths]
+
+def process_documents(model_name, titles=None, on_processed=None, paragraphs=None, workers=1):
     check_list = load_check_list(model_name)
     substitution_list = check_list.get('substitution_pairs', {}).get('substitution_list', [])
+    substituter = Substituter(substitution_list)
 
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     source_dir = os.path.join(base_dir, 'data', '작업대')
     if not os.path.exists(source_dir):
         print(f"Source directory {source_dir} does not exist.")
-        return
+        return []
 
-    for filename in os.listdir(source_dir):
-        if filename.endswith('.docx'):
-            docx_path = os.path.join(source_dir, filename)
-            doc = Document(docx_path)
-            substitutions = substitute_words(doc, substitution_list)
-            doc.save(docx_path)
-            print(f"Processed and saved: {filename}")
-            for sub in substitutions:
-                print(sub)
+    results = []
+    to_process = []
+    for title, path in list_drafts(source_dir).items():
+        if titles is not None and title not in titles:
+            continue
+        # 검사 단계에서 읽은 문단에 대체할 단어가 없으면 문서를 다시 열지 않는다
+        cached_paragraphs = (paragraphs or {}).get(title)
+        if cached_paragraphs is not None and not substituter.has_match(cached_paragraphs):
+            results.append((os.path.basename(path), []))
+            if on_processed:
+                on_processed(title)
+            continue
+        to_process.append((title, path))
+
+    if workers > 1 and len(to_process) > 1:
+        chunks = split_chunks(to_process, workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(collect_metrics, substitute_files, substitution_list,
+                                       [path for _, path in chunk])
+                       for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                chunk_results, worker_metrics = future.result()
+                metrics.merge(worker_metrics)
+                for (title, path), substitutions in zip(chunk, chunk_results):
+                    results.append((os.path.basename(path), substitutions))
+                    if on_processed:
+                        on_processed(title)
+        return results
+
+    for title, path in to_process:
+        substitutions = substitute_file(substituter, path)
+        results.append((os.path.basename(path), substitutions))
+        if on_processed:
+            on_processed(title)
+    return results
+
+def main(model_name, titles=None, on_processed=None, paragraphs=None, workers=1):
+    return process_documents(model_name, titles, on_processed, paragraphs, workers)
 
 if __name__ == "__main__":
     import sys
@@ -53,4 +207,4 @@ if __name__ == "__main__":
         print("Usage: python substitution_check.py <model_name>")
         sys.exit(1)
     model_name = sys.argv[1]
-    process_documents(model_name)
\ No newline at end of file
+    main(model_name)
\ No newline at end of file
@@ -1,15 +1,22 @@
 import os
+import sys
 import pandas as pd
-from docx import Document
 import json
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scripts.keyword_store import get_keyword_store
+from scripts.workspace import find_draft_path, read_paragraphs
+
+CHECK_NAME = "char_count_check"
+STATUS_COLUMN = '글자수'
+
 def load_keywords():
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    keywords_path = os.path.join(base_dir, 'data', 'keywords.xlsx')
-    if not os.path.exists(keywords_path):
-        raise FileNotFoundError(f"Keywords file does not exist: {keywords_path}")
+    store = get_keyword_store()
+    if store.is_empty():
+        raise FileNotFoundError(f"Keywords file does not exist: {store.excel_path}")
     
-    return pd.read_excel(keywords_path)
+    return store.load_dataframe()
 
 def load_check_list_settings(model_name):
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,13 +28,25 @@ def load_check_list_settings(model_name):
     with open(settings_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def check_char_count(doc_path, min_length, max_length):
-    doc = Document(doc_path)
-    content = ''.join([para.text for para in doc.paragraphs])
-    char_count = len(content)
+def count_chars(paragraphs, min_length, max_length):
+    char_count = len(''.join(paragraphs))
     return min_length <= char_count <= max_length, char_count
 
-def main(model_name):
+def check_char_count(doc_path, min_length, max_length):
+    return count_chars(read_paragraphs(doc_path), min_length, max_length)
+
+def run_check(paragraphs, settings):
+    return count_chars(paragraphs, settings["min_length"], settings["max_length"])
+
+def repair_fields(detail, settings, paragraphs=None):
+    # 재작성 수정 모드: 글자수가 모자라면 늘리고, 넘치면 줄이라는 지시
+    if detail is None:
+        return None
+    min_length, max_length = settings["min_length"], settings["max_length"]
+    template_key = "char_count_short" if detail < min_length else "char_count_long"
+    return template_key, {"char_count": detail, "min_length": min_length, "max_length": max_length}
+
+def main(model_name, titles=None):
     keywords_df = load_keywords()
     check_list_settings = load_check_list_settings(model_name)
     min_length = check_list_settings["char_count_check"]["min_length"]
@@ -36,20 +55,24 @@ def main(model_name):
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     작업대_dir = os.path.join(base_dir, 'data', '작업대')
     
+    results = {}
     for index, row in keywords_df.iterrows():
         title = row['제목']
-        doc_path = os.path.join(작업대_dir, f"{title}.docx")
-        if os.path.exists(doc_path):
+        # titles가 주어지면 해당 문서만 다시 검사하고 나머지는 이전 결과를 유지
+        if titles is not None and title not in titles:
+            continue
+        doc_path = find_draft_path(작업대_dir, title)
+        if doc_path is not None:
             is_valid, char_count = check_char_count(doc_path, min_length, max_length)
-            keywords_df.at[index, '글자수'] = 'O' if is_valid else 'X'
+            results[title] = 'O' if is_valid else 'X'
             print(f"Title: {title}, Char Count: {char_count}, Valid: {'O' if is_valid else 'X'}")
         else:
             print(f"Document not found for title: {title}")
-            keywords_df.at[index, '글자수'] = 'X'
+            results[title] = 'X'
     
-    keywords_path = os.path.join(base_dir, 'data', 'keywords.xlsx')
-    keywords_df.to_excel(keywords_path, index=False)
+    get_keyword_store().update_statuses('글자수', results)
     print("Character count check completed and results saved.")
+    return results
 
 if __name__ == "__main__":
     import sys
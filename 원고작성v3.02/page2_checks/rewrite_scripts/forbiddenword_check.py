@@ -1,15 +1,23 @@
 import os
+import sys
 import pandas as pd
-from docx import Document
 import json
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from scripts.keyword_store import get_keyword_store
+from scripts.workspace import find_draft_path, read_paragraphs
+from page2_checks.forbidden_matcher import compile_forbidden_words
+
+CHECK_NAME = "forbidden_words_check"
+STATUS_COLUMN = '금지어'
+
 def load_keywords():
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    keywords_path = os.path.join(base_dir, 'data', 'keywords.xlsx')
-    if not os.path.exists(keywords_path):
-        raise FileNotFoundError(f"Keywords file does not exist: {keywords_path}")
+    store = get_keyword_store()
+    if store.is_empty():
+        raise FileNotFoundError(f"Keywords file does not exist: {store.excel_path}")
     
-    return pd.read_excel(keywords_path)
+    return store.load_dataframe()
 
 def load_check_list_settings(model_name):
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,13 +29,46 @@ def load_check_list_settings(model_name):
     with open(settings_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def check_forbidden_words(doc_path, forbidden_words):
-    doc = Document(doc_path)
-    content = ' '.join([para.text for para in doc.paragraphs])
-    found_words = [word for word in forbidden_words if word in content]
+def find_forbidden_hits(paragraphs, forbidden_words):
+    # 위치는 문단을 한 글자 구분자로 이은 텍스트 기준이라 편집기('\n' 연결)와 같다
+    content = ' '.join(paragraphs)
+    return compile_forbidden_words(forbidden_words).find_all(content)
+
+def find_forbidden_words(paragraphs, forbidden_words):
+    hits = find_forbidden_hits(paragraphs, forbidden_words)
+    found_words = list(dict.fromkeys(word for word, _, _ in hits))
     return len(found_words) == 0, found_words
 
-def main(model_name):
+def check_forbidden_words(doc_path, forbidden_words):
+    return find_forbidden_words(read_paragraphs(doc_path), forbidden_words)
+
+def run_check(paragraphs, settings):
+    hits = find_forbidden_hits(paragraphs, settings["forbidden_words"])
+    return len(hits) == 0, hits
+
+def find_hit_sentences(paragraphs, hits):
+    # '\n'으로 이어도 길이가 같아 검사 때의 위치를 그대로 쓸 수 있다
+    content = '\n'.join(paragraphs)
+    sentences = []
+    for _, start, end in hits:
+        left = max(content.rfind(mark, 0, start) for mark in '.!?\n') + 1
+        ends = [position for position in (content.find(mark, end) for mark in '.!?\n') if position >= 0]
+        right = min(ends) + 1 if ends else len(content)
+        sentence = content[left:right].strip()
+        if sentence and sentence not in sentences:
+            sentences.append(sentence)
+    return sentences
+
+def repair_fields(detail, settings, paragraphs=None):
+    # 재작성 수정 모드: 금지어가 들어간 문장만 바꿔 쓰라는 지시
+    if not detail:
+        return None
+    found_words = list(dict.fromkeys(hit[0] for hit in detail))
+    sentences = find_hit_sentences(paragraphs, detail) if paragraphs else []
+    return "forbidden_words", {"forbidden_words": ", ".join(found_words),
+                               "sentences": "\n".join(f"- {sentence}" for sentence in sentences)}
+
+def main(model_name, titles=None):
     keywords_df = load_keywords()
     check_list_settings = load_check_list_settings(model_name)
     forbidden_words = check_list_settings["forbidden_words_check"]["forbidden_words"]
@@ -35,20 +76,24 @@ def main(model_name):
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     작업대_dir = os.path.join(base_dir, 'data', '작업대')
     
+    results = {}
     for index, row in keywords_df.iterrows():
         title = row['제목']
-        doc_path = os.path.join(작업대_dir, f"{title}.docx")
-        if os.path.exists(doc_path):
+        # titles가 주어지면 해당 문서만 다시 검사하고 나머지는 이전 결과를 유지
+        if titles is not None and title not in titles:
+            continue
+        doc_path = find_draft_path(작업대_dir, title)
+        if doc_path is not None:
             is_valid, found_words = check_forbidden_words(doc_path, forbidden_words)
-            keywords_df.at[index, '금지어'] = 'O' if is_valid else 'X'
+            results[title] = 'O' if is_valid else 'X'
             print(f"Title: {title}, Valid: {'O' if is_valid else 'X'}, Found forbidden words: {', '.join(found_words)}")
         else:
             print(f"Document not found for title: {title}")
-            keywords_df.at[index, '금지어'] = 'X'
+            results[title] = 'X'
     
-    keywords_path = os.path.join(base_dir, 'data', 'keywords.xlsx')
-    keywords_df.to_excel(keywords_path, index=False)
+    get_keyword_store().update_statuses('금지어', results)
     print("Forbidden words check completed and results saved.")
+    return results
 
 if __name__ == "__main__":
     import sys
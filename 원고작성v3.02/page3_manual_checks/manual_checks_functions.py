@@ -1,34 +1,35 @@
 import os
-from collections import Counter
-from konlpy.tag import Okt
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page2_checks.forbidden_matcher import get_forbidden_matcher
+from page3_manual_checks.morph_analyzer import get_morph_analyzer
+from scripts.workspace import read_text, write_text
 
 def count_characters(text):
     return len(text)
 
 def count_frequent_words(text, min_count=2):
-    okt = Okt()
-    words = okt.nouns(text)
-    word_counts = Counter(words)
-    frequent_words = [(word, count) for word, count in word_counts.items() if count >= min_count]
-    return frequent_words
-
-def load_text_from_docx(file_path):
-    from docx import Document
-    doc = Document(file_path)
-    full_text = []
-    for paragraph in doc.paragraphs:
-        full_text.append(paragraph.text)
-    return '\n'.join(full_text)
-
-def save_text_to_docx(file_path, text):
-    from docx import Document
-    doc = Document()
-    for line in text.split('\n'):
-        doc.add_paragraph(line)
-    doc.save(file_path)
+    return count_frequent_words_async(text, min_count).result()
+
+def count_frequent_words_async(text, min_count=2):
+    # 미리 띄워 둔 분석기 스레드에 맡기고 Future를 돌려준다
+    return get_morph_analyzer().submit_frequent_words(text, min_count)
+
+def load_draft_text(file_path):
+    # 작업대 원고(docx 또는 json)를 줄 단위 텍스트로 읽는다
+    return read_text(file_path)
+
+def save_draft_text(file_path, text):
+    # 원래 파일 형식 그대로 저장 (한 줄이 한 문단)
+    write_text(file_path, text)
 
 def get_document_info(file_path, min_count=2):
-    text = load_text_from_docx(file_path)
+    text = load_draft_text(file_path)
     char_count = count_characters(text)
     frequent_words = count_frequent_words(text, min_count)
     return char_count, frequent_words
+
+def find_forbidden_hits(text, model_name):
+    return get_forbidden_matcher(model_name).find_all(text)
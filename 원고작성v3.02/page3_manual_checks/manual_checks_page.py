@@ -1,12 +1,18 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QPlainTextEdit, QLabel, QPushButton, QMessageBox, QSplitter, QFrame, QLineEdit, QGroupBox, QListWidgetItem
 from PyQt5.QtGui import QFont, QTextCursor, QTextCharFormat, QColor
-from PyQt5.QtCore import Qt, QTimer, QFileSystemWatcher
+from PyQt5.QtCore import Qt, QTimer, QFileSystemWatcher, QObject, pyqtSignal
 import os
-from .manual_checks_functions import get_document_info, save_text_to_docx, load_text_from_docx
+from .manual_checks_functions import (count_characters, count_frequent_words_async, save_draft_text, load_draft_text,
+                                      find_forbidden_hits)
+
+class AnalysisSignals(QObject):
+    # 분석기 스레드에서 끝난 결과를 화면 스레드로 넘긴다 (요청 번호, 결과, 오류)
+    finished = pyqtSignal(int, object, object)
 
 class ManualChecksPage(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, model_name="default_model"):
         super().__init__(parent)
+        self.model_name = model_name
 
         self.layout = QHBoxLayout(self)
         self.setLayout(self.layout)
@@ -59,9 +65,19 @@ class ManualChecksPage(QWidget):
         self.frequent_words_layout.addWidget(self.frequent_words_list)
         self.frequent_words_group.setLayout(self.frequent_words_layout)
 
+        # Forbidden words section
+        self.forbidden_words_group = QGroupBox("Forbidden Words")
+        self.forbidden_words_layout = QVBoxLayout()
+        self.forbidden_words_list = QListWidget()
+        self.forbidden_words_list.setFont(QFont('Arial', 14))
+        self.forbidden_words_list.itemClicked.connect(self.highlight_forbidden_word)
+        self.forbidden_words_layout.addWidget(self.forbidden_words_list)
+        self.forbidden_words_group.setLayout(self.forbidden_words_layout)
+
         self.info_splitter.addWidget(self.char_count_group)
         self.info_splitter.addWidget(self.frequent_words_group)
-        self.info_splitter.setSizes([100, 900])  # Set initial sizes
+        self.info_splitter.addWidget(self.forbidden_words_group)
+        self.info_splitter.setSizes([100, 600, 300])  # Set initial sizes
 
         self.info_container = QFrame()
         self.info_layout = QVBoxLayout(self.info_container)
@@ -97,6 +113,15 @@ class ManualChecksPage(QWidget):
         # Track the current file being edited
         self.current_file_path = None
 
+        # 빈도 단어 분석은 비동기로: 마지막 요청의 결과만 화면에 반영한다
+        self.analysis_request_id = 0
+        self.analysis_signals = AnalysisSignals(self)
+        self.analysis_signals.finished.connect(self.on_frequent_words_ready)
+
+    def set_model_name(self, model_name):
+        self.model_name = model_name
+        self.update_forbidden_words()
+
     def set_initial_splitter_sizes(self):
         self.main_splitter.setSizes([200, 600, 200])
 
@@ -123,11 +148,12 @@ class ManualChecksPage(QWidget):
         workbench_dir = os.path.join(base_dir, "../data/작업대")
         file_path = os.path.join(workbench_dir, item.text())
         try:
-            text_content = load_text_from_docx(file_path)
+            text_content = load_draft_text(file_path)
             self.files_content_edit.setPlainText(text_content)
-            self.update_file_info(file_path)
+            self.update_file_info(file_path, text_content)
             self.word_positions = self.get_word_positions(text_content)  # Update word positions
             self.current_file_path = file_path  # Track the current file path
+            self.update_forbidden_words()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load file: {str(e)}")
 
@@ -156,24 +182,41 @@ class ManualChecksPage(QWidget):
             return  # If no file is currently loaded, do nothing
         try:
             file_content = self.files_content_edit.toPlainText()
-            save_text_to_docx(self.current_file_path, file_content)
+            save_draft_text(self.current_file_path, file_content)
+            self.update_forbidden_words()
             QMessageBox.information(self, "Success", "File saved successfully.")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save file: {str(e)}")
 
-    def update_file_info(self, file_path):
+    def update_file_info(self, file_path, text=None):
+        self.analysis_request_id += 1
+        request_id = self.analysis_request_id
+        self.frequent_words_list.clear()
         try:
+            if text is None:
+                text = load_draft_text(file_path)
             min_count = int(self.min_count_input.text()) if self.min_count_input.text().isdigit() else 2
-            char_count, frequent_words = get_document_info(file_path, min_count)
-            self.char_count_label.setText(f"Character count: {char_count}")
-            self.frequent_words_list.clear()
-            for word, count in frequent_words:
-                item = QListWidgetItem(f"{word}: {count}")
-                item.setData(Qt.UserRole, word)  # Store the word itself for highlighting
-                self.frequent_words_list.addItem(item)
+            self.char_count_label.setText(f"Character count: {count_characters(text)}")
+            future = count_frequent_words_async(text, min_count)
         except Exception as e:
             self.char_count_label.setText(f"Error: {str(e)}")
-            self.frequent_words_list.clear()
+            return
+        if not future.done():
+            self.frequent_words_list.addItem("분석 중...")
+        future.add_done_callback(lambda done: self.analysis_signals.finished.emit(
+            request_id, None if done.exception() else done.result(), done.exception()))
+
+    def on_frequent_words_ready(self, request_id, frequent_words, error):
+        if request_id != self.analysis_request_id:
+            return  # 그사이 다른 파일을 눌렀으면 이전 결과는 버린다
+        self.frequent_words_list.clear()
+        if error is not None:
+            self.frequent_words_list.addItem(f"Error: {str(error)}")
+            return
+        for word, count in frequent_words:
+            item = QListWidgetItem(f"{word}: {count}")
+            item.setData(Qt.UserRole, word)  # Store the word itself for highlighting
+            self.frequent_words_list.addItem(item)
 
     def apply_min_count(self):
         current_item = self.files_list_widget.currentItem()
@@ -183,6 +226,42 @@ class ManualChecksPage(QWidget):
             file_path = os.path.join(workbench_dir, current_item.text())
             self.update_file_info(file_path)
 
+    def update_forbidden_words(self):
+        self.forbidden_words_list.clear()
+        try:
+            hits = find_forbidden_hits(self.files_content_edit.toPlainText(), self.model_name)
+        except Exception as e:
+            self.forbidden_words_list.addItem(f"Error: {str(e)}")
+            return
+        for word, start, end in hits:
+            item = QListWidgetItem(f"{word}: {start}")
+            item.setData(Qt.UserRole, (start, end))  # Store the match range for highlighting
+            self.forbidden_words_list.addItem(item)
+
+    def highlight_forbidden_word(self, item):
+        match_range = item.data(Qt.UserRole)
+        if not match_range:
+            return
+        start, end = match_range
+        cursor = self.files_content_edit.textCursor()
+        format = QTextCharFormat()
+        format.setBackground(QColor("red"))
+
+        # Clear existing highlights
+        cursor.beginEditBlock()
+        cursor.select(QTextCursor.Document)
+        cursor.setCharFormat(QTextCharFormat())
+        cursor.endEditBlock()
+
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        cursor.mergeCharFormat(format)
+
+        # Move the view to the match without keeping the selection
+        cursor.setPosition(start)
+        self.files_content_edit.setTextCursor(cursor)
+        self.files_content_edit.ensureCursorVisible()
+
     def highlight_word(self, item):
         word = item.data(Qt.UserRole)
         cursor = self.files_content_edit.textCursor()
@@ -2,7 +2,7 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QPla
 from PyQt5.QtGui import QFont, QTextCursor, QTextCharFormat, QColor
 from PyQt5.QtCore import Qt, QTimer
 import os
-from .manual_checks_functions import get_document_info, save_text_to_docx, load_text_from_docx
+from .manual_checks_functions import get_document_info, save_draft_text, load_draft_text
 
 class ManualChecksPage(QWidget):
     def __init__(self, parent=None):
@@ -98,7 +98,7 @@ class ManualChecksPage(QWidget):
         workbench_dir = os.path.join(base_dir, "../data/작업대")
         file_path = os.path.join(workbench_dir, item.text())
         try:
-            text_content = load_text_from_docx(file_path)
+            text_content = load_draft_text(file_path)
             self.files_content_edit.setPlainText(text_content)
             self.update_file_info(file_path)
         except Exception as e:
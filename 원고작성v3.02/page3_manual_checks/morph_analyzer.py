@@ -0,0 +1,64 @@
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_CACHED_TEXTS = 256
+WARM_UP_TEXT = "형태소 분석기를 미리 준비합니다."
+
+class MorphAnalyzer:
+    # Okt(JVM 시작 + 사전 로딩)는 한 번만 만들고, 모든 분석은 전용 스레드 하나에서 순서대로 처리한다
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="morph_analyzer")
+        self.okt = None
+        self.warm_future = None
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_okt(self):
+        # 분석 스레드에서만 호출 (konlpy가 없어도 앱은 뜨도록 여기서 import)
+        if self.okt is None:
+            from konlpy.tag import Okt
+            self.okt = Okt()
+        return self.okt
+
+    def warm_up(self):
+        # 앱 시작 시 백그라운드에서 초기화 (첫 nouns 호출에서 사전까지 읽힌다)
+        with self.lock:
+            if self.warm_future is None:
+                self.warm_future = self.executor.submit(lambda: self.get_okt().nouns(WARM_UP_TEXT))
+            return self.warm_future
+
+    def is_ready(self):
+        return self.warm_future is not None and self.warm_future.done() and self.warm_future.exception() is None
+
+    def nouns(self, text):
+        # 분석 스레드에서 실행: 같은 원고는 다시 분석하지 않는다
+        with self.lock:
+            words = self.cache.get(text)
+            if words is not None:
+                self.cache.move_to_end(text)
+                return words
+        words = self.get_okt().nouns(text)
+        with self.lock:
+            self.cache[text] = words
+            while len(self.cache) > MAX_CACHED_TEXTS:
+                self.cache.popitem(last=False)
+        return words
+
+    def frequent_words(self, text, min_count=2):
+        word_counts = Counter(self.nouns(text))
+        return [(word, count) for word, count in word_counts.items() if count >= min_count]
+
+    def submit_frequent_words(self, text, min_count=2):
+        # Future를 돌려주므로 화면 스레드는 결과를 기다리지 않는다
+        return self.executor.submit(self.frequent_words, text, min_count)
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+def get_morph_analyzer():
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            _analyzer = MorphAnalyzer()
+        return _analyzer
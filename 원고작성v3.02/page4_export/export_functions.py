@@ -0,0 +1,273 @@
+import os
+import sys
+import json
+import time
+import zipfile
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.workspace import get_workspace_dir, list_drafts, read_paragraphs, render_docx
+from scripts.metrics import MetricsRegistry, file_size
+
+# (키, 화면 표시, zip 압축 방식, 압축 수준)
+COMPRESSION_OPTIONS = [
+    ("store", "압축 안 함 (가장 빠름)", zipfile.ZIP_STORED, None),
+    ("fast", "빠른 압축", zipfile.ZIP_DEFLATED, 1),
+    ("default", "기본 압축", zipfile.ZIP_DEFLATED, 6),
+    ("best", "최대 압축", zipfile.ZIP_DEFLATED, 9),
+]
+# 문서가 적으면 프로세스를 띄우는 비용이 더 커서 한 프로세스에서 처리한다
+MIN_PARALLEL_DOCUMENTS = 200
+PROGRESS_INTERVAL = 0.1
+# 예전처럼 텍스트 모드로 쓴 것과 같은 줄바꿈 (Windows에서는 CRLF)
+TXT_NEWLINE = os.linesep
+
+def get_data_dir():
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+def get_export_dir():
+    export_dir = os.path.join(get_data_dir(), '최종결과물')
+    if not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+    return export_dir
+
+def get_archive_path():
+    return os.path.join(get_data_dir(), '최종결과물.zip')
+
+def get_compression(key):
+    for option_key, _, compress_type, level in COMPRESSION_OPTIONS:
+        if option_key == key:
+            return compress_type, level
+    return zipfile.ZIP_STORED, None
+
+def get_output_name(title, prefix="", suffix="", extension=".txt"):
+    return f"{prefix}{title}{suffix}{extension}"
+
+def render_txt(draft_path):
+    # 프로세스 풀 작업자에서 실행: (txt 바이트, 변환 시간)
+    start_time = time.perf_counter()
+    text = ''.join(paragraph + '\n' for paragraph in read_paragraphs(draft_path))
+    if TXT_NEWLINE != '\n':
+        text = text.replace('\n', TXT_NEWLINE)  # 문단 안의 줄바꿈도 텍스트 모드처럼 바꾼다
+    data = text.encode('utf-8')
+    return data, time.perf_counter() - start_time
+
+def iter_rendered(paths, workers):
+    # 변환은 여러 프로세스에서 하고, 결과는 입력 순서대로 하나씩 받아 바로 쓴다
+    if workers <= 1 or len(paths) < MIN_PARALLEL_DOCUMENTS:
+        for path in paths:
+            yield render_txt(path)
+        return
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(render_txt, paths, chunksize=chunksize)
+
+def get_manifest_path():
+    return os.path.join(get_data_dir(), 'export_manifest.json')
+
+def empty_manifest():
+    # sources: 제목별 원본 상태 (크기/수정 시각이 같으면 해시를 다시 계산하지 않는다)
+    # txt, zip: 마지막으로 내보낸 결과 {제목: {"hash", "name"}} (줄바꿈이 다르면 전부 다시 만든다)
+    return {"sources": {}, "txt": {"dir": None, "newline": None, "entries": {}},
+            "zip": {"path": None, "compression": None, "newline": None, "entries": {}}}
+
+def load_manifest():
+    path = get_manifest_path()
+    if not os.path.exists(path):
+        return empty_manifest()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return empty_manifest()
+    return dict(empty_manifest(), **manifest)
+
+def save_manifest(manifest):
+    path = get_manifest_path()
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=4)
+    os.replace(temp_path, path)
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def describe_source(path, previous=None):
+    stat = os.stat(path)
+    if (previous and previous.get("path") == path and previous.get("size") == stat.st_size
+            and previous.get("mtime_ns") == stat.st_mtime_ns):
+        return previous
+    return {"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": hash_file(path)}
+
+def diff_target(previous_entries, sources, names, exists):
+    # (그대로 둘 제목, 새로 변환할 제목, 지울 이전 출력 이름)
+    kept, changed, stale = [], [], []
+    for title, source in sources.items():
+        previous = previous_entries.get(title)
+        if previous and previous["hash"] == source["hash"] and previous["name"] == names[title] and exists(previous["name"]):
+            kept.append(title)
+        else:
+            changed.append(title)
+            if previous and previous["name"] != names[title]:
+                stale.append(previous["name"])
+    for title, previous in previous_entries.items():
+        if title not in sources:
+            stale.append(previous["name"])
+    return kept, changed, stale
+
+def read_archive_names(archive_path):
+    # 기존 zip이 없거나 손상됐으면 빈 집합 (전체를 다시 만든다)
+    if not os.path.exists(archive_path):
+        return set()
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            return set(archive.namelist())
+    except zipfile.BadZipFile:
+        return set()
+
+def open_archive(archive_path, compression, previous, kept, stale):
+    # 추가만 있으면 기존 zip 뒤에 붙이고, 바뀌거나 지워진 항목이 있으면 새 zip을 만들어 그대로인 항목만 옮긴다
+    compress_type, level = get_compression(compression)
+    can_append = (kept and previous.get("path") == archive_path
+                  and previous.get("compression") == compression and not stale
+                  and len(kept) == len(previous.get("entries", {})))
+    if can_append:
+        return zipfile.ZipFile(archive_path, 'a', compression=compress_type, compresslevel=level), None
+    temp_path = f"{archive_path}.{os.getpid()}.tmp"
+    archive = zipfile.ZipFile(temp_path, 'w', compression=compress_type, compresslevel=level)
+    if kept:
+        with zipfile.ZipFile(archive_path) as old_archive:
+            for title in kept:
+                name = previous["entries"][title]["name"]
+                archive.writestr(name, old_archive.read(name))
+    return archive, temp_path
+
+def export_drafts(prefix="", suffix="", archive_path=None, txt_dir=None, compression="store", workers=None,
+                  on_progress=None, metrics=None, incremental=True):
+    # 작업대 원고를 txt로 바꿔 zip에 바로 쓴다 (txt_dir이 주어지면 파일로도 저장)
+    # incremental이면 manifest와 비교해 새로 생기거나 바뀐 원고만 변환하고, 원본이 없어진 출력은 지운다
+    metrics = metrics or MetricsRegistry()
+    workers = workers or os.cpu_count() or 1
+    manifest = load_manifest() if incremental else empty_manifest()
+    drafts = list_drafts(get_workspace_dir())
+    sources = {title: describe_source(path, manifest["sources"].get(title)) for title, path in drafts.items()}
+    names = {title: get_output_name(title, prefix, suffix) for title in sources}
+
+    start_time = time.perf_counter()
+    to_convert = set()
+    txt_kept, txt_stale = [], []
+    previous_txt = {}
+    if txt_dir:
+        previous_txt = (manifest["txt"]["entries"] if manifest["txt"].get("dir") == txt_dir
+                        and manifest["txt"].get("newline") == TXT_NEWLINE else {})
+        txt_kept, txt_changed, txt_stale = diff_target(previous_txt, sources, names,
+                                                       lambda name: os.path.exists(os.path.join(txt_dir, name)))
+        to_convert.update(txt_changed)
+    zip_kept, zip_changed, zip_stale = [], [], []
+    previous_zip = manifest["zip"]
+    zip_entries = {}
+    if archive_path:
+        zip_names = read_archive_names(archive_path)
+        if previous_zip.get("path") == archive_path and previous_zip.get("newline") == TXT_NEWLINE and zip_names:
+            zip_entries = previous_zip["entries"]
+        zip_kept, zip_changed, zip_stale = diff_target(zip_entries, sources, names, lambda name: name in zip_names)
+        # 바뀐 원고처럼 이미 zip에 있는 이름을 다시 써야 하면 덧붙일 수 없으므로 지울 항목으로 본다
+        zip_stale += [names[title] for title in zip_changed if names[title] in zip_names]
+        to_convert.update(zip_changed)
+
+    archive = None
+    temp_path = None
+    if archive_path and (zip_changed or zip_stale or previous_zip.get("compression") != compression
+                         or not os.path.exists(archive_path)):
+        archive, temp_path = open_archive(archive_path, compression, previous_zip, zip_kept, zip_stale)
+
+    titles = [title for title in sources if title in to_convert]
+    last_progress = 0
+    written_bytes = 0
+    try:
+        rendered = iter_rendered([sources[title]["path"] for title in titles], workers)
+        for index, (title, (data, seconds)) in enumerate(zip(titles, rendered), start=1):
+            name = names[title]
+            metrics.observe("export_file_seconds", seconds)
+            metrics.inc("file_read_bytes_total", sources[title]["size"],
+                        kind=os.path.splitext(sources[title]["path"])[1][1:])
+            if archive is not None and title not in zip_kept:
+                archive.writestr(name, data)
+            if txt_dir and title not in txt_kept:
+                with open(os.path.join(txt_dir, name), 'wb') as f:
+                    f.write(data)
+                written_bytes += len(data)
+            metrics.inc("stage_items_total", stage="export")
+
+            now = time.perf_counter()
+            if on_progress and (index == len(titles) or now - last_progress >= PROGRESS_INTERVAL):
+                last_progress = now
+                on_progress(index, len(titles), name)
+    except BaseException:
+        if archive is not None:
+            archive.close()
+            if temp_path:
+                os.remove(temp_path)
+        raise
+
+    if txt_dir:
+        for name in txt_stale:
+            path = os.path.join(txt_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+        metrics.inc("file_write_bytes_total", written_bytes, kind="txt")
+        manifest["txt"] = {"dir": txt_dir, "newline": TXT_NEWLINE, "entries": {title: {"hash": sources[title]["hash"], "name": names[title]}
+                                                       for title in sources}}
+    if archive_path:
+        if archive is not None:
+            archive.close()
+            if temp_path:
+                os.replace(temp_path, archive_path)
+            metrics.inc("file_write_bytes_total", file_size(archive_path), kind="zip")
+        manifest["zip"] = {"path": archive_path, "compression": compression, "newline": TXT_NEWLINE,
+                           "entries": {title: {"hash": sources[title]["hash"], "name": names[title]}
+                                       for title in sources}}
+    manifest["sources"] = sources
+    save_manifest(manifest)
+
+    elapsed = time.perf_counter() - start_time
+    metrics.observe("stage_seconds", elapsed, stage="export")
+    removed = len((set(previous_txt) | set(zip_entries)) - set(sources))
+    return {"count": len(sources), "converted": len(titles), "skipped": len(sources) - len(titles),
+            "removed": removed, "seconds": elapsed, "rate": len(titles) / elapsed if elapsed > 0 else 0,
+            "archive_path": archive_path, "txt_bytes": written_bytes,
+            "archive_bytes": file_size(archive_path) if archive_path else 0}
+
+def export_docx_drafts(prefix="", suffix="", target_dir=None, on_progress=None, metrics=None):
+    # 작업대 원고를 docx로 내보낸다 (작업대가 json 형식이어도 여기서만 docx를 만든다)
+    metrics = metrics or MetricsRegistry()
+    target_dir = target_dir or get_export_dir()
+    drafts = list_drafts(get_workspace_dir())
+    start_time = time.perf_counter()
+    last_progress = 0
+    written_bytes = 0
+    for index, (title, draft_path) in enumerate(drafts.items(), start=1):
+        name = get_output_name(title, prefix, suffix, ".docx")
+        file_start = time.perf_counter()
+        output_path = render_docx(draft_path, os.path.join(target_dir, name))
+        metrics.observe("export_file_seconds", time.perf_counter() - file_start)
+        written_bytes += file_size(output_path)
+        metrics.inc("stage_items_total", stage="export")
+
+        now = time.perf_counter()
+        if on_progress and (index == len(drafts) or now - last_progress >= PROGRESS_INTERVAL):
+            last_progress = now
+            on_progress(index, len(drafts), name)
+    metrics.inc("file_write_bytes_total", written_bytes, kind="docx")
+
+    elapsed = time.perf_counter() - start_time
+    metrics.observe("stage_seconds", elapsed, stage="export")
+    return {"count": len(drafts), "converted": len(drafts), "skipped": 0, "removed": 0, "seconds": elapsed,
+            "rate": len(drafts) / elapsed if elapsed > 0 else 0, "archive_path": None, "txt_bytes": 0,
+            "archive_bytes": 0}
@@ -1,15 +1,58 @@
 import os
 import sys
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QPushButton, QLineEdit, QLabel, 
-    QMessageBox, QApplication, QGridLayout
+    QWidget, QVBoxLayout, QPushButton, QLineEdit, QLabel,
+    QMessageBox, QApplication, QGridLayout, QComboBox, QCheckBox, QProgressBar
 )
-from docx import Document
-import shutil  # For archiving files
+from PyQt5.QtCore import QThread, pyqtSignal
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.metrics import MetricsRegistry
+from page4_export.export_functions import (COMPRESSION_OPTIONS, export_docx_drafts, export_drafts, get_archive_path,
+                                           get_export_dir)
+
+class ExportThread(QThread):
+    # 변환과 압축은 이 스레드(및 작업자 프로세스)에서 하고, 화면에는 진행 상황만 보낸다
+    progress = pyqtSignal(int, int, str)
+    completed = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, prefix, suffix, archive_path=None, txt_dir=None, compression="store", incremental=True,
+                 docx_dir=None, parent=None):
+        super().__init__(parent)
+        self.prefix = prefix
+        self.suffix = suffix
+        self.archive_path = archive_path
+        self.txt_dir = txt_dir
+        self.compression = compression
+        self.incremental = incremental
+        # docx_dir이 주어지면 txt/zip 대신 docx로 내보낸다
+        self.docx_dir = docx_dir
+
+    def run(self):
+        # 내보내기는 작성 파이프라인과 별도로 집계해 export.prom으로 남긴다
+        metrics = MetricsRegistry()
+        try:
+            if self.docx_dir:
+                summary = export_docx_drafts(self.prefix, self.suffix, self.docx_dir, on_progress=self.progress.emit,
+                                             metrics=metrics)
+            else:
+                summary = export_drafts(self.prefix, self.suffix, self.archive_path, self.txt_dir, self.compression,
+                                        on_progress=self.progress.emit, metrics=metrics,
+                                        incremental=self.incremental)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        try:
+            metrics.export("export")
+        except OSError as e:
+            print(f"Failed to save export metrics: {e}")
+        self.completed.emit(summary)
 
 class ExportPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.export_thread = None
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(5, 5, 5, 5)  # Reduce padding around the layout
         self.layout.setSpacing(5)  # Reduce space between widgets
@@ -25,21 +68,47 @@ class ExportPage(QWidget):
         self.file_example_label = QLabel("변환될 파일명 예시:")
         self.update_example_label()
 
+        self.compression_label = QLabel("압축 수준:")
+        self.compression_combo = QComboBox()
+        for key, label, _, _ in COMPRESSION_OPTIONS:
+            self.compression_combo.addItem(label, key)
+
+        # 압축할 때 최종결과물 폴더에 txt 파일도 남길지 (기본은 zip에만 바로 쓴다)
+        self.keep_txt_checkbox = QCheckBox("압축할 때 최종결과물 폴더에도 txt 저장")
+
+        # 지난 내보내기 이후 새로 생기거나 바뀐 원고만 변환 (export_manifest.json과 비교)
+        self.incremental_checkbox = QCheckBox("바뀐 파일만 내보내기")
+        self.incremental_checkbox.setChecked(True)
+
         # Buttons to perform conversion, renaming and archiving
         self.process_button = QPushButton("파일 변환 및 이름 변경")
         self.process_button.clicked.connect(self.convert_and_rename_files)
-        
+
+        # docx는 작업대가 json 형식이어도 이 버튼을 누를 때만 만든다
+        self.docx_button = QPushButton("docx로 내보내기")
+        self.docx_button.clicked.connect(self.export_docx_files)
+
         self.archive_button = QPushButton("결과물 압축하기")
         self.archive_button.clicked.connect(self.archive_files)
 
+        self.progress_bar = QProgressBar()
+        self.status_label = QLabel("대기 중")
+
         # Add widgets to the grid layout
         grid_layout.addWidget(self.prefix_label, 0, 0)
         grid_layout.addWidget(self.prefix_input, 0, 1)
         grid_layout.addWidget(self.suffix_label, 1, 0)
         grid_layout.addWidget(self.suffix_input, 1, 1)
         grid_layout.addWidget(self.file_example_label, 2, 0, 1, 2)
-        grid_layout.addWidget(self.process_button, 3, 0, 1, 2)
-        grid_layout.addWidget(self.archive_button, 4, 0, 1, 2)
+        grid_layout.addWidget(self.compression_label, 3, 0)
+        grid_layout.addWidget(self.compression_combo, 3, 1)
+        grid_layout.addWidget(self.keep_txt_checkbox, 4, 0, 1, 2)
+        grid_layout.addWidget(self.incremental_checkbox, 5, 0, 1, 2)
+        grid_layout.addWidget(self.process_button, 6, 0, 1, 2)
+        grid_layout.addWidget(self.docx_button, 7, 0, 1, 2)
+        grid_layout.addWidget(self.archive_button, 8, 0, 1, 2)
+        grid_layout.addWidget(self.progress_bar, 9, 0, 1, 2)
+        grid_layout.addWidget(self.status_label, 10, 0, 1, 2)
 
         # Setup text change listeners
         self.prefix_input.textChanged.connect(self.update_example_label)
@@ -55,32 +124,54 @@ class ExportPage(QWidget):
         new_name = f"{prefix}{example_filename[:-5]}{suffix}.txt"
         self.file_example_label.setText(f"변환될 파일명 예시: {new_name}")
 
-    def convert_and_rename_files(self):
-        source_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', '작업대')
-        target_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', '최종결과물')
-        if not os.path.exists(target_dir):
-            os.makedirs(target_dir)
+    def set_buttons_enabled(self, enabled):
+        for button in (self.process_button, self.docx_button, self.archive_button):
+            button.setEnabled(enabled)
+
+    def start_export(self, archive_path=None, txt_dir=None, docx_dir=None):
+        if self.export_thread is not None and self.export_thread.isRunning():
+            QMessageBox.warning(self, "경고", "이미 내보내는 중입니다.")
+            return
+        self.set_buttons_enabled(False)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("내보내는 중...")
+        self.export_thread = ExportThread(self.prefix_input.text(), self.suffix_input.text(), archive_path, txt_dir,
+                                          self.compression_combo.currentData(),
+                                          self.incremental_checkbox.isChecked(), docx_dir, self)
+        self.export_thread.progress.connect(self.on_export_progress)
+        self.export_thread.completed.connect(self.on_export_completed)
+        self.export_thread.failed.connect(self.on_export_failed)
+        self.export_thread.start()
 
-        for filename in os.listdir(source_dir):
-            if filename.endswith(".docx"):
-                docx_path = os.path.join(source_dir, filename)
-                new_filename = f"{self.prefix_input.text()}{filename[:-5]}{self.suffix_input.text()}.txt"
-                txt_path = os.path.join(target_dir, new_filename)
-                self.convert_docx_to_txt(docx_path, txt_path)
+    def on_export_progress(self, done, total, name):
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"{done}/{total} {name}")
+
+    def on_export_completed(self, summary):
+        self.set_buttons_enabled(True)
+        message = (f"{summary['count']}개 파일 중 {summary['converted']}개 변환, {summary['skipped']}개 그대로, "
+                   f"{summary['removed']}개 삭제, {summary['seconds']:.1f}초 ({summary['rate']:.1f}개/초)")
+        if summary['archive_path']:
+            message += f"\n{os.path.basename(summary['archive_path'])} ({summary['archive_bytes'] / (1024 * 1024):.1f}MB)"
+        self.status_label.setText(f"완료: {message}")
+        QMessageBox.information(self, "완료", message)
+
+    def on_export_failed(self, error):
+        self.set_buttons_enabled(True)
+        self.status_label.setText(f"오류: {error}")
+        QMessageBox.critical(self, "오류", f"내보내기 실패: {error}")
+
+    def convert_and_rename_files(self):
+        self.start_export(txt_dir=get_export_dir())
 
-        QMessageBox.information(self, "완료", "모든 파일이 변환되고 이름이 변경되었습니다.")
+    def export_docx_files(self):
+        self.start_export(docx_dir=get_export_dir())
 
     def archive_files(self):
-        target_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', '최종결과물')
-        archive_path = os.path.join(os.path.dirname(target_dir), '최종결과물.zip')
-        shutil.make_archive(archive_path[:-4], 'zip', target_dir)
-        QMessageBox.information(self, "완료", "파일이 압축되었습니다.")
-
-    def convert_docx_to_txt(self, docx_path, txt_path):
-        doc = Document(docx_path)
-        with open(txt_path, 'w', encoding='utf-8') as file:
-            for paragraph in doc.paragraphs:
-                file.write(paragraph.text + '\n')
+        # 작업대 원고를 txt로 바꿔 최종결과물.zip에 바로 쓴다
+        txt_dir = get_export_dir() if self.keep_txt_checkbox.isChecked() else None
+        self.start_export(archive_path=get_archive_path(), txt_dir=txt_dir)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
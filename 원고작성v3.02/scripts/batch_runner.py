@@ -0,0 +1,174 @@
+import os
+import sys
+import json
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from scripts.progress_events import event_bus
+from scripts.llm_backends import get_backend_name
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+DEFAULT_POLL_SECONDS = 30
+FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+class BatchRequestError(Exception):
+    pass
+
+def get_batch_dir():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    batch_dir = os.path.join(base_dir, 'data', 'batch')
+    if not os.path.exists(batch_dir):
+        os.makedirs(batch_dir, exist_ok=True)
+    return batch_dir
+
+def get_batch_mode(model_config):
+    # "batch": "on"이면 API 배치, "local"이면 오프라인 대역, 그 외에는 사용 안 함
+    # 가짜 백엔드(fake, fake_http)에는 files/batches API가 없으므로 배치를 켜면 항상 로컬 대역을 쓴다
+    value = str(model_config.get("batch", "")).strip().lower()
+    if value == "local":
+        return "local"
+    if value in ("1", "true", "on", "yes", "openai"):
+        return "openai" if get_backend_name(model_config) == "openai" else "local"
+    return None
+
+def get_poll_seconds(model_config):
+    try:
+        return max(1.0, float(model_config.get("batch_poll_seconds") or DEFAULT_POLL_SECONDS))
+    except (TypeError, ValueError):
+        return DEFAULT_POLL_SECONDS
+
+def make_batch_line(custom_id, request_params):
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": request_params}
+
+def write_batch_file(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+def read_batch_results(path):
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                results[record.get("custom_id")] = record
+    return results
+
+def parse_batch_result(record):
+    # 결과 한 줄에서 (응답 텍스트, usage)를 꺼낸다. 실패한 요청은 BatchRequestError
+    if record is None:
+        raise BatchRequestError("배치 결과에 응답이 없습니다.")
+    error = record.get("error")
+    response = record.get("response") or {}
+    if error or response.get("status_code") != 200:
+        message = (error or {}).get("message") or (response.get("body") or {}).get("error", {}).get("message")
+        raise BatchRequestError(f"배치 요청 실패 ({response.get('status_code')}): {message}")
+    body = response.get("body") or {}
+    return body["choices"][0]["message"]["content"].strip(), body.get("usage") or {}
+
+class LocalBatch:
+    def __init__(self, batch_id, input_path):
+        self.id = batch_id
+        self.input_path = input_path
+        self.status = "completed"
+        self.request_counts = None
+
+class LocalBatchBackend:
+    # 네트워크 없이 배치 흐름을 시험하기 위한 대역
+    def __init__(self):
+        self.batches = {}
+
+    def submit(self, input_path):
+        batch_id = f"local_{os.path.splitext(os.path.basename(input_path))[0]}"
+        self.batches[batch_id] = LocalBatch(batch_id, input_path)
+        return batch_id
+
+    def status(self, batch_id):
+        return self.batches[batch_id]
+
+    def fetch_results(self, batch, output_path):
+        self.process_batch_file(batch.input_path, output_path)
+
+    def process_batch_file(self, input_path, output_path):
+        # 입력 JSONL을 읽어 API와 같은 형식의 결과 파일을 만든다 (응답 길이는 요청의 max_tokens 글자)
+        # 가짜 응답 생성기는 로컬 대역을 쓸 때만 불러온다 (실제 배치 경로는 fake_llm_server에 의존하지 않는다)
+        from scripts.fake_llm_server import make_fake_completion
+        with open(input_path, 'r', encoding='utf-8') as src, open(output_path, 'w', encoding='utf-8') as dst:
+            for line_number, line in enumerate(src, start=1):
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                record = {"id": f"batch_req_{line_number}", "custom_id": request.get("custom_id"), "error": None}
+                if request.get("url") != BATCH_ENDPOINT:
+                    record["response"] = None
+                    record["error"] = {"code": "invalid_url", "message": f"Unsupported url: {request.get('url')}"}
+                else:
+                    body = request.get("body") or {}
+                    response_length = int(body.get("max_tokens") or 2000)
+                    record["response"] = {"status_code": 200, "request_id": record["id"],
+                                          "body": make_fake_completion(body, response_length, line_number)}
+                dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+class OpenAIBatchBackend:
+    def __init__(self, client):
+        self.client = client
+
+    def submit(self, input_path):
+        with open(input_path, 'rb') as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(input_file_id=input_file.id, endpoint=BATCH_ENDPOINT,
+                                           completion_window="24h")
+        return batch.id
+
+    def status(self, batch_id):
+        return self.client.batches.retrieve(batch_id)
+
+    def fetch_results(self, batch, output_path):
+        # 성공 결과와 오류 결과를 한 파일로 합친다
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    f.write(self.client.files.content(file_id).text.rstrip("\n") + "\n")
+
+def create_batch_backend(model_config, client=None):
+    if get_batch_mode(model_config) == "local":
+        return LocalBatchBackend()
+    return OpenAIBatchBackend(client)
+
+def run_batch(backend, lines, name, poll_seconds=DEFAULT_POLL_SECONDS, events=event_bus):
+    # 요청 파일을 쓰고 제출한 뒤 끝날 때까지 기다려 {custom_id: 결과}를 반환
+    batch_dir = get_batch_dir()
+    input_path = os.path.join(batch_dir, f"{name}.jsonl")
+    output_path = os.path.join(batch_dir, f"{name}_output.jsonl")
+    write_batch_file(input_path, lines)
+
+    batch_id = backend.submit(input_path)
+    events.log(f"배치 제출: {name} ({len(lines)}개 요청, id={batch_id})")
+    while True:
+        batch = backend.status(batch_id)
+        if batch.status in FINAL_STATUSES:
+            break
+        counts = getattr(batch, 'request_counts', None)
+        if counts is not None:
+            events.log(f"배치 대기 중: {batch.status} ({counts.completed}/{counts.total})")
+        else:
+            events.log(f"배치 대기 중: {batch.status}")
+        time.sleep(poll_seconds)
+
+    events.log(f"배치 종료: {name} ({batch.status})")
+    # 만료/취소된 배치도 일부 결과가 있을 수 있으므로 받아 두고, 없는 요청은 실패로 처리된다
+    backend.fetch_results(batch, output_path)
+    return read_batch_results(output_path)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python batch_runner.py <input.jsonl> <output.jsonl>")
+        sys.exit(1)
+    LocalBatchBackend().process_batch_file(sys.argv[1], sys.argv[2])
+    print(f"Batch results written to {sys.argv[2]}")
@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+
+from docx import Document
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from scripts import docx_text
+
+WORDS = ["서울", "맛집", "추천", "카페", "분위기", "가성비", "주차", "예약", "메뉴", "후기",
+         "여행", "숙소", "가족", "주말", "야경", "산책", "브런치", "빵집", "가격", "위치"]
+
+# (이름, 문서 수, 문서당 문단 수, 문단당 단어 수)
+CASES = [("large", 20, 2000, 40), ("small", 3000, 2, 150)]
+
+def make_paragraph(rng, words):
+    sentence = " ".join(rng.choice(WORDS) for _ in range(words))
+    # 줄바꿈이 섞인 응답도 만들어 w:br 처리까지 비교한다
+    if rng.random() < 0.1:
+        sentence = sentence.replace(" ", "\n", 1)
+    return sentence
+
+def make_documents(directory, count, paragraphs, words, seed=0):
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        doc = Document()
+        for _ in range(paragraphs):
+            doc.add_paragraph(make_paragraph(rng, words))
+        path = os.path.join(directory, f"doc_{index}.docx")
+        doc.save(path)
+        paths.append(path)
+    return paths
+
+def read_with_python_docx(path):
+    return [para.text for para in Document(path).paragraphs]
+
+def time_reader(reader, paths):
+    start_time = time.perf_counter()
+    results = [reader(path) for path in paths]
+    return time.perf_counter() - start_time, results
+
+def run_case(name, count, paragraphs, words, seed):
+    with tempfile.TemporaryDirectory(prefix="docx_text_") as temp_dir:
+        paths = make_documents(temp_dir, count, paragraphs, words, seed)
+        total_bytes = sum(os.path.getsize(path) for path in paths)
+        docx_seconds, expected = time_reader(read_with_python_docx, paths)
+        fast_seconds, actual = time_reader(docx_text.read_paragraphs, paths)
+        return {
+            "case": name, "documents": count, "paragraphs_per_document": paragraphs,
+            "megabytes": round(total_bytes / (1024 * 1024), 2),
+            "python_docx_seconds": round(docx_seconds, 3),
+            "docx_text_seconds": round(fast_seconds, 3),
+            "speedup": round(docx_seconds / fast_seconds, 2) if fast_seconds else None,
+            "identical": expected == actual
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare python-docx and the streaming docx_text extractor")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply document counts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+              "platform": platform.platform(), "results": []}
+    for name, count, paragraphs, words in CASES:
+        count = max(1, int(count * args.scale))
+        print(f"Running {name}: {count} documents x {paragraphs} paragraphs...")
+        result = run_case(name, count, paragraphs, words, args.seed)
+        report["results"].append(result)
+        print(f"  python-docx {result['python_docx_seconds']}s, docx_text {result['docx_text_seconds']}s "
+              f"(x{result['speedup']}), identical={result['identical']}")
+
+    output_path = args.output
+    if output_path is None:
+        output_dir = os.path.join(parent_dir, 'data', 'benchmarks')
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, f"docx_text_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    print(f"Benchmark report written to {output_path}")
+
+    if not all(result["identical"] for result in report["results"]):
+        print("docx_text output differs from python-docx")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import itertools
+import subprocess
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_SIZES = [100, 1000, 10000]
+BENCH_MODEL = "bench_model"
+# 실행 중 생성되는 데이터는 복사하지 않는다
+COPY_IGNORE = shutil.ignore_patterns('__pycache__', '작업대', 'chat_logs', 'batch', 'rate_limit', 'benchmarks',
+                                     'metrics', '최종결과물', '최종결과물.zip', 'export_manifest.json',
+                                     '*.db', '*.db-wal', '*.db-shm', 'keywords.xlsx', 'run_journal.jsonl')
+
+REGIONS = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "제주", "수원", "전주",
+           "강릉", "경주", "여수", "속초", "춘천", "포항", "목포", "안동", "통영", "군산"]
+TOPICS = ["맛집", "카페", "호텔", "여행", "숙소", "데이트", "캠핑", "축제", "시장", "해변",
+          "산책", "박물관", "야경", "브런치", "빵집", "펜션", "온천", "드라이브", "전시회", "공원",
+          "미용실", "헬스장", "병원", "학원", "꽃집"]
+MODIFIERS = ["추천", "후기", "가격", "순위", "주차", "예약", "위치", "메뉴", "분위기", "가성비",
+             "혼자", "가족", "아이", "주말", "겨울", "여름", "야간", "무료", "신상", "인기"]
+FORBIDDEN_WORDS = ["최고급", "무조건", "100%", "완벽한", "대박", "강력추천", "최저가", "유일한", "보장", "기적"]
+SUBSTITUTIONS = [{"가나다": "가나다라"}, {"마바사": "마 바 사"}, {"여행": "여행길"}, {"추천": "권장"}]
+
+def make_keywords(size, seed=0):
+    # 지역 x 주제 x 수식어 조합에서 뽑고, 일부는 일부러 중복시켜 전처리의 제목 변경도 측정한다
+    rng = random.Random(seed)
+    combinations = list(itertools.product(REGIONS, TOPICS, MODIFIERS))
+    rng.shuffle(combinations)
+    rows = []
+    for index in range(size):
+        region, topic, modifier = combinations[index % len(combinations)]
+        if index and rng.random() < 0.05:
+            region, topic, modifier = combinations[rng.randrange(min(index, len(combinations)))]
+        rows.append({'제목': '', '키워드1': f"{region} {topic}", '키워드2': modifier,
+                     '키워드3': rng.choice(MODIFIERS) if rng.random() < 0.5 else '',
+                     '글자수': '', '금지어': '', '중복표현': ''})
+    return pd.DataFrame(rows)
+
+def make_model(model_dir, args):
+    # 응답 길이 범위를 검사 기준에 걸치게 잡아 일부 키워드는 재작성 단계를 거치게 한다
+    os.makedirs(model_dir, exist_ok=True)
+    model_config = {
+        "model": "bench-fake", "backend": args.backend, "temperature": "0.0", "max_tokens": "1000",
+        "top_p": "1.0", "frequency_penalty": "0.0", "presence_penalty": "0.0",
+        "max_concurrency": str(args.concurrency), "requests_per_minute": "", "tokens_per_minute": "",
+        "latency_target_seconds": "", "max_retries": "5", "check_workers": str(args.check_workers),
+        "response_cache": "off", "rewrite_from_step": "1", "rewrite_mode": "regenerate", "stream": "off",
+        "workspace_format": args.workspace_format,
+        "batch": "off", "fake_latency_ms": str(args.latency_ms), "fake_latency_distribution": args.distribution,
+        "fake_error_rate": str(args.error_rate), "fake_rate_limit_rate": str(args.rate_limit_rate),
+        "fake_retry_after": "0.01", "fake_response_length": args.response_length, "fake_seed": str(args.seed)
+    }
+    config = {"model_config": model_config,
+              "prompts": ["{키워드1} {키워드2}에 대한 블로그 글을 써줘. {키워드3}", "위 글을 이어서 더 자세히 써줘."]}
+    check_list = {
+        "char_count_check": {"min_length": 1950, "max_length": 2500},
+        "forbidden_words_check": {"forbidden_words": FORBIDDEN_WORDS},
+        "substitution_pairs": {"substitution_list": SUBSTITUTIONS}
+    }
+    with open(os.path.join(model_dir, 'config.json'), 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=4)
+    with open(os.path.join(model_dir, 'check_list.json'), 'w', encoding='utf-8') as f:
+        json.dump(check_list, f, ensure_ascii=False, indent=4)
+
+def get_io_counters():
+    if psutil is not None:
+        try:
+            counters = psutil.Process().io_counters()
+            return {"read_count": counters.read_count, "write_count": counters.write_count,
+                    "read_bytes": counters.read_bytes, "write_bytes": counters.write_bytes}
+        except (AttributeError, psutil.Error):
+            pass
+    try:
+        with open('/proc/self/io', 'r') as f:
+            values = dict(line.split(':', 1) for line in f if ':' in line)
+        return {"read_count": int(values["syscr"]), "write_count": int(values["syscw"]),
+                "read_bytes": int(values["read_bytes"]), "write_bytes": int(values["write_bytes"])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+def diff_io(before, after):
+    if before is None or after is None:
+        return None
+    return {key: after[key] - before[key] for key in after}
+
+def get_peak_rss_mb():
+    # 검사용 작업자 프로세스는 children으로 따로 보고한다
+    if resource is not None:
+        # ru_maxrss는 Linux에서 KB, macOS에서 byte 단위
+        divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        return {"self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, 1),
+                "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / divisor, 1)}
+    if psutil is not None:
+        memory = psutil.Process().memory_info()
+        return {"self": round(getattr(memory, 'peak_wset', memory.rss) / (1024 * 1024), 1), "children": None}
+    return None
+
+def run_worker(size, compression="store"):
+    # 복사된 작업 폴더 안에서 실행된다 (모든 경로가 __file__ 기준이므로)
+    from scripts import writing_sequence as ws
+    from page4_export.export_functions import export_drafts, get_archive_path
+    from scripts.progress_events import event_bus as events
+    from scripts.pipeline_engine import PipelineEngine
+
+    counts = {"llm_calls": 0, "llm_tokens": 0, "rewrite_iterations": 0}
+    def count_event(event):
+        if event["type"] == "llm_call":
+            counts["llm_calls"] += 1
+            counts["llm_tokens"] += event.get("tokens") or 0
+        elif event["type"] == "log" and event["message"].startswith("재작성 iteration"):
+            counts["rewrite_iterations"] += 1
+    events.subscribe(count_event)
+
+    ws.clear_workspace()
+    stages = {}
+
+    def run_stage(name, fn):
+        io_before = get_io_counters()
+        start_time = time.perf_counter()
+        result = fn()
+        stages[name] = {"seconds": round(time.perf_counter() - start_time, 3),
+                        "io": diff_io(io_before, get_io_counters())}
+        return result
+
+    total_start = time.perf_counter()
+    io_start = get_io_counters()
+    run_stage("preprocess", lambda: ws.preprocess_keywords(events))
+    engine = run_stage("engine_init", lambda: PipelineEngine(BENCH_MODEL))
+    run_stage("draft", lambda: ws.first_draft_writing(engine, events))
+    run_stage("rewrite", lambda: ws.rewrite_process(engine, events))
+    run_stage("revision", lambda: ws.revision_process(engine, events))
+    engine.close()
+    run_stage("keywords_export", lambda: ws.export_keywords(events))
+    # 내보내기 탭과 같은 경로: 작업대 원고를 txt로 바꿔 최종결과물.zip에 쓴다 (manifest 없이 전체 변환)
+    export_summary = run_stage("export", lambda: export_drafts(archive_path=get_archive_path(),
+                                                              compression=compression, incremental=False))
+    total_seconds = time.perf_counter() - total_start
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    workspace_dir = os.path.join(base_dir, 'data', '작업대')
+    keywords_df = ws.load_keywords()
+    passed = (keywords_df['글자수'] == 'O') & (keywords_df['금지어'] == 'O')
+    return {
+        "size": size,
+        "total_seconds": round(total_seconds, 3),
+        "keywords_per_second": round(size / total_seconds, 2) if total_seconds else None,
+        "stages": stages,
+        "llm_calls": counts["llm_calls"],
+        "llm_tokens": counts["llm_tokens"],
+        "rewrite_iterations": counts["rewrite_iterations"],
+        "passed": int(passed.sum()),
+        "workspace_files": len(os.listdir(workspace_dir)),
+        "export": {"files": export_summary["converted"], "files_per_second": round(export_summary["rate"], 2),
+                   "archive_mb": round(export_summary["archive_bytes"] / (1024 * 1024), 2)},
+        "peak_rss_mb": get_peak_rss_mb(),
+        "io": diff_io(io_start, get_io_counters())
+    }
+
+def run_size(project_dir, size, args):
+    with tempfile.TemporaryDirectory(prefix="bench_") as temp_dir:
+        work_dir = os.path.join(temp_dir, os.path.basename(project_dir))
+        shutil.copytree(project_dir, work_dir, ignore=COPY_IGNORE)
+        os.makedirs(os.path.join(work_dir, 'data', '작업대'), exist_ok=True)
+        make_model(os.path.join(work_dir, 'data', 'model', BENCH_MODEL), args)
+        make_keywords(size, args.seed).to_excel(os.path.join(work_dir, 'data', 'keywords.xlsx'), index=False)
+
+        result_path = os.path.join(temp_dir, 'result.json')
+        command = [sys.executable, os.path.join(work_dir, 'scripts', 'benchmark_pipeline.py'),
+                   '--worker', str(size), '--result', result_path, '--export-compression', args.export_compression]
+        log_path = os.path.join(temp_dir, 'worker.log')
+        with open(log_path, 'w', encoding='utf-8') as log_file:
+            completed = subprocess.run(command, cwd=work_dir, stdout=log_file, stderr=subprocess.STDOUT,
+                                       env=dict(os.environ, PYTHONIOENCODING='utf-8'))
+        if completed.returncode != 0 or not os.path.exists(result_path):
+            with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+                tail = f.read()[-2000:]
+            raise RuntimeError(f"Benchmark worker failed for size {size}:\n{tail}")
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+def get_version(project_dir):
+    try:
+        completed = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=project_dir,
+                                   capture_output=True, text=True)
+        return completed.stdout.strip() or None
+    except OSError:
+        return None
+
+def compare_with_baseline(report, baseline_path, tolerance):
+    # 같은 크기의 처리량이 tolerance 이상 떨어지면 회귀로 본다
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {result["size"]: result for result in json.load(f)["results"]}
+    regressions = []
+    for result in report["results"]:
+        previous = baseline.get(result["size"])
+        if not previous or not previous.get("keywords_per_second") or not result.get("keywords_per_second"):
+            continue
+        change = result["keywords_per_second"] / previous["keywords_per_second"] - 1
+        result["baseline_change"] = round(change, 3)
+        if change < -tolerance:
+            regressions.append(f"size {result['size']}: {previous['keywords_per_second']} -> "
+                               f"{result['keywords_per_second']} keywords/s ({change:+.1%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end writing pipeline benchmark against a fake LLM backend")
+    parser.add_argument('--sizes', default=",".join(str(size) for size in DEFAULT_SIZES))
+    parser.add_argument('--backend', default="fake", choices=["fake", "fake_http"])
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--distribution', default="fixed", choices=["fixed", "uniform", "exponential", "lognormal"])
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--response-length', default="900-1300")
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--check-workers', default="1")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workspace-format', default="json", choices=["docx", "json"])
+    parser.add_argument('--export-compression', default="store", choices=["store", "fast", "default", "best"])
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--baseline', default=None, help="previous report; exit 1 if throughput regressed")
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    parser.add_argument('--worker', type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--result', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        result = run_worker(args.worker, args.export_compression)
+        with open(args.result, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        return
+
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    report = {
+        "version": get_version(project_dir),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {key: value for key, value in vars(args).items()
+                     if key not in ('worker', 'result', 'output', 'baseline')},
+        "results": []
+    }
+    for size in sizes:
+        print(f"Running benchmark with {size} keywords...")
+        result = run_size(project_dir, size, args)
+        report["results"].append(result)
+        print(f"  {result['total_seconds']}s, {result['keywords_per_second']} keywords/s, "
+              f"{result['llm_calls']} LLM calls, peak RSS {result['peak_rss_mb']}")
+        print(f"  export: {result['export']['files']} files, {result['export']['files_per_second']} files/s, "
+              f"{result['export']['archive_mb']}MB zip")
+        for stage, stats in result["stages"].items():
+            print(f"    {stage}: {stats['seconds']}s")
+
+    regressions = compare_with_baseline(report, args.baseline, args.tolerance) if args.baseline else []
+
+    output_path = args.output
+    if output_path is None:
+        output_dir = os.path.join(project_dir, 'data', 'benchmarks')
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    print(f"Benchmark report written to {output_path}")
+
+    if regressions:
+        print("Throughput regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import json
+import shutil
+
+def get_checkpoint_dir():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    checkpoint_dir = os.path.join(base_dir, 'data', 'chat_logs')
+    if not os.path.exists(checkpoint_dir):
+        os.makedirs(checkpoint_dir, exist_ok=True)
+    return checkpoint_dir
+
+def get_checkpoint_path(title):
+    return os.path.join(get_checkpoint_dir(), f"{title}.json")
+
+def save_checkpoint(title, chat_log):
+    # 프롬프트 한 단계가 끝날 때마다 chat_log 전체를 덮어쓴다
+    if not title:
+        return
+    checkpoint_path = get_checkpoint_path(title)
+    temp_path = f"{checkpoint_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"title": title, "chat_log": chat_log}, f, ensure_ascii=False)
+    os.replace(temp_path, checkpoint_path)
+
+def load_checkpoint(title):
+    checkpoint_path = get_checkpoint_path(title)
+    if not title or not os.path.exists(checkpoint_path):
+        return []
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("chat_log", [])
+    except (OSError, ValueError):
+        return []
+
+def clear_checkpoints():
+    checkpoint_dir = get_checkpoint_dir()
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+def get_rewrite_start_step(model_config, prompt_count):
+    # "rewrite_from_step": 1부터 시작하는 프롬프트 번호, 음수는 끝에서부터 (-1이면 마지막 프롬프트만)
+    value = str(model_config.get("rewrite_from_step", "")).strip()
+    try:
+        step = int(value) if value else 1
+    except ValueError:
+        step = 1
+    if step == 0:
+        step = 1
+    index = step - 1 if step > 0 else prompt_count + step
+    return max(0, min(index, prompt_count - 1)) if prompt_count else 0
+
+def resume_chat_log(title, prompts, start_step):
+    # 저장된 chat_log의 앞부분이 현재 프롬프트와 같을 때만 그 단계까지 재사용한다
+    if start_step <= 0:
+        return [], []
+    chat_log = load_checkpoint(title)[:start_step * 2]
+    if len(chat_log) < start_step * 2:
+        return [], []
+    for step in range(start_step):
+        user_message, assistant_message = chat_log[step * 2], chat_log[step * 2 + 1]
+        if (user_message.get('role') != 'user' or user_message.get('content') != prompts[step]
+                or assistant_message.get('role') != 'assistant'):
+            return [], []
+    responses = [chat_log[step * 2 + 1]['content'] for step in range(start_step)]
+    return chat_log, responses
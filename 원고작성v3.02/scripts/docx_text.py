@@ -0,0 +1,63 @@
+import zipfile
+from xml.etree import ElementTree
+
+# python-docx의 Document().paragraphs[i].text와 같은 결과를 DOM 없이 얻는다
+# word/document.xml을 zip에서 바로 스트리밍하며, 본문(w:body) 바로 아래 문단만 읽는다 (표 안의 문단 제외)
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCUMENT_XML = "word/document.xml"
+
+PARAGRAPH = W + "p"
+RUN = W + "r"
+HYPERLINK = W + "hyperlink"
+TEXT = W + "t"
+BREAK = W + "br"
+BREAK_TYPE = W + "type"
+# run 안의 요소별 텍스트 (w:br은 줄바꿈일 때만 "\n", 페이지/단 나누기는 "")
+RUN_TEXT = {W + "tab": "\t", W + "ptab": "\t", W + "cr": "\n", W + "noBreakHyphen": "-"}
+
+def is_run_child(stack):
+    # stack: 닫히는 요소의 조상 태그 [document, body, p, (hyperlink,) r]
+    depth = len(stack)
+    if depth == 4:
+        return stack[3] == RUN and stack[2] == PARAGRAPH
+    if depth == 5:
+        return stack[4] == RUN and stack[3] == HYPERLINK and stack[2] == PARAGRAPH
+    return False
+
+def iter_paragraphs(path):
+    with zipfile.ZipFile(path) as archive:
+        with archive.open(DOCUMENT_XML) as xml_file:
+            stack = []
+            body = None
+            parts = None
+            for event, element in ElementTree.iterparse(xml_file, events=("start", "end")):
+                tag = element.tag
+                if event == "start":
+                    stack.append(tag)
+                    if len(stack) == 2:
+                        body = element
+                    elif len(stack) == 3 and tag == PARAGRAPH:
+                        parts = []
+                    continue
+
+                stack.pop()
+                if parts is not None and is_run_child(stack):
+                    if tag == TEXT:
+                        parts.append(element.text or "")
+                    elif tag == BREAK:
+                        if element.get(BREAK_TYPE, "textWrapping") == "textWrapping":
+                            parts.append("\n")
+                    elif tag in RUN_TEXT:
+                        parts.append(RUN_TEXT[tag])
+                elif len(stack) == 2:
+                    # 본문 바로 아래 요소가 끝나면 트리에서 떼어내 메모리를 일정하게 유지
+                    if tag == PARAGRAPH:
+                        yield "".join(parts)
+                        parts = None
+                    body.clear()
+
+def read_paragraphs(path):
+    return list(iter_paragraphs(path))
+
+def read_text(path):
+    return '\n'.join(iter_paragraphs(path))
@@ -0,0 +1,42 @@
+import re
+
+# 모델 config.json의 "repair_prompts"에 같은 키가 있으면 그 값을 사용한다
+DEFAULT_REPAIR_PROMPTS = {
+    "char_count_short": "글자수가 {char_count}자로 부족합니다. 내용을 보충해서 {min_length}자 이상 {max_length}자 이하로 늘려주세요.",
+    "char_count_long": "글자수가 {char_count}자로 너무 깁니다. 내용을 다듬어서 {max_length}자 이하로 줄여주세요. (최소 {min_length}자)",
+    "forbidden_words": "다음 단어를 쓰지 말고, 해당 단어가 들어간 문장만 자연스럽게 바꿔 써주세요: {forbidden_words}\n{sentences}",
+    "draft": "{instructions}\n나머지 내용과 문단 구성은 그대로 두고, 수정한 글 전체만 답해주세요. 문단은 빈 줄로 구분해주세요.\n\n{draft}"
+}
+
+def get_repair_prompts(data):
+    repair_prompts = dict(DEFAULT_REPAIR_PROMPTS)
+    repair_prompts.update(data.get("repair_prompts") or {})
+    return repair_prompts
+
+def is_repair_mode(model_config):
+    return str(model_config.get("rewrite_mode", "")).strip().lower() == "repair"
+
+def build_repair_instructions(failed_checks, check_list, details, paragraphs, repair_prompts):
+    # failed_checks: 실패한 검사 모듈들. 하나라도 수정 지시를 만들 수 없으면 None (전체 재생성)
+    instructions = []
+    for module in failed_checks:
+        if not hasattr(module, 'repair_fields'):
+            return None
+        fields = module.repair_fields(details.get(module.CHECK_NAME), check_list.get(module.CHECK_NAME, {}),
+                                      paragraphs)
+        if fields is None:
+            return None
+        template_key, values = fields
+        template = repair_prompts.get(template_key)
+        if not template:
+            return None
+        instructions.append(template.format(**values).strip())
+    return "\n".join(instructions) if instructions else None
+
+def build_repair_prompt(instructions, paragraphs, repair_prompts):
+    draft = "\n\n".join(paragraph for paragraph in paragraphs if paragraph.strip())
+    return repair_prompts["draft"].format(instructions=instructions, draft=draft)
+
+def split_repaired_text(text):
+    paragraphs = [paragraph.strip() for paragraph in re.split(r'\n\s*\n', text) if paragraph.strip()]
+    return paragraphs or [text]
@@ -0,0 +1,309 @@
+import json
+import time
+import math
+import random
+import asyncio
+import hashlib
+import threading
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STREAM_CHUNK_SIZE = 20
+
+def make_fake_completion(request, response_length, request_id):
+    # 요청의 마지막 메시지로 정해진 길이의 응답을 만든다 (로컬 배치 대역에서도 사용)
+    messages = request.get('messages', [])
+    prompt = messages[-1]['content'] if messages else ''
+    content = (f"[fake] {prompt} " + "가나다라마바사 " * response_length)[:response_length]
+    return {
+        "id": f"chatcmpl-fake-{request_id}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get('model', 'fake'),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": sum(len(m.get('content', '')) for m in messages),
+            "completion_tokens": len(content),
+            "total_tokens": sum(len(m.get('content', '')) for m in messages) + len(content)
+        }
+    }
+
+def make_stream_chunks(completion):
+    content = completion["choices"][0]["message"]["content"]
+    chunks = []
+    for start in range(0, len(content), STREAM_CHUNK_SIZE):
+        chunks.append({"id": completion["id"], "object": "chat.completion.chunk", "created": completion["created"],
+                       "model": completion["model"],
+                       "choices": [{"index": 0, "delta": {"content": content[start:start + STREAM_CHUNK_SIZE]},
+                                    "finish_reason": None}]})
+    chunks.append({"id": completion["id"], "object": "chat.completion.chunk", "created": completion["created"],
+                   "model": completion["model"], "choices": [{"index": 0, "delta": {"content": None}, "finish_reason": "stop"}]})
+    return chunks
+
+def parse_length_range(value, default=2000):
+    # "2000" 또는 "1800-2600" 형식
+    text = str(value).strip() if value not in (None, "") else str(default)
+    low, _, high = text.partition('-')
+    try:
+        low = int(low)
+        high = int(high) if high else low
+    except ValueError:
+        return default, default
+    return min(low, high), max(low, high)
+
+def read_float(model_config, key, default):
+    try:
+        value = model_config.get(key)
+        return default if value in (None, "") else float(value)
+    except (TypeError, ValueError):
+        return default
+
+class FakeBehavior:
+    # 지연 분포, 오류/429 비율, 응답 길이를 정한다
+    # 같은 요청의 n번째 시도는 항상 같은 결과가 나오도록 (seed, 요청, 시도 횟수)로 난수를 만든다
+    def __init__(self, latency_ms=500, latency_distribution="fixed", error_rate=0.0, rate_limit_rate=0.0,
+                 response_length=(2000, 2000), seed=0, retry_after=1.0):
+        self.latency = latency_ms / 1000
+        self.latency_distribution = latency_distribution
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.response_length = response_length
+        self.seed = seed
+        self.retry_after = retry_after
+        self.attempts = {}
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, model_config):
+        return cls(latency_ms=read_float(model_config, "fake_latency_ms", 500),
+                   latency_distribution=str(model_config.get("fake_latency_distribution") or "fixed").lower(),
+                   error_rate=read_float(model_config, "fake_error_rate", 0.0),
+                   rate_limit_rate=read_float(model_config, "fake_rate_limit_rate", 0.0),
+                   response_length=parse_length_range(model_config.get("fake_response_length")),
+                   seed=model_config.get("fake_seed") or 0,
+                   retry_after=read_float(model_config, "fake_retry_after", 1.0))
+
+    def sample_latency(self, rng):
+        mean = self.latency
+        if mean <= 0:
+            return 0.0
+        if self.latency_distribution == "uniform":
+            return rng.uniform(mean * 0.5, mean * 1.5)
+        if self.latency_distribution == "exponential":
+            return rng.expovariate(1 / mean)
+        if self.latency_distribution == "lognormal":
+            # 평균이 mean이 되도록 mu를 맞춘다 (sigma 0.5)
+            return rng.lognormvariate(math.log(mean) - 0.125, 0.5)
+        return mean
+
+    def plan(self, request):
+        # (지연 초, 오류 상태 코드 또는 None, 응답 길이, 요청 번호)
+        payload = json.dumps({key: value for key, value in request.items() if key != 'stream'},
+                             ensure_ascii=False, sort_keys=True)
+        request_key = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        with self.lock:
+            attempt = self.attempts.get(request_key, 0) + 1
+            self.attempts[request_key] = attempt
+            self.request_count += 1
+            request_id = self.request_count
+        rng = random.Random(f"{self.seed}:{request_key}:{attempt}")
+
+        latency = self.sample_latency(rng)
+        roll = rng.random()
+        status = None
+        if roll < self.rate_limit_rate:
+            status = 429
+        elif roll < self.rate_limit_rate + self.error_rate:
+            status = 500
+        response_length = rng.randint(*self.response_length)
+        return latency, status, response_length, request_id
+
+class FakeAPIError(Exception):
+    # rate_limiter가 status_code와 retry-after 헤더로 재시도 여부를 판단한다
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"Fake API error {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+def to_namespace(value):
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: to_namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [to_namespace(item) for item in value]
+    return value
+
+def make_error(status, behavior):
+    return FakeAPIError(status, behavior.retry_after if status == 429 else None)
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            if self.closed:
+                return
+            yield to_namespace(chunk)
+
+    def close(self):
+        self.closed = True
+
+class AsyncFakeStream(FakeStream):
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            if self.closed:
+                return
+            await asyncio.sleep(0)
+            yield to_namespace(chunk)
+
+    async def close(self):
+        self.closed = True
+
+class FakeCompletions:
+    def __init__(self, behavior):
+        self.behavior = behavior
+
+    def create(self, stream=False, **request):
+        latency, status, response_length, request_id = self.behavior.plan(request)
+        time.sleep(latency)
+        if status:
+            raise make_error(status, self.behavior)
+        completion = make_fake_completion(request, response_length, request_id)
+        if stream:
+            return FakeStream(make_stream_chunks(completion))
+        return to_namespace(completion)
+
+class AsyncFakeCompletions(FakeCompletions):
+    async def create(self, stream=False, **request):
+        latency, status, response_length, request_id = self.behavior.plan(request)
+        await asyncio.sleep(latency)
+        if status:
+            raise make_error(status, self.behavior)
+        completion = make_fake_completion(request, response_length, request_id)
+        if stream:
+            return AsyncFakeStream(make_stream_chunks(completion))
+        return to_namespace(completion)
+
+class FakeChatClient:
+    # OpenAI 클라이언트의 chat.completions.create만 흉내 내는 프로세스 내 가짜 백엔드
+    def __init__(self, behavior):
+        self.behavior = behavior
+        self.chat = SimpleNamespace(completions=FakeCompletions(behavior))
+
+    def close(self):
+        pass
+
+class AsyncFakeChatClient:
+    def __init__(self, behavior):
+        self.behavior = behavior
+        self.chat = SimpleNamespace(completions=AsyncFakeCompletions(behavior))
+
+    async def close(self):
+        pass
+
+class FakeChatCompletionsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self.send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+            return
+
+        behavior = self.server.behavior
+        latency, status, response_length, request_id = behavior.plan(request)
+        time.sleep(latency)
+        with self.server.lock:
+            self.server.request_count += 1
+
+        if status == 429:
+            self.send_json(429, {"error": {"message": "Rate limit reached (fake)", "type": "rate_limit_error"}},
+                           {"retry-after": str(behavior.retry_after)})
+            return
+        if status:
+            self.send_json(status, {"error": {"message": "Internal error (fake)", "type": "server_error"}})
+            return
+
+        completion = make_fake_completion(request, response_length, request_id)
+        if request.get('stream'):
+            self.send_stream(make_stream_chunks(completion))
+        else:
+            self.send_json(200, completion)
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, chunks):
+        # server-sent events 형식 (조각을 한 번에 보내지만 클라이언트는 스트리밍으로 처리한다)
+        lines = [f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n" for chunk in chunks]
+        body = ("".join(lines) + "data: [DONE]\n\n").encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.5, response_length=2000, behavior=None):
+        super().__init__((host, port), FakeChatCompletionsHandler)
+        self.behavior = behavior or FakeBehavior(latency_ms=latency * 1000,
+                                                 response_length=(response_length, response_length))
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+def start_in_background(latency=0.5, response_length=2000, port=0, behavior=None):
+    server = FakeLLMServer(port=port, latency=latency, response_length=response_length, behavior=behavior)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Local fake chat-completions server for load testing")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5, help="mean latency in seconds")
+    parser.add_argument('--distribution', default="fixed", choices=["fixed", "uniform", "exponential", "lognormal"])
+    parser.add_argument('--length', default="2000", help="response length, e.g. 2000 or 1800-2600")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--seed', default="0")
+    args = parser.parse_args()
+
+    behavior = FakeBehavior(latency_ms=args.latency * 1000, latency_distribution=args.distribution,
+                            error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                            response_length=parse_length_range(args.length), seed=args.seed,
+                            retry_after=args.retry_after)
+    server = FakeLLMServer(port=args.port, behavior=behavior)
+    print(f"Fake chat-completions server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,12 +1,36 @@
 import os
 import pandas as pd
-from docx import Document
 import openai
 import json
 import time
+import asyncio
+import sys
+from types import SimpleNamespace
 
-from openai import OpenAI
-client = OpenAI(api_key='YOUR API KEY')
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from scripts import llm_backends
+from scripts.metrics import metrics
+from scripts.workspace import save_draft, get_workspace_format
+from scripts.rate_limiter import get_rate_limiter, estimate_tokens, LLMRequestError
+from scripts.progress_events import event_bus
+from scripts.keyword_store import get_keyword_store
+from scripts.response_cache import get_response_cache, make_cache_key
+from scripts.chat_checkpoint import save_checkpoint, resume_chat_log
+from scripts.draft_repair import build_repair_prompt, split_repaired_text
+from scripts.stream_monitor import DraftRejected, StreamRelay, is_streaming, create_stream_monitor
+from scripts.batch_runner import (BatchRequestError, create_batch_backend, get_poll_seconds, make_batch_line,
+                                  parse_batch_result, run_batch)
+
+def create_client(model_config=None):
+    # 백엔드는 model_config["backend"]로 고른다 (openai, fake, fake_http)
+    return llm_backends.create_client(model_config)
+
+def create_async_client(model_config=None):
+    return llm_backends.create_async_client(model_config)
 
 def load_json_data(model_name):
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -16,13 +40,12 @@ def load_json_data(model_name):
         return json.load(f)
 
 def load_keywords():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    keywords_path = os.path.join(base_dir, "..", "data", "keywords.xlsx")
-    if not os.path.exists(keywords_path):
-        print(f"Keywords file does not exist: {keywords_path}")
+    store = get_keyword_store()
+    if store.is_empty():
+        print(f"Keywords file does not exist: {store.excel_path}")
         return pd.DataFrame()
     
-    return pd.read_excel(keywords_path)
+    return store.load_dataframe()
 
 def ensure_directory_exists(folder_name):
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -31,22 +54,13 @@ def ensure_directory_exists(folder_name):
         os.makedirs(full_path)
     return full_path
 
-def save_responses_to_docx(folder_name, file_name, responses):
+def save_responses(folder_name, file_name, responses, workspace_format="docx"):
     folder_path = ensure_directory_exists(folder_name)
-    file_path = os.path.join(folder_path, f"{file_name}.docx")
     
     retry_count = 3
     while retry_count > 0:
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            
-            doc = Document()
-            
-            for response in responses:
-                doc.add_paragraph(response)
-            
-            doc.save(file_path)
+            file_path = save_draft(folder_path, file_name, responses, workspace_format)
             print(f"Responses saved to {file_path}")
             return
         except PermissionError as e:
@@ -59,28 +73,172 @@ def save_responses_to_docx(folder_name, file_name, responses):
                 print("Maximum retries reached. Failed to save responses.")
                 return
 
-def chat_with_gpt_and_collect(prompt, model_config, chat_log=None):
+def get_max_concurrency(model_config):
+    try:
+        return max(1, int(model_config.get("max_concurrency", 1)))
+    except (TypeError, ValueError):
+        return 1
+
+def build_request_params(model_config, chat_log):
+    return dict(
+        model=model_config["model"],
+        messages=chat_log,
+        temperature=float(model_config["temperature"]),
+        max_tokens=int(model_config["max_tokens"]),
+        top_p=float(model_config["top_p"]),
+        frequency_penalty=float(model_config["frequency_penalty"]),
+        presence_penalty=float(model_config["presence_penalty"])
+    )
+
+def emit_llm_call(model_config, response, latency, mode="chat"):
+    usage = getattr(response, 'usage', None)
+    tokens = getattr(usage, 'total_tokens', None)
+    metrics.inc("llm_calls_total", model=model_config.get("model"), mode=mode)
+    if latency is not None:
+        metrics.observe("llm_call_seconds", latency, model=model_config.get("model"), mode=mode)
+    if tokens:
+        metrics.inc("llm_tokens_total", tokens, model=model_config.get("model"))
+    event_bus.emit("llm_call", model=model_config.get("model"), tokens=tokens,
+                   latency=round(latency, 3) if latency is not None else None, mode=mode)
+
+def lookup_cached_response(model_config, request_params, refresh=False):
+    # refresh=True(재작성)이면 캐시를 읽지 않고 새 응답으로 덮어쓴다
+    cache = get_response_cache(model_config)
+    if cache is None:
+        return None, None, None
+    cache_key = make_cache_key(request_params, model_config)
+    cached = None if refresh else cache.get(cache_key)
+    event_bus.emit("llm_cache", hit=cached is not None, **cache.stats())
+    return cache, cache_key, cached
+
+def stream_result(text, violation):
+    # 스트리밍 결과를 일반 응답과 같은 모양으로 맞춘다
+    message = SimpleNamespace(content=text)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None, violation=violation)
+
+def stream_completion(llm_client, request_params, monitor=None):
+    if monitor:
+        monitor.reset()
+    relay = StreamRelay(event_bus)
+    violation = None
+    stream = llm_client.chat.completions.create(stream=True, **request_params)
+    try:
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            relay.add(delta)
+            violation = monitor.feed(delta) if monitor else None
+            if violation:
+                # 불합격이 확실하면 남은 출력은 받지 않고 요청을 끊는다
+                break
+    finally:
+        stream.close()
+    relay.finish(violation)
+    return stream_result(relay.text(), violation)
+
+async def stream_completion_async(llm_client, request_params, monitor=None):
+    if monitor:
+        monitor.reset()
+    relay = StreamRelay(event_bus)
+    violation = None
+    stream = await llm_client.chat.completions.create(stream=True, **request_params)
+    try:
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            relay.add(delta)
+            violation = monitor.feed(delta) if monitor else None
+            if violation:
+                break
+    finally:
+        await stream.close()
+    relay.finish(violation)
+    return stream_result(relay.text(), violation)
+
+def check_response(chat_log, response_text, violation, monitor):
+    # 스트리밍 중단 또는 캐시된 응답의 위반이면 사용자 메시지를 되돌리고 DraftRejected를 올린다
+    if monitor and violation is None and response_text is not None:
+        monitor.reset()
+        violation = monitor.feed(response_text)
+    if violation:
+        chat_log.pop()
+        print(f"Response rejected while streaming: {violation}")
+        raise DraftRejected(f"스트리밍 중단: {violation}")
+
+def chat_with_gpt_and_collect(prompt, model_config, chat_log=None, llm_client=None, refresh=False, monitor=None):
     if chat_log is None:
         chat_log = []
+    if llm_client is None:
+        llm_client = create_client(model_config)
 
     chat_log.append({'role': 'user', 'content': prompt})
-    try:
-        response = client.chat.completions.create(
-            model=model_config["model"],
-            messages=chat_log,
-            temperature=float(model_config["temperature"]),
-            max_tokens=int(model_config["max_tokens"]),
-            top_p=float(model_config["top_p"]),
-            frequency_penalty=float(model_config["frequency_penalty"]),
-            presence_penalty=float(model_config["presence_penalty"])
-        )
-        
+    request_params = build_request_params(model_config, chat_log)
+    cache, cache_key, gpt_response = lookup_cached_response(model_config, request_params, refresh)
+    if gpt_response is None:
+        limiter = get_rate_limiter(model_config)
+        if is_streaming(model_config):
+            request_fn = lambda: stream_completion(llm_client, request_params, monitor)
+        else:
+            request_fn = lambda: llm_client.chat.completions.create(**request_params)
+        start_time = time.time()
+        try:
+            response = limiter.call(request_fn, estimate_tokens(chat_log, model_config))
+        except LLMRequestError as e:
+            chat_log.pop()
+            metrics.inc("llm_errors_total", model=model_config.get("model"))
+            print("An error occurred:", e)
+            raise
+        emit_llm_call(model_config, response, time.time() - start_time,
+                      "stream" if is_streaming(model_config) else "chat")
+        check_response(chat_log, None, getattr(response, 'violation', None), monitor)
+        gpt_response = response.choices[0].message.content.strip()
+        if cache:
+            cache.put(cache_key, gpt_response)
+    else:
+        check_response(chat_log, gpt_response, None, monitor)
+    if monitor:
+        monitor.commit(gpt_response)
+    
+    print(f"Received response: {gpt_response}")
+    chat_log.append({'role': 'assistant', 'content': gpt_response})
+
+    return gpt_response, chat_log
+
+async def chat_with_gpt_and_collect_async(prompt, model_config, chat_log=None, llm_client=None, refresh=False, monitor=None):
+    if chat_log is None:
+        chat_log = []
+
+    chat_log.append({'role': 'user', 'content': prompt})
+    request_params = build_request_params(model_config, chat_log)
+    cache, cache_key, gpt_response = lookup_cached_response(model_config, request_params, refresh)
+    if gpt_response is None:
+        limiter = get_rate_limiter(model_config)
+        if is_streaming(model_config):
+            request_fn = lambda: stream_completion_async(llm_client, request_params, monitor)
+        else:
+            request_fn = lambda: llm_client.chat.completions.create(**request_params)
+        start_time = time.time()
+        try:
+            response = await limiter.call_async(request_fn, estimate_tokens(chat_log, model_config))
+        except LLMRequestError as e:
+            chat_log.pop()
+            metrics.inc("llm_errors_total", model=model_config.get("model"))
+            print("An error occurred:", e)
+            raise
+        emit_llm_call(model_config, response, time.time() - start_time,
+                      "stream" if is_streaming(model_config) else "chat")
+        check_response(chat_log, None, getattr(response, 'violation', None), monitor)
         gpt_response = response.choices[0].message.content.strip()
-        print(f"Received response: {gpt_response}")
-        chat_log.append({'role': 'assistant', 'content': gpt_response})
-    except Exception as e:
-        print("An error occurred:", e)
-        gpt_response = f"An error occurred: {str(e)}"
+        if cache:
+            cache.put(cache_key, gpt_response)
+    else:
+        check_response(chat_log, gpt_response, None, monitor)
+    if monitor:
+        monitor.commit(gpt_response)
+
+    chat_log.append({'role': 'assistant', 'content': gpt_response})
 
     return gpt_response, chat_log
 
@@ -93,27 +251,202 @@ def generate_prompt(keyword1, keyword2, keyword3, template):
         prompt = template.format(키워드1=keyword1, 키워드2="", 키워드3="")
     return prompt
 
-def main(model_name, specific_keyword=None):
-    data = load_json_data(model_name)
-    config = data['model_config']
-    prompts = data['prompts']
-    folder_name = os.path.join("..", "data", "작업대")
-    keywords_df = load_keywords()
+def extract_keywords(keyword_pair):
+    keyword1 = str(keyword_pair.get('키워드1', '')).strip()
+    keyword2 = str(keyword_pair.get('키워드2', '')).strip()
+    keyword3 = str(keyword_pair.get('키워드3', '')).strip()
+    return keyword1, keyword2, keyword3
 
-    processed_files = set()
+def generate_article(keyword_pair, prompts, config, llm_client=None, on_prompt=None, refresh=False, start_step=0, check_list=None):
+    keyword1, keyword2, keyword3 = extract_keywords(keyword_pair)
+    title = keyword_pair.get('제목', '')
+    prompt_texts = [generate_prompt(keyword1, keyword2, keyword3, template) for template in prompts]
+    # start_step이 있으면 저장된 chat_log에서 그 앞 단계까지 이어받는다
+    chat_log, responses = resume_chat_log(title, prompt_texts, start_step)
+    # 스트리밍 모드에서 check_list가 주어지면 생성 중에 검사해 불합격이 확실하면 중단
+    monitor = create_stream_monitor(config, check_list, responses)
+
+    for prompt in prompt_texts[len(responses):]:
+        print(f"Sending prompt: {prompt}")
+        if on_prompt:
+            on_prompt(prompt)
+        response, chat_log = chat_with_gpt_and_collect(prompt, config, chat_log, llm_client, refresh, monitor)
+        responses.append(response)
+        save_checkpoint(title, chat_log)
+        print(f"Received response: {response}")
+
+    return responses
+
+async def generate_article_async(keyword_pair, prompts, config, llm_client, on_prompt=None, refresh=False, start_step=0, check_list=None):
+    keyword1, keyword2, keyword3 = extract_keywords(keyword_pair)
+    title = keyword_pair.get('제목', '')
+    prompt_texts = [generate_prompt(keyword1, keyword2, keyword3, template) for template in prompts]
+    chat_log, responses = resume_chat_log(title, prompt_texts, start_step)
+    monitor = create_stream_monitor(config, check_list, responses)
+
+    # 키워드 내부의 프롬프트 체인은 순차적으로 실행
+    for prompt in prompt_texts[len(responses):]:
+        if on_prompt:
+            on_prompt(prompt)
+        response, chat_log = await chat_with_gpt_and_collect_async(prompt, config, chat_log, llm_client, refresh,
+                                                                   monitor)
+        responses.append(response)
+        save_checkpoint(title, chat_log)
+
+    return responses
+
+def repair_article(instructions, paragraphs, repair_prompts, config, llm_client=None, on_prompt=None, check_list=None):
+    # 기존 원고와 검사별 수정 지시만 보내 한 번의 호출로 고친다
+    if on_prompt:
+        on_prompt(instructions)
+    prompt = build_repair_prompt(instructions, paragraphs, repair_prompts)
+    monitor = create_stream_monitor(config, check_list)
+    response, _ = chat_with_gpt_and_collect(prompt, config, [], llm_client, True, monitor)
+    return split_repaired_text(response)
+
+async def repair_article_async(instructions, paragraphs, repair_prompts, config, llm_client, on_prompt=None, check_list=None):
+    if on_prompt:
+        on_prompt(instructions)
+    prompt = build_repair_prompt(instructions, paragraphs, repair_prompts)
+    monitor = create_stream_monitor(config, check_list)
+    response, _ = await chat_with_gpt_and_collect_async(prompt, config, [], llm_client, True, monitor)
+    return split_repaired_text(response)
+
+async def run_keyword_jobs_async(jobs, config, folder_name, llm_client, on_start=None, on_done=None):
+    # jobs: [(title, 응답 목록을 돌려주는 코루틴 함수)]
+    semaphore = asyncio.Semaphore(get_max_concurrency(config))
+    workspace_format = get_workspace_format(config)
+
+    async def run_one(title, job):
+        async with semaphore:
+            if on_start:
+                on_start(title)
+            try:
+                responses = await job()
+                await asyncio.to_thread(save_responses, folder_name, title, responses, workspace_format)
+            except Exception as e:
+                print(f"Failed to write {title}: {e}")
+                if on_done:
+                    on_done(title, e)
+                return None
+        if on_done:
+            on_done(title, None)
+        return title
 
+    try:
+        results = await asyncio.gather(*(run_one(title, job) for title, job in jobs))
+    finally:
+        await llm_client.close()
+    return [title for title in results if title]
+
+async def write_drafts_async(keyword_pairs, prompts, config, folder_name, llm_client=None, on_start=None, on_prompt=None, on_done=None, refresh=False, start_step=0, check_list=None):
+    if llm_client is None:
+        llm_client = create_async_client(config)
+    jobs = [(keyword_pair.get('제목', ''),
+             lambda keyword_pair=keyword_pair: generate_article_async(keyword_pair, prompts, config, llm_client,
+                                                                      on_prompt, refresh, start_step, check_list))
+            for keyword_pair in keyword_pairs]
+    return await run_keyword_jobs_async(jobs, config, folder_name, llm_client, on_start, on_done)
+
+async def repair_drafts_async(repairs, repair_prompts, config, folder_name, llm_client=None, on_start=None, on_prompt=None, on_done=None, check_list=None):
+    # repairs: {title: (수정 지시, 기존 문단)}
+    if llm_client is None:
+        llm_client = create_async_client(config)
+    jobs = [(title,
+             lambda instructions=instructions, paragraphs=paragraphs: repair_article_async(
+                 instructions, paragraphs, repair_prompts, config, llm_client, on_prompt, check_list))
+            for title, (instructions, paragraphs) in repairs.items()]
+    return await run_keyword_jobs_async(jobs, config, folder_name, llm_client, on_start, on_done)
+
+def write_drafts_batch(keyword_pairs, prompts, config, folder_name, backend=None, on_start=None, on_prompt=None, on_done=None, refresh=False, start_step=0):
+    # 프롬프트 단계마다 배치 한 번: 모든 키워드의 같은 단계 요청을 한 JSONL 파일로 제출한다
+    if backend is None:
+        backend = create_batch_backend(config, create_client(config))
+    run_name = time.strftime("%Y%m%d_%H%M%S")
+
+    chains = {}
+    for keyword_pair in keyword_pairs:
+        title = keyword_pair.get('제목', '')
+        if on_start:
+            on_start(title)
+        keyword1, keyword2, keyword3 = extract_keywords(keyword_pair)
+        prompt_texts = [generate_prompt(keyword1, keyword2, keyword3, template) for template in prompts]
+        chat_log, responses = resume_chat_log(title, prompt_texts, start_step)
+        chains[title] = (prompt_texts, chat_log, responses)
+
+    for step in range(len(prompts)):
+        lines = []
+        pending = {}
+        for index, (title, (prompt_texts, chat_log, responses)) in enumerate(chains.items()):
+            if len(responses) != step:
+                continue
+            prompt = prompt_texts[step]
+            if on_prompt:
+                on_prompt(prompt)
+            chat_log.append({'role': 'user', 'content': prompt})
+            request_params = build_request_params(config, chat_log)
+            cache, cache_key, cached = lookup_cached_response(config, request_params, refresh)
+            if cached is not None:
+                chat_log.append({'role': 'assistant', 'content': cached})
+                responses.append(cached)
+                save_checkpoint(title, chat_log)
+                continue
+            custom_id = f"{index}-{step + 1}"
+            lines.append(make_batch_line(custom_id, request_params))
+            pending[custom_id] = (title, cache, cache_key)
+        if not lines:
+            continue
+
+        try:
+            results = run_batch(backend, lines, f"{run_name}_step{step + 1}", get_poll_seconds(config))
+        except Exception as e:
+            print(f"Batch submission failed: {e}")
+            results = {}
+            error = e
+        else:
+            error = None
+
+        for custom_id, (title, cache, cache_key) in pending.items():
+            prompt_texts, chat_log, responses = chains[title]
+            try:
+                if error:
+                    raise BatchRequestError(str(error))
+                gpt_response, usage = parse_batch_result(results.get(custom_id))
+            except BatchRequestError as e:
+                # 실패한 키워드는 이후 단계에서 빠지고 재작성 단계에서 다시 시도된다
+                chat_log.pop()
+                del chains[title]
+                if on_done:
+                    on_done(title, e)
+                continue
+            emit_llm_call(config, SimpleNamespace(usage=SimpleNamespace(**usage)), None, "batch")
+            if cache:
+                cache.put(cache_key, gpt_response)
+            chat_log.append({'role': 'assistant', 'content': gpt_response})
+            responses.append(gpt_response)
+            save_checkpoint(title, chat_log)
+
+    written = []
+    workspace_format = get_workspace_format(config)
+    for title, (_, _, responses) in chains.items():
+        save_responses(folder_name, title, responses, workspace_format)
+        written.append(title)
+        if on_done:
+            on_done(title, None)
+    return written
+
+def select_keyword_pairs(keywords_df, specific_keyword=None):
     if specific_keyword:
         keywords_to_process = keywords_df[keywords_df['제목'] == specific_keyword]
     else:
         keywords_to_process = keywords_df
 
+    keyword_pairs = []
+    processed_files = set()
     for _, keyword_pair in keywords_to_process.iterrows():
-        keyword1 = str(keyword_pair.get('키워드1', '')).strip()
-        keyword2 = str(keyword_pair.get('키워드2', '')).strip()
-        keyword3 = str(keyword_pair.get('키워드3', '')).strip()
+        keyword1, _, _ = extract_keywords(keyword_pair)
         title = keyword_pair.get('제목', '')
-        print(f"Current keyword: {title}")
-        
+
         if not keyword1:
             print(f"Stopping process as 키워드1 is empty.")
             break
@@ -121,25 +454,78 @@ def main(model_name, specific_keyword=None):
         if title in processed_files:
             continue
 
-        responses = []
-        chat_log = []
-
-        for template in prompts:
-            prompt = generate_prompt(keyword1, keyword2, keyword3, template)
-            print(f"Sending prompt: {prompt}")
-            response, chat_log = chat_with_gpt_and_collect(prompt, config, chat_log)
-            responses.append(response)
-            print(f"Received response: {response}")
-        
-        save_responses_to_docx(folder_name, title, responses)
+        keyword_pairs.append(keyword_pair)
         processed_files.add(title)
+    return keyword_pairs
+
+def main_async(model_name, specific_keyword=None):
+    data = load_json_data(model_name)
+    config = data['model_config']
+    prompts = data['prompts']
+    folder_name = os.path.join("..", "data", "작업대")
+    keyword_pairs = select_keyword_pairs(load_keywords(), specific_keyword)
+
+    start_time = time.time()
+    def on_done(title, error):
+        if error:
+            print(f"Failed keyword: {title} ({error})")
+        else:
+            print(f"Finished keyword: {title}")
+
+    written = asyncio.run(write_drafts_async(keyword_pairs, prompts, config, folder_name, on_done=on_done))
+    elapsed = time.time() - start_time
+    print(f"Processed {len(written)}/{len(keyword_pairs)} keywords in {elapsed:.2f}s "
+          f"({len(written) / elapsed if elapsed else 0:.2f} keywords/s, max_concurrency={get_max_concurrency(config)})")
+
+def main_batch(model_name, specific_keyword=None, batch_mode="on"):
+    data = load_json_data(model_name)
+    config = dict(data['model_config'], batch=batch_mode)
+    prompts = data['prompts']
+    folder_name = os.path.join("..", "data", "작업대")
+    keyword_pairs = select_keyword_pairs(load_keywords(), specific_keyword)
+
+    def on_done(title, error):
+        if error:
+            print(f"Failed keyword: {title} ({error})")
+
+    start_time = time.time()
+    written = write_drafts_batch(keyword_pairs, prompts, config, folder_name, on_done=on_done)
+    print(f"Processed {len(written)}/{len(keyword_pairs)} keywords in {time.time() - start_time:.2f}s "
+          f"({len(prompts)} batch rounds)")
+
+def main(model_name, specific_keyword=None):
+    data = load_json_data(model_name)
+    config = data['model_config']
+    prompts = data['prompts']
+    folder_name = os.path.join("..", "data", "작업대")
+    keywords_df = load_keywords()
+    llm_client = create_client(config)
+
+    for keyword_pair in select_keyword_pairs(keywords_df, specific_keyword):
+        title = keyword_pair.get('제목', '')
+        print(f"Current keyword: {title}")
+
+        try:
+            responses = generate_article(keyword_pair, prompts, config, llm_client)
+        except LLMRequestError as e:
+            print(f"Skipping {title}: {e}")
+            continue
+        save_responses(folder_name, title, responses, get_workspace_format(config))
 
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) < 2:
-        print("Usage: python first_draft_writer.py <model_name> [specific_keyword]")
+    args = [arg for arg in sys.argv[1:] if arg not in ('--async', '--batch', '--batch-local')]
+    if len(args) < 1:
+        print("Usage: python first_draft_writer.py <model_name> [specific_keyword] [--async | --batch | --batch-local]")
         sys.exit(1)
     
-    model_name = sys.argv[1]
-    specific_keyword = sys.argv[2] if len(sys.argv) > 2 else None
-    main(model_name, specific_keyword)
+    model_name = args[0]
+    specific_keyword = args[1] if len(args) > 1 else None
+    if '--batch-local' in sys.argv:
+        main_batch(model_name, specific_keyword, "local")
+    elif '--batch' in sys.argv:
+        main_batch(model_name, specific_keyword, "on")
+    elif '--async' in sys.argv:
+        main_async(model_name, specific_keyword)
+    else:
+        main(model_name, specific_keyword)
@@ -0,0 +1,191 @@
+import os
+import sqlite3
+import threading
+import pandas as pd
+
+from scripts.metrics import metrics, file_size
+
+KEYWORD_COLUMNS = ['제목', '키워드1', '키워드2', '키워드3', '글자수', '금지어', '중복표현']
+
+def get_data_dir():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, 'data')
+
+def get_store_path():
+    return os.path.join(get_data_dir(), 'keywords.db')
+
+def get_excel_path():
+    return os.path.join(get_data_dir(), 'keywords.xlsx')
+
+def quote(column):
+    return '"' + str(column).replace('"', '""') + '"'
+
+def to_db_value(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+class KeywordStore:
+    # keywords.xlsx 대신 상태를 행 단위로 갱신하는 SQLite 저장소 (엑셀은 가져오기/내보내기 용도)
+    def __init__(self, path=None, excel_path=None):
+        self.path = path or get_store_path()
+        self.excel_path = excel_path or get_excel_path()
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+        # 타입을 지정하지 않아 엑셀에서 읽은 숫자/문자열 값이 그대로 유지된다
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS keywords (position INTEGER PRIMARY KEY, "
+            + ", ".join(quote(column) for column in KEYWORD_COLUMNS) + ")")
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def transaction(self):
+        return Transaction(self)
+
+    def columns(self):
+        rows = self.connection.execute("PRAGMA table_info(keywords)").fetchall()
+        return [row[1] for row in rows if row[1] != 'position']
+
+    def ensure_columns(self, columns):
+        existing = self.columns()
+        for column in columns:
+            if column not in existing:
+                self.connection.execute(f"ALTER TABLE keywords ADD COLUMN {quote(column)}")
+                existing.append(column)
+
+    def get_meta(self, key, default=None):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def replace_all(self, keywords_df):
+        with self.transaction():
+            self.ensure_columns([str(column) for column in keywords_df.columns])
+            self.connection.execute("DELETE FROM keywords")
+            columns = [str(column) for column in keywords_df.columns]
+            if columns:
+                sql = (f"INSERT INTO keywords (position, {', '.join(quote(c) for c in columns)}) "
+                       f"VALUES (?, {', '.join('?' for _ in columns)})")
+                self.connection.executemany(sql, (
+                    [position] + [to_db_value(value) for value in row]
+                    for position, row in enumerate(keywords_df.itertuples(index=False, name=None))
+                ))
+
+    def import_excel(self, path=None):
+        path = path or self.excel_path
+        keywords_df = pd.read_excel(path)
+        with self.transaction():
+            self.replace_all(keywords_df)
+            self.set_meta('excel_mtime', os.path.getmtime(path))
+        return len(keywords_df)
+
+    def sync_from_excel(self):
+        # 엑셀 파일이 마지막 가져오기/내보내기 이후 바뀌었을 때만 다시 가져온다
+        if not os.path.exists(self.excel_path):
+            return False
+        with self.lock:
+            if self.get_meta('excel_mtime') == os.path.getmtime(self.excel_path):
+                return False
+            self.import_excel()
+            return True
+
+    def export_excel(self, path=None):
+        path = path or self.excel_path
+        keywords_df = self.load_dataframe().reset_index(drop=True)
+        with metrics.timer("excel_write_seconds"):
+            keywords_df.to_excel(path, index=False)
+        metrics.inc("file_write_bytes_total", file_size(path), kind="xlsx")
+        if os.path.abspath(path) == os.path.abspath(self.excel_path):
+            with self.transaction():
+                self.set_meta('excel_mtime', os.path.getmtime(path))
+        return path
+
+    def load_dataframe(self):
+        # 인덱스는 position이므로 GUI 행 번호와 update_cells/update_titles에 그대로 쓸 수 있다
+        with self.lock:
+            columns = self.columns()
+            rows = self.connection.execute(
+                f"SELECT position, {', '.join(quote(c) for c in columns)} FROM keywords ORDER BY position").fetchall()
+        keywords_df = pd.DataFrame([row[1:] for row in rows], columns=columns,
+                                   index=[row[0] for row in rows])
+        # read_excel과 같이 빈 값은 NaN으로 맞춘다
+        return keywords_df.where(keywords_df.notna(), float('nan'))
+
+    def is_empty(self):
+        return self.connection.execute("SELECT COUNT(*) FROM keywords").fetchone()[0] == 0
+
+    def update_status(self, title, column, value):
+        self.update_statuses(column, {title: value})
+
+    def update_statuses(self, column, results):
+        if not results:
+            return
+        with self.transaction():
+            self.ensure_columns([column])
+            self.connection.executemany(
+                f"UPDATE keywords SET {quote(column)} = ? WHERE \"제목\" = ?",
+                ((to_db_value(value), title) for title, value in results.items()))
+
+    def update_titles(self, titles_by_position):
+        with self.transaction():
+            self.connection.executemany(
+                "UPDATE keywords SET \"제목\" = ? WHERE position = ?",
+                ((title, position) for position, title in titles_by_position.items()))
+
+    def update_cells(self, cells):
+        # cells: [(position, column, value)], 값이 있는데 행이 없으면 새로 만든다
+        with self.transaction():
+            self.ensure_columns({column for _, column, _ in cells})
+            for position, column, value in cells:
+                if to_db_value(value) is None:
+                    self.connection.execute(f"UPDATE keywords SET {quote(column)} = NULL WHERE position = ?",
+                                            (position,))
+                    continue
+                self.connection.execute(
+                    f"INSERT INTO keywords (position, {quote(column)}) VALUES (?, ?) "
+                    f"ON CONFLICT(position) DO UPDATE SET {quote(column)} = excluded.{quote(column)}",
+                    (position, to_db_value(value)))
+
+class Transaction:
+    def __init__(self, store):
+        self.store = store
+        self.owns_transaction = False
+
+    def __enter__(self):
+        self.store.lock.acquire()
+        connection = self.store.connection
+        if not connection.in_transaction:
+            connection.execute("BEGIN IMMEDIATE")
+            self.owns_transaction = True
+        return connection
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self.owns_transaction:
+                if exc_type is None:
+                    self.store.connection.execute("COMMIT")
+                else:
+                    self.store.connection.execute("ROLLBACK")
+        finally:
+            self.store.lock.release()
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_keyword_store(path=None):
+    path = path or get_store_path()
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = KeywordStore(path)
+        store = _stores[path]
+    store.sync_from_excel()
+    return store
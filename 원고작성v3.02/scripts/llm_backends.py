@@ -0,0 +1,72 @@
+import os
+import sys
+import threading
+
+from openai import OpenAI, AsyncOpenAI
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+# 가짜 백엔드 모듈은 fake/fake_http를 고른 경우에만 불러온다 (실제 API 경로는 의존하지 않는다)
+
+# model_config["backend"]
+# openai    : OpenAI 호환 API (base_url로 다른 서버 지정 가능)
+# fake      : 프로세스 안에서 동작하는 가짜 백엔드 (네트워크 없음)
+# fake_http : 가짜 HTTP 서버를 이 프로세스에서 띄우고 OpenAI 클라이언트로 접속
+BACKENDS = ("openai", "fake", "fake_http")
+
+_behaviors = {}
+_servers = {}
+_lock = threading.Lock()
+
+def get_backend_name(model_config):
+    backend = str((model_config or {}).get("backend") or "openai").strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {backend} (available: {', '.join(BACKENDS)})")
+    return backend
+
+def get_api_key(model_config):
+    return (model_config or {}).get("api_key") or os.environ.get("OPENAI_API_KEY") or 'YOUR API KEY'
+
+def get_fake_behavior(model_config):
+    # 같은 설정의 클라이언트들은 하나의 FakeBehavior를 공유해 재시도 횟수를 함께 센다
+    from scripts.fake_llm_server import FakeBehavior
+    key = tuple(sorted((name, str(value)) for name, value in model_config.items() if name.startswith("fake_")))
+    with _lock:
+        behavior = _behaviors.get(key)
+        if behavior is None:
+            behavior = FakeBehavior.from_config(model_config)
+            _behaviors[key] = behavior
+        return behavior
+
+def get_fake_server(model_config):
+    from scripts.fake_llm_server import start_in_background
+    behavior = get_fake_behavior(model_config)
+    with _lock:
+        server = _servers.get(id(behavior))
+        if server is None:
+            server = start_in_background(behavior=behavior)
+            _servers[id(behavior)] = server
+        return server
+
+def get_base_url(model_config):
+    if get_backend_name(model_config) == "fake_http":
+        return get_fake_server(model_config).base_url
+    return (model_config or {}).get("base_url") or None
+
+def create_client(model_config=None):
+    model_config = model_config or {}
+    if get_backend_name(model_config) == "fake":
+        from scripts.fake_llm_server import FakeChatClient
+        return FakeChatClient(get_fake_behavior(model_config))
+    # 재시도는 rate_limiter가 담당하므로 클라이언트 자체 재시도는 끈다
+    return OpenAI(api_key=get_api_key(model_config), base_url=get_base_url(model_config), max_retries=0)
+
+def create_async_client(model_config=None):
+    model_config = model_config or {}
+    if get_backend_name(model_config) == "fake":
+        from scripts.fake_llm_server import AsyncFakeChatClient
+        return AsyncFakeChatClient(get_fake_behavior(model_config))
+    return AsyncOpenAI(api_key=get_api_key(model_config), base_url=get_base_url(model_config), max_retries=0)
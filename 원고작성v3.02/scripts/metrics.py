@@ -0,0 +1,254 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+# 초 단위 지연 구간 (Prometheus 기본 구간에 긴 LLM 호출용 구간을 더함)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+HELP = {
+    "stage_seconds": "Wall time of each writing_sequence stage",
+    "stage_items_total": "Documents or keywords processed per stage",
+    "llm_call_seconds": "Latency of chat completion calls",
+    "llm_calls_total": "Chat completion calls",
+    "llm_tokens_total": "Tokens reported by the API",
+    "llm_retries_total": "Retried chat completion calls",
+    "llm_errors_total": "Chat completion calls that failed after retries",
+    "draft_read_seconds": "Time to read one workspace draft (docx or json)",
+    "draft_write_seconds": "Time to write one workspace draft (docx or json)",
+    "file_read_bytes_total": "Bytes read from workspace and export files",
+    "file_write_bytes_total": "Bytes written to workspace and export files",
+    "check_document_seconds": "Time to run all enabled checks on one document",
+    "excel_write_seconds": "Time to write keywords.xlsx",
+    "export_file_seconds": "Time to export one document",
+    "subprocess_start_seconds": "Time from starting writing_sequence to its first event",
+}
+
+def get_metrics_dir():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    metrics_dir = os.path.join(base_dir, 'data', 'metrics')
+    if not os.path.exists(metrics_dir):
+        os.makedirs(metrics_dir, exist_ok=True)
+    return metrics_dir
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        # 구간 상한으로 근사 (마지막 구간은 가장 큰 상한으로 표시)
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[min(index, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+    def summary(self):
+        return {"count": self.count, "sum": round(self.sum, 4),
+                "mean": round(self.sum / self.count, 4) if self.count else None,
+                "p50": self.quantile(0.5), "p95": self.quantile(0.95), "p99": self.quantile(0.99)}
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+class MetricsRegistry:
+    # 카운터와 히스토그램을 이름 + 라벨 조합별로 모은다 (여러 스레드에서 호출됨)
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.time()
+        self.current_stage = None
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+            self.started = time.time()
+            self.current_stage = None
+
+    def inc(self, name, value=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    @contextmanager
+    def stage(self, name):
+        # 단계 전체 시간을 재고, 진행 중에는 live_summary가 단계별 처리 속도를 계산할 수 있게 한다
+        with self.lock:
+            self.current_stage = (name, time.perf_counter())
+        try:
+            with self.timer("stage_seconds", stage=name):
+                yield
+        finally:
+            with self.lock:
+                self.current_stage = None
+
+    def counter_total(self, name, **labels):
+        with self.lock:
+            series = self.counters.get(name, {})
+            return sum(value for key, value in series.items() if set(labels.items()) <= set(key))
+
+    def histogram_summary(self, name, **labels):
+        # 라벨이 맞는 히스토그램들을 합쳐서 요약
+        merged = Histogram()
+        with self.lock:
+            for key, histogram in self.histograms.get(name, {}).items():
+                if set(labels.items()) <= set(key):
+                    merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                    merged.count += histogram.count
+                    merged.sum += histogram.sum
+        return merged.summary()
+
+    def dump(self):
+        # 작업자 프로세스의 지표를 부모로 보내기 위한 값 (pickle 가능한 기본 자료형만 사용)
+        with self.lock:
+            counters = {name: list(series.items()) for name, series in self.counters.items()}
+            histograms = {name: [(key, list(histogram.counts), histogram.count, histogram.sum)
+                                 for key, histogram in series.items()]
+                          for name, series in self.histograms.items()}
+        return {"counters": counters, "histograms": histograms}
+
+    def merge(self, dumped):
+        with self.lock:
+            for name, items in dumped["counters"].items():
+                series = self.counters.setdefault(name, {})
+                for key, value in items:
+                    series[key] = series.get(key, 0) + value
+            for name, items in dumped["histograms"].items():
+                series = self.histograms.setdefault(name, {})
+                for key, counts, count, total in items:
+                    histogram = series.get(key)
+                    if histogram is None:
+                        histogram = series[key] = Histogram()
+                    histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+                    histogram.count += count
+                    histogram.sum += total
+
+    def snapshot(self):
+        with self.lock:
+            counters = {name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                        for name, series in self.counters.items()}
+            histograms = {name: [dict(histogram.summary(), labels=dict(key)) for key, histogram in series.items()]
+                          for name, series in self.histograms.items()}
+        return {"started": self.started, "elapsed_seconds": round(time.time() - self.started, 3),
+                "counters": counters, "histograms": histograms}
+
+    def to_prometheus(self, prefix="writing_"):
+        lines = []
+        with self.lock:
+            for name in sorted(self.counters):
+                metric = prefix + name
+                if name in HELP:
+                    lines.append(f"# HELP {metric} {HELP[name]}")
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in sorted(self.counters[name].items()):
+                    lines.append(f"{metric}{format_labels(key)} {value}")
+            for name in sorted(self.histograms):
+                metric = prefix + name
+                if name in HELP:
+                    lines.append(f"# HELP {metric} {HELP[name]}")
+                lines.append(f"# TYPE {metric} histogram")
+                for key, histogram in sorted(self.histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                        cumulative += count
+                        labels = format_labels(key + (("le", bound),))
+                        lines.append(f"{metric}_bucket{labels} {cumulative}")
+                    lines.append(f"{metric}_sum{format_labels(key)} {round(histogram.sum, 6)}")
+                    lines.append(f"{metric}_count{format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def live_summary(self):
+        # ProgressWindow에 보여줄 짧은 요약
+        llm = self.histogram_summary("llm_call_seconds")
+        draft_read = self.histogram_summary("draft_read_seconds")
+        draft_write = self.histogram_summary("draft_write_seconds")
+        with self.lock:
+            current_stage = self.current_stage
+        stage, stage_rate = None, None
+        if current_stage:
+            stage, stage_start = current_stage
+            stage_elapsed = time.perf_counter() - stage_start
+            stage_items = self.counter_total("stage_items_total", stage=stage)
+            stage_rate = stage_items / stage_elapsed if stage_elapsed > 0 else None
+        return {
+            "elapsed": time.time() - self.started,
+            "stage": stage, "stage_rate": stage_rate,
+            "llm_calls": llm["count"], "llm_p50": llm["p50"], "llm_p95": llm["p95"],
+            "llm_tokens": self.counter_total("llm_tokens_total"),
+            "llm_retries": self.counter_total("llm_retries_total"),
+            "llm_errors": self.counter_total("llm_errors_total"),
+            "draft_reads": draft_read["count"], "draft_writes": draft_write["count"],
+            "read_bytes": self.counter_total("file_read_bytes_total"),
+            "write_bytes": self.counter_total("file_write_bytes_total"),
+        }
+
+    def export(self, name="writing_sequence", metrics_dir=None):
+        # 실행이 끝나면 Prometheus textfile(<name>.prom)과 JSON 요약을 남긴다
+        metrics_dir = metrics_dir or get_metrics_dir()
+        prom_path = os.path.join(metrics_dir, f"{name}.prom")
+        temp_path = f"{prom_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, prom_path)
+
+        json_path = os.path.join(metrics_dir, f"{name}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=4)
+        return prom_path, json_path
+
+metrics = MetricsRegistry()
+
+def collect_metrics(fn, *args):
+    # 프로세스 풀 작업자에서 실행: 이 작업에서 기록된 지표만 모아 결과와 함께 돌려준다
+    # (작업자는 부모의 지표를 물려받거나 이전 작업의 지표를 갖고 있을 수 있으므로 먼저 비운다)
+    metrics.reset()
+    result = fn(*args)
+    return result, metrics.dump()
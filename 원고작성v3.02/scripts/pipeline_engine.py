@@ -0,0 +1,210 @@
+import os
+import sys
+import asyncio
+import importlib
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from scripts import first_draft_writer
+from scripts.chat_checkpoint import get_rewrite_start_step
+from scripts.draft_repair import get_repair_prompts, is_repair_mode, build_repair_instructions
+from scripts.stream_monitor import is_streaming
+from scripts.batch_runner import get_batch_mode
+from scripts.workspace import get_workspace_format, find_draft_path
+from page2_checks.check_engine import CheckEngine, get_check_workers, load_check_list
+
+def load_stage_scripts(stage_dir):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    scripts_dir = os.path.join(base_dir, 'page2_checks', stage_dir)
+
+    modules = []
+    for script in sorted(os.listdir(scripts_dir)):
+        if script.endswith('.py'):
+            module = importlib.import_module(f"page2_checks.{stage_dir}.{script[:-3]}")
+            modules.append((script, module))
+    return modules
+
+class PipelineEngine:
+    def __init__(self, model_name, batch_mode=None):
+        self.model_name = model_name
+
+        data = first_draft_writer.load_json_data(model_name)
+        self.config = data['model_config']
+        self.prompts = data['prompts']
+        self.client = first_draft_writer.create_client(self.config)
+        self.max_concurrency = first_draft_writer.get_max_concurrency(self.config)
+        self.rewrite_start_step = get_rewrite_start_step(self.config, len(self.prompts))
+        self.repair_mode = is_repair_mode(self.config)
+        self.repair_prompts = get_repair_prompts(data)
+        self.streaming = is_streaming(self.config)
+        if batch_mode:
+            self.config = dict(self.config, batch=batch_mode)
+        self.batch_mode = get_batch_mode(self.config)
+        self.folder_name = os.path.join("..", "data", "작업대")
+        self.workspace_format = get_workspace_format(self.config)
+
+        self.rewrite_scripts = load_stage_scripts('rewrite_scripts')
+        self.revision_scripts = load_stage_scripts('revision_scripts')
+        self.check_workers = get_check_workers(self.config)
+        self.check_engine = CheckEngine(model_name, self.rewrite_scripts, self.check_workers)
+
+        self.reload_keywords()
+
+    def reload_keywords(self):
+        keywords_df = first_draft_writer.load_keywords()
+        if '제목' in keywords_df.columns:
+            keywords_df['제목'] = keywords_df['제목'].fillna('').astype(str)
+        self.keywords_df = keywords_df
+
+        self.keyword_rows = {}
+        for _, row in keywords_df.iterrows():
+            title = row.get('제목', '')
+            if title and title not in self.keyword_rows:
+                self.keyword_rows[title] = row
+        return keywords_df
+
+    def draft_exists(self, title):
+        folder_path = first_draft_writer.ensure_directory_exists(self.folder_name)
+        return find_draft_path(folder_path, title) is not None
+
+    def get_keyword_pair(self, title):
+        keyword_pair = self.keyword_rows.get(title)
+        if keyword_pair is None:
+            raise ValueError(f"Keyword not found: {title}")
+
+        keyword1, _, _ = first_draft_writer.extract_keywords(keyword_pair)
+        if not keyword1:
+            raise ValueError(f"키워드1 is empty for {title}")
+        return keyword_pair
+
+    def get_stream_check_list(self):
+        # 스트리밍 모드에서만 생성 중 검사에 쓸 check_list를 읽는다
+        return load_check_list(self.model_name) if self.streaming else None
+
+    def write_draft(self, title, on_prompt=None, refresh=False, start_step=0, check_list=None):
+        keyword_pair = self.get_keyword_pair(title)
+        responses = first_draft_writer.generate_article(keyword_pair, self.prompts, self.config, self.client,
+                                                        on_prompt, refresh, start_step, check_list)
+        first_draft_writer.save_responses(self.folder_name, title, responses, self.workspace_format)
+        return responses
+
+    def write_drafts(self, titles, on_start=None, on_prompt=None, on_done=None, refresh=False, start_step=0):
+        # refresh=True면 응답 캐시를 건너뛰고 새로 생성 (재작성용)
+        # start_step은 저장된 chat_log에서 이어받을 프롬프트 단계 (0이면 처음부터)
+        if self.batch_mode:
+            return self.write_drafts_batch(titles, on_start, on_prompt, on_done, refresh, start_step)
+        if self.max_concurrency > 1:
+            return self.write_drafts_concurrently(titles, on_start, on_prompt, on_done, refresh, start_step)
+
+        check_list = self.get_stream_check_list()
+
+        written = []
+        for title in titles:
+            if on_start:
+                on_start(title)
+            try:
+                self.write_draft(title, on_prompt, refresh, start_step, check_list)
+            except Exception as e:
+                if on_done:
+                    on_done(title, e)
+                continue
+            written.append(title)
+            if on_done:
+                on_done(title, None)
+        return written
+
+    def write_drafts_concurrently(self, titles, on_start=None, on_prompt=None, on_done=None, refresh=False, start_step=0):
+        keyword_pairs = []
+        for title in titles:
+            try:
+                keyword_pairs.append(self.get_keyword_pair(title))
+            except ValueError as e:
+                if on_done:
+                    on_done(title, e)
+
+        return asyncio.run(first_draft_writer.write_drafts_async(
+            keyword_pairs, self.prompts, self.config, self.folder_name,
+            on_start=on_start, on_prompt=on_prompt, on_done=on_done, refresh=refresh, start_step=start_step,
+            check_list=self.get_stream_check_list()))
+
+    def write_drafts_batch(self, titles, on_start=None, on_prompt=None, on_done=None, refresh=False, start_step=0):
+        keyword_pairs = []
+        for title in titles:
+            try:
+                keyword_pairs.append(self.get_keyword_pair(title))
+            except ValueError as e:
+                if on_done:
+                    on_done(title, e)
+
+        return first_draft_writer.write_drafts_batch(
+            keyword_pairs, self.prompts, self.config, self.folder_name, on_start=on_start, on_prompt=on_prompt,
+            on_done=on_done, refresh=refresh, start_step=start_step)
+
+    def get_repair(self, title, check_list):
+        # 실패한 검사마다 수정 지시를 만들 수 있을 때만 (지시, 기존 문단)을 돌려준다
+        paragraphs = self.check_engine.paragraphs.get(title)
+        keyword_row = self.keyword_rows.get(title)
+        if not paragraphs or keyword_row is None:
+            return None
+        failed_checks = [module for module in self.check_engine.enabled_checks(check_list)
+                         if keyword_row.get(module.STATUS_COLUMN) == 'X']
+        details = {module.CHECK_NAME: self.check_engine.details.get(module.CHECK_NAME, {}).get(title)
+                   for module in failed_checks}
+        instructions = build_repair_instructions(failed_checks, check_list, details, paragraphs,
+                                                 self.repair_prompts)
+        if instructions is None:
+            return None
+        return instructions, paragraphs
+
+    def plan_repairs(self, titles):
+        if not self.repair_mode:
+            return {}
+        check_list = load_check_list(self.model_name)
+        repairs = {}
+        for title in titles:
+            repair = self.get_repair(title, check_list)
+            if repair is not None:
+                repairs[title] = repair
+        return repairs
+
+    def repair_draft(self, title, instructions, paragraphs, on_prompt=None, check_list=None):
+        responses = first_draft_writer.repair_article(instructions, paragraphs, self.repair_prompts, self.config,
+                                                      self.client, on_prompt, check_list)
+        first_draft_writer.save_responses(self.folder_name, title, responses, self.workspace_format)
+        return responses
+
+    def repair_drafts(self, repairs, on_start=None, on_prompt=None, on_done=None):
+        if self.max_concurrency > 1:
+            return asyncio.run(first_draft_writer.repair_drafts_async(
+                repairs, self.repair_prompts, self.config, self.folder_name,
+                on_start=on_start, on_prompt=on_prompt, on_done=on_done, check_list=self.get_stream_check_list()))
+
+        check_list = self.get_stream_check_list()
+        written = []
+        for title, (instructions, paragraphs) in repairs.items():
+            if on_start:
+                on_start(title)
+            try:
+                self.repair_draft(title, instructions, paragraphs, on_prompt, check_list)
+            except Exception as e:
+                if on_done:
+                    on_done(title, e)
+                continue
+            written.append(title)
+            if on_done:
+                on_done(title, None)
+        return written
+
+    def run_checks(self, titles=None):
+        return self.check_engine.run(titles)
+
+    def close(self):
+        self.check_engine.close()
+
+    def run_stage_script(self, module, titles=None, **kwargs):
+        if titles is None and not kwargs:
+            return module.main(self.model_name)
+        return module.main(self.model_name, titles, **kwargs)
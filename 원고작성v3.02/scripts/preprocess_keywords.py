@@ -1,24 +1,31 @@
 import os
+import sys
 import pandas as pd
 
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from scripts.keyword_store import get_keyword_store
+
 def preprocess_keywords():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    keywords_path = os.path.join(base_dir, "..", "data", "keywords.xlsx")
-    
-    if not os.path.exists(keywords_path):
-        print(f"Keywords file does not exist: {keywords_path}")
-        return
+    store = get_keyword_store()
+    if store.is_empty():
+        print(f"Keywords file does not exist: {store.excel_path}")
+        return False
     
-    keywords_df = pd.read_excel(keywords_path)
+    keywords_df = store.load_dataframe()
     
     # Check if the required columns exist
     required_columns = ['키워드1', '키워드2', '키워드3', '제목']
     for col in required_columns:
         if col not in keywords_df.columns:
             print(f"Column '{col}' does not exist in the keywords file.")
-            return
+            return False
 
     keyword_count = {}
+    changed_titles = {}
     for index, row in keywords_df.iterrows():
         keyword1 = row['키워드1'].strip() if pd.notna(row['키워드1']) else ""
         
@@ -30,10 +37,12 @@ def preprocess_keywords():
                 keyword_count[keyword1] = 1
                 new_title = keyword1
 
-            keywords_df.at[index, '제목'] = new_title
+            if row['제목'] != new_title:
+                changed_titles[index] = new_title
 
-    keywords_df.to_excel(keywords_path, index=False)
+    store.update_titles(changed_titles)
     print("Keywords have been preprocessed and duplicates have been renamed.")
+    return True
 
 if __name__ == "__main__":
     preprocess_keywords()
@@ -0,0 +1,59 @@
+import json
+import time
+import threading
+
+# 진행 이벤트 종류
+# stage, log, total, keyword_started, keyword_done, processed, remaining,
+# failed, passed, prompt, llm_call, llm_cache, llm_stream, check_result, revised, finished
+
+class EventBus:
+    def __init__(self):
+        self.handlers = []
+        self.lock = threading.Lock()
+
+    def subscribe(self, handler):
+        with self.lock:
+            self.handlers = self.handlers + [handler]
+
+    def unsubscribe(self, handler):
+        with self.lock:
+            self.handlers = [h for h in self.handlers if h is not handler]
+
+    def emit(self, event_type, **fields):
+        event = {"type": event_type, "time": time.time()}
+        event.update(fields)
+        for handler in self.handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"Progress handler failed for {event_type}: {e}")
+        return event
+
+    def log(self, message):
+        return self.emit("log", message=message)
+
+    def stage(self, stage):
+        return self.emit("stage", stage=stage)
+
+class JsonLinesSink:
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+def parse_event_line(line):
+    line = line.strip()
+    if not line.startswith("{"):
+        return None
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    return event if isinstance(event, dict) and "type" in event else None
+
+event_bus = EventBus()
@@ -1,8 +1,23 @@
 import sys
 import os
+import time
+import threading
+from collections import deque
 from PyQt5.QtWidgets import (QApplication, QVBoxLayout, QHBoxLayout, QLabel, QWidget, QTextEdit, 
-                             QMainWindow, QProgressBar, QPushButton, QDialog)
-from PyQt5.QtCore import QTimer, QProcess, QSocketNotifier, Qt, pyqtSignal, QObject
+                             QMainWindow, QProgressBar, QPushButton, QDialog, QPlainTextEdit, QListView)
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal, QObject, QAbstractListModel, QModelIndex
+from PyQt5.QtGui import QTextCursor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from scripts.metrics import metrics
+
+UI_FPS = 10
+LOG_MAX_LINES = 5000
+METRICS_INTERVAL = 1.0
 
 class PromptDialog(QDialog):
     def __init__(self, parent=None):
@@ -18,6 +33,44 @@ class PromptDialog(QDialog):
     def set_prompt(self, prompt):
         self.text_edit.setPlainText(prompt)
 
+class KeywordListModel(QAbstractListModel):
+    # 목록 전체를 한 번 받아두고, 끝난 키워드는 제목으로 찾아 그 행만 지운다
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.keywords = []
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.keywords)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.keywords[index.row()]
+        return None
+
+    def set_keywords(self, keywords):
+        self.beginResetModel()
+        self.keywords = list(keywords)
+        self.endResetModel()
+
+    def remove_keywords(self, keywords):
+        # 동시/배치 작성에서는 끝나는 순서가 목록 순서와 다르므로 위치가 아니라 제목으로 지운다
+        keywords = set(keywords)
+        ranges = []
+        for row, keyword in enumerate(self.keywords):
+            if keyword not in keywords:
+                continue
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        # 연속된 행은 한 번에, 뒤에서부터 지워야 앞쪽 행 번호가 바뀌지 않는다
+        for start, end in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self.keywords[start:end + 1]
+            self.endRemoveRows()
+
 class ProgressWindow(QMainWindow):
     def __init__(self, model_name):
         super().__init__()
@@ -49,14 +102,54 @@ class ProgressWindow(QMainWindow):
         self.keywords_processed_label = QLabel("처리된 키워드: 0", self)
         layout.addWidget(self.keywords_processed_label)
 
+        self.keywords_passed_label = QLabel("통과한 키워드: -", self)
+        layout.addWidget(self.keywords_passed_label)
+
+        lists_layout = QHBoxLayout()
+
+        remaining_layout = QVBoxLayout()
         self.keywords_remaining_label = QLabel("남은 키워드: -", self)
-        layout.addWidget(self.keywords_remaining_label)
+        remaining_layout.addWidget(self.keywords_remaining_label)
+        self.remaining_model = KeywordListModel(self)
+        self.remaining_view = QListView(self)
+        self.remaining_view.setUniformItemSizes(True)
+        self.remaining_view.setModel(self.remaining_model)
+        remaining_layout.addWidget(self.remaining_view)
+        lists_layout.addLayout(remaining_layout)
+
+        failed_layout = QVBoxLayout()
+        self.keywords_failed_label = QLabel("실패한 키워드: 0", self)
+        failed_layout.addWidget(self.keywords_failed_label)
+        self.failed_model = KeywordListModel(self)
+        self.failed_view = QListView(self)
+        self.failed_view.setUniformItemSizes(True)
+        self.failed_view.setModel(self.failed_model)
+        failed_layout.addWidget(self.failed_view)
+        lists_layout.addLayout(failed_layout)
+
+        layout.addLayout(lists_layout)
 
         self.status_label = QLabel("상태: 대기 중", self)
         layout.addWidget(self.status_label)
+
+        self.cache_label = QLabel("응답 캐시: 사용 안 함", self)
+        layout.addWidget(self.cache_label)
+
+        self.metrics_label = QLabel("성능: -", self)
+        layout.addWidget(self.metrics_label)
+
+        # 스트리밍 모드에서 생성 중인 응답을 보여주는 창
+        self.stream_label = QLabel("실시간 응답", self)
+        layout.addWidget(self.stream_label)
+        self.stream_text_edit = QPlainTextEdit(self)
+        self.stream_text_edit.setReadOnly(True)
+        self.stream_text_edit.setFixedHeight(120)
+        layout.addWidget(self.stream_text_edit)
         
-        self.log_text_edit = QTextEdit(self)
+        # 오래된 줄은 자동으로 버려지는 로그 창
+        self.log_text_edit = QPlainTextEdit(self)
         self.log_text_edit.setReadOnly(True)
+        self.log_text_edit.setMaximumBlockCount(LOG_MAX_LINES)
         layout.addWidget(self.log_text_edit)
 
         self.more_button = QPushButton("더보기 (프롬프트 확인)", self)
@@ -84,13 +177,48 @@ class ProgressWindow(QMainWindow):
         self.keywords_processed_label.setText(f"처리된 키워드: {processed}/{total}")
 
     def update_keywords_remaining(self, remaining):
-        self.keywords_remaining_label.setText(f"남은 키워드: {', '.join(remaining)}")
+        self.remaining_model.set_keywords(remaining)
+        self.keywords_remaining_label.setText(f"남은 키워드: {self.remaining_model.rowCount()}")
+
+    def update_keywords_completed(self, completed):
+        self.remaining_model.remove_keywords(completed)
+        self.keywords_remaining_label.setText(f"남은 키워드: {self.remaining_model.rowCount()}")
+
+    def update_keywords_passed(self, passed):
+        self.keywords_passed_label.setText(f"통과한 키워드: {len(passed)}")
+
+    def update_keywords_failed(self, failed):
+        self.failed_model.set_keywords(failed)
+        self.keywords_failed_label.setText(f"실패한 키워드: {len(failed)}")
+
+    def update_cache_stats(self, stats):
+        self.cache_label.setText(
+            f"응답 캐시: 적중 {stats['hits']} / 미스 {stats['misses']} "
+            f"({stats['entries']}개, {stats['bytes'] / (1024 * 1024):.1f}MB)")
+
+    def update_metrics(self, summary):
+        text = f"LLM 호출 {summary['llm_calls']}회"
+        if summary['llm_p50'] is not None:
+            text += f" (p50 ≤{summary['llm_p50']}s, p95 ≤{summary['llm_p95']}s)"
+        text += (f", 토큰 {summary['llm_tokens']}, 재시도 {summary['llm_retries']}, 오류 {summary['llm_errors']}"
+                 f" | 읽기 {summary['read_bytes'] / (1024 * 1024):.1f}MB, 쓰기 {summary['write_bytes'] / (1024 * 1024):.1f}MB")
+        if summary['stage_rate'] is not None:
+            text += f" | {summary['stage']} {summary['stage_rate']:.1f}건/초"
+        self.metrics_label.setText(f"성능: {text}")
 
     def update_status(self, status):
         self.status_label.setText(f"상태: {status}")
 
+    def clear_stream(self):
+        self.stream_text_edit.clear()
+
+    def append_stream(self, text):
+        self.stream_text_edit.moveCursor(QTextCursor.End)
+        self.stream_text_edit.insertPlainText(text)
+        self.stream_text_edit.ensureCursorVisible()
+
     def append_log(self, message):
-        self.log_text_edit.append(message)
+        self.log_text_edit.appendPlainText(message)
 
     def show_prompt_dialog(self):
         self.prompt_dialog.show()
@@ -103,60 +231,150 @@ class ProgressWindow(QMainWindow):
         self.append_log("작업이 완료되었습니다. 창을 닫으려면 '닫기' 버튼을 클릭하세요.")
 
 class ProgressUpdater(QObject):
-    progress_updated = pyqtSignal(str)
-    current_stage = pyqtSignal(str)
-    total_keywords = pyqtSignal(int)
-    keywords_processed = pyqtSignal(int)
-    current_keyword = pyqtSignal(str)
-    keywords_remaining = pyqtSignal(list)
-    keywords_failed = pyqtSignal(list)
-    keywords_passed = pyqtSignal(list)
-    prompt_updated = pyqtSignal(str)
-
-    def __init__(self, window):
+    # 작업 스레드의 이벤트는 상태만 갱신하고, 화면은 UI_FPS 주기로 한 번에 반영한다
+    # 단계가 끝나면 다음 타이머를 기다리지 않고 남은 상태를 바로 반영한다
+    flush_requested = pyqtSignal()
+
+    def __init__(self, window, fps=UI_FPS):
         super().__init__()
         self.window = window
-        self.connect_signals()
-
-    def connect_signals(self):
-        self.progress_updated.connect(self.window.append_log)
-        self.current_stage.connect(self.window.update_stage)
-        self.current_keyword.connect(self.window.update_current_keyword)
-        self.keywords_processed.connect(lambda x: self.window.update_keywords_processed(x, self.total))
-        self.keywords_remaining.connect(self.window.update_keywords_remaining)
-        self.total_keywords.connect(self.set_total_keywords)
-        self.prompt_updated.connect(self.window.update_prompt)
-
-    def set_total_keywords(self, total):
-        self.total = total
-        self.window.update_progress(0, total)
+        self.lock = threading.Lock()
+        self.total = 0
+        self.logs = deque(maxlen=LOG_MAX_LINES)
+        self.pending = {}
+        # 가장 최근에 시작된 스트림만 화면에 보여준다
+        self.stream_id = None
+        self.stream_parts = []
+        self.metrics_flushed = 0
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(int(1000 / fps))
+        # 작업 스레드에서 emit해도 화면 스레드에서 실행된다
+        self.flush_requested.connect(self.flush)
+
+    def set_pending(self, key, value):
+        with self.lock:
+            self.pending[key] = value
 
     def update_progress(self, message):
-        self.progress_updated.emit(message)
+        with self.lock:
+            self.logs.append(message)
 
     def update_stage(self, stage):
-        self.current_stage.emit(stage)
+        self.set_pending("stage", stage)
 
     def update_total_keywords(self, total):
-        self.total_keywords.emit(total)
+        self.set_pending("total", total)
 
     def update_keywords_processed(self, processed):
-        self.keywords_processed.emit(processed)
+        self.set_pending("processed", processed)
 
     def update_current_keyword(self, keyword):
-        self.current_keyword.emit(keyword)
+        self.set_pending("keyword", keyword)
 
     def update_keywords_remaining(self, remaining):
-        self.keywords_remaining.emit(remaining)
+        with self.lock:
+            self.pending["remaining"] = remaining
+            self.pending.pop("completed", None)
+
+    def update_keyword_done(self, keyword):
+        # 다음 flush까지 끝난 키워드를 모아 두었다가 남은 목록에서 한 번에 지운다
+        with self.lock:
+            self.pending.setdefault("completed", []).append(keyword)
 
     def update_keywords_failed(self, failed):
-        self.keywords_failed.emit(failed)
+        self.set_pending("failed", failed)
 
     def update_keywords_passed(self, passed):
-        self.keywords_passed.emit(passed)
+        self.set_pending("passed", passed)
 
     def update_prompt(self, prompt):
-        self.prompt_updated.emit(prompt)
+        self.set_pending("prompt", prompt)
+
+    def update_cache_stats(self, stats):
+        self.set_pending("cache", stats)
+
+    def update_stream(self, event):
+        with self.lock:
+            if event.get("reset"):
+                self.stream_id = event["stream"]
+                self.stream_parts = []
+                self.pending["stream_reset"] = True
+            elif event["stream"] == self.stream_id and event.get("text"):
+                self.stream_parts.append(event["text"])
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            logs = list(self.logs)
+            self.logs.clear()
+            stream_text, self.stream_parts = "".join(self.stream_parts), []
+
+        if logs:
+            self.window.append_log("\n".join(logs))
+        if "stage" in pending:
+            self.window.update_stage(pending["stage"])
+        if "total" in pending:
+            self.total = pending["total"]
+            self.window.update_progress(0, self.total)
+        if "processed" in pending:
+            self.window.update_keywords_processed(pending["processed"], self.total)
+            self.window.update_progress(min(pending["processed"], self.total), self.total)
+        if "keyword" in pending:
+            self.window.update_current_keyword(pending["keyword"])
+        if "remaining" in pending:
+            self.window.update_keywords_remaining(pending["remaining"])
+        if "completed" in pending:
+            self.window.update_keywords_completed(pending["completed"])
+        if "failed" in pending:
+            self.window.update_keywords_failed(pending["failed"])
+        if "passed" in pending:
+            self.window.update_keywords_passed(pending["passed"])
+        if "prompt" in pending:
+            self.window.update_prompt(pending["prompt"])
+        if "cache" in pending:
+            self.window.update_cache_stats(pending["cache"])
+        if "stream_reset" in pending:
+            self.window.clear_stream()
+        if stream_text:
+            self.window.append_stream(stream_text)
+        # 지표 요약은 1초에 한 번만 계산한다
+        now = time.monotonic()
+        if now - self.metrics_flushed >= METRICS_INTERVAL:
+            self.metrics_flushed = now
+            self.window.update_metrics(metrics.live_summary())
+
+    def handle_event(self, event):
+        # progress_events의 이벤트를 화면 상태로 변환 (작업 스레드에서 호출됨)
+        event_type = event.get("type")
+        if event_type == "log":
+            self.update_progress(event["message"])
+        elif event_type == "stage":
+            # 이전 단계의 마지막 상태(통과 목록 등)가 다음 단계 이벤트에 묻히지 않도록 바로 반영
+            self.flush_requested.emit()
+            self.update_stage(event["stage"])
+        elif event_type == "total":
+            self.update_total_keywords(event["total"])
+        elif event_type == "keyword_done":
+            self.update_keyword_done(event["keyword"])
+        elif event_type == "keyword_started":
+            self.update_current_keyword(event["keyword"])
+        elif event_type == "prompt":
+            self.update_prompt(event["prompt"])
+        elif event_type == "remaining":
+            self.update_keywords_remaining(event["keywords"])
+        elif event_type == "processed":
+            self.update_keywords_processed(event["processed"])
+        elif event_type == "failed":
+            self.update_keywords_failed(event["keywords"])
+        elif event_type == "passed":
+            self.update_keywords_passed(event["keywords"])
+        elif event_type == "llm_cache":
+            self.update_cache_stats(event)
+        elif event_type == "llm_stream":
+            self.update_stream(event)
+        elif event_type == "finished":
+            self.flush_requested.emit()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
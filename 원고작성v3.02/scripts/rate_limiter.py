@@ -0,0 +1,336 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from scripts.metrics import metrics
+
+MAX_RETRY_WAIT = 120
+
+def get_rate_limit_dir():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    rate_limit_dir = os.path.join(base_dir, 'data', 'rate_limit')
+    if not os.path.exists(rate_limit_dir):
+        os.makedirs(rate_limit_dir, exist_ok=True)
+    return rate_limit_dir
+
+def read_number(model_config, key, default, cast=float):
+    value = model_config.get(key, default)
+    if value in (None, ""):
+        return default
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return default
+
+class LLMRequestError(Exception):
+    pass
+
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'a+b')
+        if os.name == 'nt':
+            import msvcrt
+            while True:
+                try:
+                    self.file.seek(0)
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if os.name == 'nt':
+            import msvcrt
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        self.file.close()
+        self.file = None
+
+class SharedTokenBucket:
+    # 여러 프로세스가 같은 상태 파일을 lock 파일로 보호하며 공유한다
+    def __init__(self, name, requests_per_minute=0, tokens_per_minute=0):
+        safe_name = re.sub(r'[^\w.-]', '_', name)
+        rate_limit_dir = get_rate_limit_dir()
+        self.state_path = os.path.join(rate_limit_dir, f"{safe_name}.json")
+        self.lock_path = os.path.join(rate_limit_dir, f"{safe_name}.lock")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.thread_lock = threading.Lock()
+        # 한도가 없으면 상태 파일과 lock 파일을 쓰지 않고, 429 대기 시각만 이 프로세스 안에서 기억한다
+        self.blocked_until = 0
+
+    def is_limited(self):
+        return bool(self.requests_per_minute or self.tokens_per_minute)
+
+    def load_state(self, now):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"requests": self.requests_per_minute, "tokens": self.tokens_per_minute,
+                    "updated": now, "blocked_until": 0}
+
+    def save_state(self, state):
+        temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+
+    def refill(self, state, now):
+        elapsed = max(0.0, now - state["updated"])
+        if self.requests_per_minute:
+            state["requests"] = min(self.requests_per_minute, state["requests"] + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            state["tokens"] = min(self.tokens_per_minute, state["tokens"] + elapsed * self.tokens_per_minute / 60)
+        state["updated"] = now
+
+    def try_consume(self, tokens):
+        if not self.is_limited():
+            return max(0.0, self.blocked_until - time.time())
+        with self.thread_lock, FileLock(self.lock_path):
+            now = time.time()
+            state = self.load_state(now)
+            self.refill(state, now)
+
+            wait = max(0.0, state.get("blocked_until", 0) - now)
+            if not wait and self.requests_per_minute and state["requests"] < 1:
+                wait = (1 - state["requests"]) * 60 / self.requests_per_minute
+            if not wait and self.tokens_per_minute:
+                tokens = min(tokens, self.tokens_per_minute)
+                if state["tokens"] < tokens:
+                    wait = (tokens - state["tokens"]) * 60 / self.tokens_per_minute
+
+            if not wait:
+                if self.requests_per_minute:
+                    state["requests"] -= 1
+                if self.tokens_per_minute:
+                    state["tokens"] -= tokens
+            self.save_state(state)
+            return wait
+
+    def adjust_tokens(self, delta):
+        if not self.tokens_per_minute or not delta:
+            return
+        with self.thread_lock, FileLock(self.lock_path):
+            now = time.time()
+            state = self.load_state(now)
+            self.refill(state, now)
+            state["tokens"] -= delta
+            self.save_state(state)
+
+    def block_for(self, seconds):
+        if not self.is_limited():
+            with self.thread_lock:
+                self.blocked_until = max(self.blocked_until, time.time() + seconds)
+            return
+        with self.thread_lock, FileLock(self.lock_path):
+            now = time.time()
+            state = self.load_state(now)
+            self.refill(state, now)
+            state["blocked_until"] = max(state.get("blocked_until", 0), now + seconds)
+            self.save_state(state)
+
+class AdaptiveConcurrency:
+    # AIMD: 성공하면 한 창(window)에 1씩 늘리고, 429나 지연 초과 시 절반으로 줄인다
+    def __init__(self, max_limit, latency_target=0):
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.condition = threading.Condition()
+        self.async_waiters = deque()
+
+    def has_capacity(self):
+        return self.in_flight < max(1, int(self.limit))
+
+    def acquire(self):
+        with self.condition:
+            while not self.has_capacity():
+                self.condition.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.condition:
+                if self.has_capacity():
+                    self.in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self.async_waiters.append((loop, waiter))
+            await waiter
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.wake_waiters()
+
+    def wake_waiters(self):
+        free_slots = max(1, int(self.limit)) - self.in_flight
+        self.condition.notify(max(0, free_slots))
+        while self.async_waiters and free_slots > 0:
+            loop, waiter = self.async_waiters.popleft()
+            loop.call_soon_threadsafe(lambda waiter=waiter: waiter.done() or waiter.set_result(None))
+            free_slots -= 1
+
+    def on_success(self, latency):
+        with self.condition:
+            if self.latency_target and latency > self.latency_target:
+                self.limit = max(1.0, self.limit / 2)
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+                self.wake_waiters()
+
+    def on_throttled(self):
+        with self.condition:
+            self.limit = max(1.0, self.limit / 2)
+
+def is_rate_limit_error(error):
+    return getattr(error, 'status_code', None) == 429 or type(error).__name__ == 'RateLimitError'
+
+def is_retryable_error(error):
+    if is_rate_limit_error(error):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    if status_code is not None:
+        return status_code >= 500 or status_code in (408, 409)
+    return type(error).__name__ in ('APIConnectionError', 'APITimeoutError')
+
+def get_retry_after(error):
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+def estimate_tokens(messages, model_config):
+    prompt_tokens = sum(len(message.get('content', '')) for message in messages)
+    return prompt_tokens + read_number(model_config, "max_tokens", 0, int)
+
+class RateLimiter:
+    def __init__(self, model_config):
+        self.bucket = SharedTokenBucket(
+            model_config.get("model", "default"),
+            read_number(model_config, "requests_per_minute", 0),
+            read_number(model_config, "tokens_per_minute", 0)
+        )
+        self.concurrency = AdaptiveConcurrency(
+            read_number(model_config, "max_concurrency", 1, int),
+            read_number(model_config, "latency_target_seconds", 0)
+        )
+        self.max_retries = read_number(model_config, "max_retries", 5, int)
+
+    def backoff(self, error, attempt):
+        retry_after = get_retry_after(error)
+        if retry_after is None:
+            retry_after = min(MAX_RETRY_WAIT, 2 ** attempt) + random.uniform(0, 1)
+        if is_rate_limit_error(error):
+            self.concurrency.on_throttled()
+            self.bucket.block_for(retry_after)
+        return retry_after
+
+    def record_usage(self, estimated_tokens, response):
+        usage = getattr(response, 'usage', None)
+        total_tokens = getattr(usage, 'total_tokens', None)
+        if total_tokens is not None:
+            self.bucket.adjust_tokens(total_tokens - estimated_tokens)
+
+    def call(self, request_fn, estimated_tokens):
+        for attempt in range(self.max_retries + 1):
+            wait = self.bucket.try_consume(estimated_tokens)
+            while wait:
+                time.sleep(wait)
+                wait = self.bucket.try_consume(estimated_tokens)
+
+            self.concurrency.acquire()
+            start_time = time.time()
+            try:
+                response = request_fn()
+            except Exception as e:
+                self.concurrency.release()
+                if not is_retryable_error(e) or attempt == self.max_retries:
+                    raise LLMRequestError(str(e)) from e
+                delay = self.backoff(e, attempt)
+                metrics.inc("llm_retries_total", status=getattr(e, 'status_code', None) or type(e).__name__)
+                print(f"Request failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            self.concurrency.release()
+            self.concurrency.on_success(time.time() - start_time)
+            self.record_usage(estimated_tokens, response)
+            return response
+
+    async def run_bucket_async(self, fn, *args):
+        # 상태 파일 lock과 IO는 이벤트 루프의 다른 요청을 막지 않도록 스레드에서 실행한다
+        if not self.bucket.is_limited():
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    async def call_async(self, request_fn, estimated_tokens):
+        for attempt in range(self.max_retries + 1):
+            wait = await self.run_bucket_async(self.bucket.try_consume, estimated_tokens)
+            while wait:
+                await asyncio.sleep(wait)
+                wait = await self.run_bucket_async(self.bucket.try_consume, estimated_tokens)
+
+            await self.concurrency.acquire_async()
+            start_time = time.time()
+            try:
+                response = await request_fn()
+            except Exception as e:
+                self.concurrency.release()
+                if not is_retryable_error(e) or attempt == self.max_retries:
+                    raise LLMRequestError(str(e)) from e
+                delay = await self.run_bucket_async(self.backoff, e, attempt)
+                metrics.inc("llm_retries_total", status=getattr(e, 'status_code', None) or type(e).__name__)
+                print(f"Request failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            self.concurrency.release()
+            self.concurrency.on_success(time.time() - start_time)
+            await self.run_bucket_async(self.record_usage, estimated_tokens, response)
+            return response
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(model_config):
+    key = (
+        model_config.get("model", "default"),
+        model_config.get("requests_per_minute", ""),
+        model_config.get("tokens_per_minute", ""),
+        model_config.get("max_concurrency", ""),
+        model_config.get("latency_target_seconds", ""),
+        model_config.get("max_retries", ""),
+    )
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(model_config)
+        return _limiters[key]
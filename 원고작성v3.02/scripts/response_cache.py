@@ -0,0 +1,111 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+DEFAULT_MAX_MB = 100
+
+def get_cache_path():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, 'data', 'llm_cache.db')
+
+def is_cache_enabled(model_config):
+    return str(model_config.get("response_cache", "")).strip().lower() in ("1", "true", "on", "yes")
+
+def get_max_bytes(model_config):
+    try:
+        max_mb = float(model_config.get("response_cache_max_mb") or DEFAULT_MAX_MB)
+    except (TypeError, ValueError):
+        max_mb = DEFAULT_MAX_MB
+    return int(max_mb * 1024 * 1024)
+
+def make_cache_key(request_params, model_config=None):
+    # 백엔드/서버 주소, 모델 파라미터, 메시지 전체가 같을 때만 같은 키가 된다 (가짜 백엔드 응답과 섞이지 않도록)
+    model_config = model_config or {}
+    source = {"backend": str(model_config.get("backend") or "openai").strip().lower(),
+              "base_url": model_config.get("base_url") or None}
+    payload = json.dumps({"source": source, "request": request_params}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    # 응답 텍스트를 SQLite에 저장하고, 최대 크기를 넘으면 가장 오래 쓰지 않은 항목부터 지운다
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = path or get_cache_path()
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, size INTEGER, last_used REAL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        # 항목 수와 크기는 열 때 한 번만 세고, 이후에는 put/evict에서 바뀐 만큼만 더하고 뺀다
+        self.entries, self.total_bytes = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def get(self, key):
+        with self.lock:
+            row = self.connection.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, response):
+        size = len(key) + len(response.encode('utf-8'))
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, response, size, time.time()))
+                entries = self.entries + (0 if row else 1)
+                total_bytes = self.total_bytes + size - (row[0] if row else 0)
+                removed, removed_bytes = self.evict(total_bytes)
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+            # 커밋된 뒤에만 카운터를 바꾼다
+            self.entries = entries - removed
+            self.total_bytes = total_bytes - removed_bytes
+
+    def evict(self, total_bytes):
+        # (지운 항목 수, 지운 크기)
+        excess = total_bytes - self.max_bytes
+        if excess <= 0:
+            return 0, 0
+        expired = []
+        removed_bytes = 0
+        for key, size in self.connection.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            expired.append((key,))
+            removed_bytes += size
+            if removed_bytes >= excess:
+                break
+        self.connection.executemany("DELETE FROM responses WHERE key = ?", expired)
+        return len(expired), removed_bytes
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": self.entries, "bytes": self.total_bytes}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache(model_config):
+    # 모델 설정에서 "response_cache"를 켠 경우에만 캐시를 사용한다
+    global _cache
+    if not is_cache_enabled(model_config):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        _cache.max_bytes = get_max_bytes(model_config)
+        return _cache
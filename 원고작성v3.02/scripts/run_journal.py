@@ -0,0 +1,108 @@
+import os
+import json
+import time
+import threading
+
+def get_journal_path():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, 'data', 'run_journal.jsonl')
+
+class RunJournal:
+    # 키워드별 단계 완료 기록을 한 줄씩 추가하는 append-only 저널
+    def __init__(self, model_name, path=None):
+        self.model_name = model_name
+        self.path = path or get_journal_path()
+        self.lock = threading.Lock()
+        self.file = None
+        self.states = {}
+
+    def start(self, resume=False):
+        if resume:
+            journal_model = self.load()
+            if journal_model == self.model_name:
+                self.open()
+                return True
+            if journal_model is not None:
+                print(f"Journal belongs to model '{journal_model}', starting a new run.")
+
+        self.states = {}
+        with open(self.path, 'w', encoding='utf-8'):
+            pass
+        self.open()
+        self.append({"stage": "run_started", "model": self.model_name})
+        return False
+
+    def open(self):
+        self.file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def load(self):
+        self.states = {}
+        journal_model = None
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 비정상 종료로 잘린 마지막 줄은 무시
+                    continue
+                if entry.get("stage") == "run_started":
+                    journal_model = entry.get("model")
+                    self.states = {}
+                else:
+                    self.apply(entry)
+        return journal_model
+
+    def apply(self, entry):
+        title = entry.get("title")
+        stage = entry.get("stage")
+        if stage == "drafted":
+            # 새로 작성된 문서는 이전 검사/수정 결과를 무효화
+            self.states[title] = {"drafted": True, "checks": {}, "revised": []}
+            return
+
+        state = self.states.setdefault(title, {"drafted": False, "checks": {}, "revised": []})
+        if stage == "check":
+            state["checks"][entry.get("check")] = entry.get("result")
+        elif stage == "revised":
+            state["revised"].append(entry.get("script"))
+
+    def append(self, *entries):
+        now = time.time()
+        entries = [dict(entry, time=now) for entry in entries]
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with self.lock:
+            self.file.write(lines)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            for entry in entries:
+                if "title" in entry:
+                    self.apply(entry)
+
+    def record_drafted(self, title):
+        self.append({"stage": "drafted", "title": title})
+
+    def record_checks(self, check, results):
+        if results:
+            self.append(*({"stage": "check", "title": title, "check": check, "result": result}
+                          for title, result in results.items()))
+
+    def record_revised(self, title, script):
+        self.append({"stage": "revised", "title": title, "script": script})
+
+    def is_drafted(self, title):
+        return self.states.get(title, {}).get("drafted", False)
+
+    def is_revised(self, title, script):
+        return script in self.states.get(title, {}).get("revised", [])
+
+    def has_checks(self, title, checks):
+        recorded = self.states.get(title, {}).get("checks", {})
+        return all(check in recorded for check in checks)
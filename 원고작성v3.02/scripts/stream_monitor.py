@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+import itertools
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from page2_checks.forbidden_matcher import compile_forbidden_words
+from page2_checks.check_engine import is_check_enabled
+
+STREAM_EVENT_INTERVAL = 0.1
+
+_stream_ids = itertools.count(1)
+
+class DraftRejected(Exception):
+    pass
+
+def is_streaming(model_config):
+    return str(model_config.get("stream", "")).strip().lower() in ("1", "true", "on", "yes")
+
+class StreamMonitor:
+    # 생성 중인 텍스트에 글자수/금지어 검사를 조각 단위로 이어서 실행한다
+    # 원고는 응답들을 이어 붙인 것이므로 앞 단계 응답 길이(prefix_length)도 함께 센다
+    def __init__(self, check_list, previous_responses=()):
+        self.max_length = None
+        self.matcher = None
+        if is_check_enabled(check_list, "char_count_check"):
+            self.max_length = check_list["char_count_check"].get("max_length")
+        if is_check_enabled(check_list, "forbidden_words_check"):
+            forbidden_words = check_list["forbidden_words_check"].get("forbidden_words", [])
+            if forbidden_words:
+                self.matcher = compile_forbidden_words(forbidden_words)
+        self.prefix_length = sum(len(response) for response in previous_responses)
+        self.reset()
+
+    def reset(self):
+        self.length = 0
+        self.pending_spaces = 0
+        self.pending_newline = False
+        self.node = 0
+
+    def feed(self, delta):
+        # 확실히 불합격인 경우에만 사유를 반환
+        # 앞뒤 공백과 줄바꿈이 섞인 공백은 저장할 때 지워질 수 있으므로 세지 않는다 (항상 실제 글자수 이하)
+        for char in delta:
+            if char.isspace():
+                self.pending_spaces += 1
+                self.pending_newline = self.pending_newline or char == '\n'
+                continue
+            if self.length and not self.pending_newline:
+                self.length += self.pending_spaces
+            self.length += 1
+            self.pending_spaces = 0
+            self.pending_newline = False
+
+        total_length = self.prefix_length + self.length
+        if self.max_length is not None and total_length > self.max_length:
+            return f"글자수 초과 ({total_length}자 > {self.max_length}자)"
+        if self.matcher is not None:
+            self.node, found = self.matcher.scan(delta, self.node)
+            if found:
+                return f"금지어 포함 ({', '.join(dict.fromkeys(found))})"
+        return None
+
+    def commit(self, response):
+        self.prefix_length += len(response)
+        self.reset()
+
+def create_stream_monitor(model_config, check_list, previous_responses=()):
+    if not check_list or not is_streaming(model_config):
+        return None
+    return StreamMonitor(check_list, previous_responses)
+
+class StreamRelay:
+    # 토큰 조각을 모아 STREAM_EVENT_INTERVAL마다 한 번씩 "llm_stream" 이벤트로 보낸다
+    def __init__(self, events):
+        self.events = events
+        self.stream_id = next(_stream_ids)
+        self.parts = []
+        self.buffer = []
+        self.last_emit = 0
+        self.events.emit("llm_stream", stream=self.stream_id, text="", reset=True)
+
+    def add(self, delta):
+        self.parts.append(delta)
+        self.buffer.append(delta)
+        now = time.time()
+        if now - self.last_emit >= STREAM_EVENT_INTERVAL:
+            self.flush(now)
+
+    def flush(self, now=None):
+        if self.buffer:
+            self.events.emit("llm_stream", stream=self.stream_id, text="".join(self.buffer))
+            self.buffer = []
+        self.last_emit = now or time.time()
+
+    def finish(self, violation=None):
+        self.flush()
+        self.events.emit("llm_stream", stream=self.stream_id, text="", done=True, aborted=violation)
+
+    def text(self):
+        return "".join(self.parts)
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from scripts.metrics import metrics, file_size
+from scripts import docx_text
+
+# model_config["workspace_format"]
+# docx : 작업대에 docx로 저장 (기존 방식)
+# json : 문단 목록을 UTF-8 JSON으로 저장하고, docx는 내보낼 때만 만든다
+WORKSPACE_FORMATS = ("docx", "json")
+EXTENSIONS = {"docx": ".docx", "json": ".json"}
+
+def get_workspace_dir():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    workspace_dir = os.path.join(base_dir, 'data', '작업대')
+    if not os.path.exists(workspace_dir):
+        os.makedirs(workspace_dir, exist_ok=True)
+    return workspace_dir
+
+def get_workspace_format(model_config):
+    value = str((model_config or {}).get("workspace_format") or "docx").strip().lower()
+    if value == "text":
+        return "json"
+    return value if value in WORKSPACE_FORMATS else "docx"
+
+def get_file_format(path):
+    return "json" if path.lower().endswith(".json") else "docx"
+
+def is_draft_file(filename):
+    return filename.lower().endswith(tuple(EXTENSIONS.values()))
+
+def get_draft_title(filename):
+    return os.path.splitext(filename)[0]
+
+def get_draft_path(workspace_dir, title, workspace_format="docx"):
+    return os.path.join(workspace_dir, f"{title}{EXTENSIONS[workspace_format]}")
+
+def find_draft_path(workspace_dir, title):
+    # 형식을 바꾼 뒤에도 기존 원고를 읽을 수 있도록 두 형식을 모두 찾는다
+    for workspace_format in ("json", "docx"):
+        path = get_draft_path(workspace_dir, title, workspace_format)
+        if os.path.exists(path):
+            return path
+    return None
+
+def list_drafts(workspace_dir=None):
+    # {제목: 경로}
+    workspace_dir = workspace_dir or get_workspace_dir()
+    drafts = {}
+    for filename in sorted(os.listdir(workspace_dir)):
+        if is_draft_file(filename):
+            title = get_draft_title(filename)
+            # 같은 제목이 두 형식으로 있으면 json을 쓴다
+            if title not in drafts or filename.lower().endswith(".json"):
+                drafts[title] = os.path.join(workspace_dir, filename)
+    return drafts
+
+def read_docx_paragraphs(path):
+    # 읽기만 할 때는 python-docx 대신 document.xml을 스트리밍으로 읽는다
+    return docx_text.read_paragraphs(path)
+
+def write_docx_paragraphs(path, paragraphs):
+    from docx import Document
+    doc = Document()
+    for paragraph in paragraphs:
+        doc.add_paragraph(paragraph)
+    doc.save(path)
+
+def read_json_paragraphs(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)["paragraphs"]
+
+def write_json_paragraphs(path, paragraphs):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"title": get_draft_title(os.path.basename(path)), "paragraphs": list(paragraphs)},
+                  f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+def read_paragraphs(path):
+    workspace_format = get_file_format(path)
+    with metrics.timer("draft_read_seconds", format=workspace_format):
+        if workspace_format == "json":
+            paragraphs = read_json_paragraphs(path)
+        else:
+            paragraphs = read_docx_paragraphs(path)
+    metrics.inc("file_read_bytes_total", file_size(path), kind=workspace_format)
+    return paragraphs
+
+def write_paragraphs(path, paragraphs):
+    workspace_format = get_file_format(path)
+    with metrics.timer("draft_write_seconds", format=workspace_format):
+        if workspace_format == "json":
+            write_json_paragraphs(path, paragraphs)
+        else:
+            write_docx_paragraphs(path, paragraphs)
+    metrics.inc("file_write_bytes_total", file_size(path), kind=workspace_format)
+
+def save_draft(workspace_dir, title, paragraphs, workspace_format="docx"):
+    path = get_draft_path(workspace_dir, title, workspace_format)
+    write_paragraphs(path, paragraphs)
+    # 다른 형식으로 남아있는 예전 원고는 지워서 한 제목에 원고가 하나만 있도록 한다
+    for other_format in WORKSPACE_FORMATS:
+        other_path = get_draft_path(workspace_dir, title, other_format)
+        if other_format != workspace_format and os.path.exists(other_path):
+            os.remove(other_path)
+    return path
+
+def read_text(path):
+    return '\n'.join(read_paragraphs(path))
+
+def write_text(path, text):
+    write_paragraphs(path, text.split('\n'))
+
+def render_docx(path, docx_path):
+    # 내보내기용: 원고를 docx로 만든다 (이미 docx면 복사)
+    if get_file_format(path) == "docx":
+        import shutil
+        shutil.copyfile(path, docx_path)
+    else:
+        write_paragraphs(docx_path, read_paragraphs(path))
+    return docx_path
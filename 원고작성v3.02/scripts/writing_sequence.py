@@ -3,9 +3,7 @@ import sys
 import pandas as pd
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QObject, pyqtSignal, QThread
-import subprocess
 import json
-import time
 import shutil
 
 
@@ -14,6 +12,13 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 from scripts.progress_window import ProgressWindow, ProgressUpdater
+from scripts.pipeline_engine import PipelineEngine
+from scripts.run_journal import RunJournal
+from scripts.keyword_store import get_keyword_store
+from scripts.chat_checkpoint import clear_checkpoints
+from scripts.progress_events import event_bus, JsonLinesSink
+from scripts.metrics import metrics
+from scripts import preprocess_keywords as keyword_preprocessor
 
 def clear_workspace():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,28 +37,45 @@ def clear_workspace():
     else:
         os.makedirs(workspace_dir)
 
+    clear_checkpoints()
     print("Workspace cleared successfully.")
 
 class WorkerThread(QThread):
     finished = pyqtSignal()
 
-    def __init__(self, model_name, progress_updater):
+    def __init__(self, model_name, events=event_bus, journal=None, resumed=False, batch_mode=None):
         super().__init__()
         self.model_name = model_name
-        self.progress_updater = progress_updater
+        self.events = events
+        self.journal = journal
+        self.resumed = resumed
+        self.batch_mode = batch_mode
 
     def run(self):
-        config, check_list = load_model_settings(self.model_name)
+        if self.resumed:
+            self.events.log("이전 실행 기록에서 이어서 진행합니다.")
         
-        preprocess_keywords(self.progress_updater)
+        metrics.reset()
+        with metrics.stage("preprocess"):
+            preprocess_keywords(self.events)
         
-        keywords_df = load_keywords()
+        engine = PipelineEngine(self.model_name, self.batch_mode)
         
-        first_draft_writing(self.model_name, keywords_df, self.progress_updater)
-        rewrite_process(self.model_name, keywords_df, self.progress_updater)
-        revision_process(self.model_name, self.progress_updater)
+        with metrics.stage("draft"):
+            first_draft_writing(engine, self.events, self.journal, self.resumed)
+        with metrics.stage("rewrite"):
+            rewrite_process(engine, self.events, self.journal, self.resumed)
+        with metrics.stage("revision"):
+            revision_process(engine, self.events, self.journal, self.resumed)
+        engine.close()
+        with metrics.stage("export"):
+            export_keywords(self.events)
         
-        self.progress_updater.update_progress("모든 과정이 완료되었습니다.")
+        if self.journal:
+            self.journal.close()
+        export_metrics(self.events)
+        self.events.log("모든 과정이 완료되었습니다.")
+        self.events.emit("finished")
         self.finished.emit()
 
 def load_model_settings(model_name):
@@ -69,204 +91,270 @@ def load_model_settings(model_name):
     return config, check_list
 
 def load_keywords():
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    keywords_path = os.path.join(base_dir, 'data', 'keywords.xlsx')
-    df = pd.read_excel(keywords_path)
+    df = get_keyword_store().load_dataframe()
     df['제목'] = df['제목'].fillna('').astype(str)
     return df
 
 def save_keywords(keywords_df):
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    keywords_path = os.path.join(base_dir, 'data', 'keywords.xlsx')
-    keywords_df.to_excel(keywords_path, index=False)
+    get_keyword_store().replace_all(keywords_df)
 
-def run_script(script_path, model_name, progress_updater, keyword=None):
-    args = ['python', script_path, model_name]
-    if keyword:
-        args.append(keyword)
-    
+def export_keywords(events):
+    # 검사 결과는 keywords.db에 행 단위로 저장되고, 실행이 끝나면 엑셀로 한 번만 내보낸다
     try:
-        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        
-        timeout = 300
-        start_time = time.time()
-        
-        output = ""
-        while True:
-            return_code = process.poll()
-            if return_code is not None:
-                stdout, stderr = process.communicate()
-                output += stdout
-                if return_code != 0:
-                    progress_updater.update_progress(f"Error running {script_path}: {stderr}")
-                else:
-                    progress_updater.update_progress(f"Successfully ran {script_path}")
-                break
-            
-            if time.time() - start_time > timeout:
-                process.kill()
-                progress_updater.update_progress(f"Timeout running {script_path}")
-                break
-            
-            output_line = process.stdout.readline()
-            if output_line:
-                output += output_line
-                progress_updater.update_progress(output_line.strip())
-            
-            time.sleep(0.1)
-        
-        return output
-    
+        path = get_keyword_store().export_excel()
+        events.log(f"키워드 상태를 {os.path.basename(path)}로 내보냈습니다.")
     except Exception as e:
-        progress_updater.update_progress(f"Error running {script_path}: {str(e)}")
-        return ""
+        events.log(f"키워드 엑셀 내보내기 실패: {str(e)}")
 
-def preprocess_keywords(progress_updater):
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    preprocess_script = os.path.join(base_dir, 'scripts', 'preprocess_keywords.py')
-    
-    progress_updater.update_stage("키워드 전처리")
-    progress_updater.update_progress("키워드 전처리 시작")
-    
-    result = run_script(preprocess_script, "", progress_updater)
+def export_metrics(events):
+    try:
+        prom_path, json_path = metrics.export()
+        events.log(f"성능 지표를 저장했습니다: {os.path.basename(prom_path)}, {os.path.basename(json_path)}")
+    except Exception as e:
+        events.log(f"성능 지표 저장 실패: {str(e)}")
+
+def run_stage_script(engine, script, module, events, titles=None, **kwargs):
+    try:
+        result = engine.run_stage_script(module, titles, **kwargs)
+        events.log(f"Successfully ran {script}")
+        return result
+    except Exception as e:
+        events.log(f"Error running {script}: {str(e)}")
+        return None
+
+def preprocess_keywords(events):
+    events.stage("키워드 전처리")
+    events.log("키워드 전처리 시작")
     
-    if "Keywords have been preprocessed" in result:
-        progress_updater.update_progress("키워드 전처리 완료")
-    else:
-        progress_updater.update_progress(f"키워드 전처리 오류: {result}")
+    try:
+        if keyword_preprocessor.preprocess_keywords():
+            events.log("키워드 전처리 완료")
+        else:
+            events.log("키워드 전처리 오류: 키워드 파일과 필수 열을 확인하세요.")
+    except Exception as e:
+        events.log(f"키워드 전처리 오류: {str(e)}")
 
-def first_draft_writing(model_name, keywords_df, progress_updater):
-    progress_updater.update_stage("초벌작성")
+def first_draft_writing(engine, events, journal=None, resumed=False):
+    events.stage("초벌작성")
+    keywords_df = engine.keywords_df
     total_keywords = len(keywords_df)
-    progress_updater.update_total_keywords(total_keywords)
+    events.emit("total", total=total_keywords)
     
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    first_draft_script = os.path.join(base_dir, 'scripts', 'first_draft_writer.py')
-    
-    for index, row in enumerate(keywords_df.iterrows()):
-        keyword = row[1]['제목']
+    titles = []
+    for index, keyword in enumerate(keywords_df['제목']):
         if pd.isna(keyword) or keyword == '':
-            progress_updater.update_progress(f"Warning: Empty title found at index {index}")
+            events.log(f"Warning: Empty title found at index {index}")
             continue
-        
-        keyword = str(keyword)
-        progress_updater.update_current_keyword(keyword)
-        progress_updater.update_keywords_processed(index + 1)
-        
-        remaining_keywords = keywords_df['제목'][index+1:].dropna().astype(str).tolist()
-        progress_updater.update_keywords_remaining(remaining_keywords)
-        
-        result = run_script(first_draft_script, model_name, progress_updater, keyword)
-        
-        prompt_start = result.find("Sending prompt: ")
-        if prompt_start != -1:
-            prompt = result[prompt_start + 16:].split("\n")[0]
-            progress_updater.update_prompt(prompt)
-        
-        progress_updater.update_progress(f"{keyword} 초벌작성 완료")
+        titles.append(str(keyword))
+    
+    if resumed:
+        pending_titles = [title for title in titles
+                          if not (journal.is_drafted(title) and engine.draft_exists(title))]
+        events.log(f"이미 작성된 {len(titles) - len(pending_titles)}개 키워드를 건너뜁니다.")
+        titles = pending_titles
+    
+    if engine.batch_mode:
+        events.log(f"배치 작성 모드 ({engine.batch_mode}): 프롬프트 {len(engine.prompts)}단계를 배치로 제출합니다.")
+    elif engine.max_concurrency > 1:
+        events.log(f"동시 작성 모드: 최대 {engine.max_concurrency}개 키워드 동시 처리")
+    
+    # 남은 키워드 목록은 한 번만 보내고, 이후에는 끝난 키워드(keyword_done)만 목록에서 뺀다
+    events.emit("remaining", keywords=titles)
+    processed = 0
+    
+    def on_done(keyword, error):
+        nonlocal processed
+        processed += 1
+        metrics.inc("stage_items_total", stage="draft")
+        events.emit("keyword_done", stage="초벌작성", keyword=keyword, error=str(error) if error else None)
+        events.emit("processed", processed=processed)
+        if error:
+            events.log(f"{keyword} 초벌작성 오류: {str(error)}")
+        else:
+            if journal:
+                journal.record_drafted(keyword)
+            events.log(f"{keyword} 초벌작성 완료")
+    
+    engine.write_drafts(titles, on_start=lambda keyword: events.emit("keyword_started", keyword=keyword),
+                        on_prompt=lambda prompt: events.emit("prompt", prompt=prompt), on_done=on_done)
 
-def rewrite_process(model_name, keywords_df, progress_updater):
-    progress_updater.update_stage("재작성")
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    rewrite_dir = os.path.join(base_dir, 'page2_checks', 'rewrite_scripts')
+def rewrite_process(engine, events, journal=None, resumed=False):
+    events.stage("재작성")
     
     all_passed = False
     iteration = 0
+    # 첫 iteration은 전체 문서를 검사하고, 이후에는 직전에 재작성된 문서만 다시 검사
+    titles_to_check = None
+    check_names = [module.CHECK_NAME for module in engine.check_engine.enabled_checks()]
+    status_columns = engine.check_engine.status_columns()
+    if resumed:
+        # 저널에 모든 검사 결과가 남아있는 문서는 기존 결과를 그대로 사용
+        titles_to_check = {title for title in engine.keyword_rows
+                           if not journal.has_checks(title, check_names)}
+    if engine.check_workers > 1:
+        events.log(f"병렬 검사 모드: {engine.check_workers}개 프로세스")
     while not all_passed:
         iteration += 1
-        progress_updater.update_progress(f"재작성 iteration {iteration} 시작")
+        events.log(f"재작성 iteration {iteration} 시작")
+        if titles_to_check is not None:
+            events.log(f"{len(titles_to_check)}개 문서만 다시 검사합니다.")
         
-        for script in os.listdir(rewrite_dir):
-            if script.endswith('.py'):
-                script_path = os.path.join(rewrite_dir, script)
-                run_script(script_path, model_name, progress_updater)
+        # 각 문서를 한 번만 읽어서 활성화된 검사를 모두 실행
+        try:
+            check_results = engine.run_checks(titles_to_check)
+            events.log(f"검사 완료: {', '.join(check_names)}")
+        except Exception as e:
+            events.log(f"Error running checks: {str(e)}")
+            check_results = {}
+        for check_name, results in check_results.items():
+            details = engine.check_engine.details.get(check_name, {})
+            for title, result in results.items():
+                events.emit("check_result", keyword=title, check=check_name, result=result,
+                            detail=details.get(title))
+            if journal:
+                journal.record_checks(check_name, results)
         
-        keywords_df = load_keywords()
-        failed_keywords = keywords_df[(keywords_df['글자수'] == 'X') | (keywords_df['금지어'] == 'X')]
+        keywords_df = engine.reload_keywords()
+        failed_mask = pd.Series(False, index=keywords_df.index)
+        for column in status_columns:
+            failed_mask |= keywords_df[column] == 'X'
+        failed_keywords = keywords_df[failed_mask]
         
         if failed_keywords.empty:
             all_passed = True
-            progress_updater.update_progress("모든 키워드가 검사를 통과했습니다.")
+            events.log("모든 키워드가 검사를 통과했습니다.")
         else:
-            progress_updater.update_keywords_failed(failed_keywords['제목'].tolist())
-            progress_updater.update_progress(f"{len(failed_keywords)}개의 키워드가 기준을 충족하지 못했습니다.")
+            events.emit("failed", keywords=failed_keywords['제목'].tolist())
+            events.log(f"{len(failed_keywords)}개의 키워드가 기준을 충족하지 못했습니다.")
             
-            for check_type in ['글자수', '금지어']:
+            for check_type in status_columns:
                 failed_for_check = failed_keywords[failed_keywords[check_type] == 'X']
                 if not failed_for_check.empty:
                     failed_titles = failed_for_check['제목'].tolist()
-                    progress_updater.update_progress(f"{check_type} 미준수 키워드: {', '.join(failed_titles)}")
+                    events.log(f"{check_type} 미준수 키워드: {', '.join(failed_titles)}")
+            
+            failed_titles = failed_keywords['제목'].tolist()
+            # 수정 모드에서는 수정 지시를 만들 수 있는 키워드만 기존 원고를 고치고 나머지는 다시 생성
+            repairs = engine.plan_repairs(failed_titles)
+            regenerate_titles = [title for title in failed_titles if title not in repairs]
+            events.log("재작성을 시작합니다.")
+            if repairs:
+                events.log(f"{len(repairs)}개 키워드는 기존 원고를 수정합니다.")
+            if regenerate_titles and engine.rewrite_start_step:
+                events.log(f"저장된 대화에서 {engine.rewrite_start_step + 1}번째 프롬프트부터 다시 생성합니다.")
+            events.emit("remaining", keywords=failed_keywords['제목'].tolist())
+            
+            rewritten = 0
             
-            progress_updater.update_progress("재작성을 시작합니다.")
+            def on_start(keyword):
+                events.emit("keyword_started", keyword=keyword)
+                events.log(f"{keyword} 재작성 중")
             
-            for index, row in failed_keywords.iterrows():
-                keyword = row['제목']
-                progress_updater.update_current_keyword(keyword)
-                progress_updater.update_progress(f"{keyword} 재작성 중")
-                
-                first_draft_script = os.path.join(base_dir, 'scripts', 'first_draft_writer.py')
-                run_script(first_draft_script, model_name, progress_updater, keyword)
-                
-                progress_updater.update_progress(f"{keyword} 재작성 완료")
-                progress_updater.update_keywords_processed(index + 1)
+            def on_done(keyword, error):
+                nonlocal rewritten
+                rewritten += 1
+                # 다시 쓴 원고는 검사 때 읽어둔 문단과 달라졌으므로 수정 단계에서 그 문단을 쓰지 않게 한다
+                # (마지막 iteration에서 재작성된 원고는 다시 검사되지 않는다)
+                engine.check_engine.paragraphs.pop(keyword, None)
+                metrics.inc("stage_items_total", stage="rewrite")
+                events.emit("keyword_done", stage="재작성", keyword=keyword, error=str(error) if error else None)
+                if error:
+                    events.log(f"{keyword} 재작성 오류: {str(error)}")
+                else:
+                    if journal:
+                        journal.record_drafted(keyword)
+                    events.log(f"{keyword} 재작성 완료")
+                events.emit("processed", processed=rewritten)
+            
+            titles_to_check = set(failed_titles)
+            on_prompt = lambda prompt: events.emit("prompt", prompt=prompt)
+            if repairs:
+                engine.repair_drafts(repairs, on_start=on_start, on_prompt=on_prompt, on_done=on_done)
+            if regenerate_titles:
+                engine.write_drafts(regenerate_titles, on_start=on_start, on_prompt=on_prompt, on_done=on_done,
+                                    refresh=True, start_step=engine.rewrite_start_step)
         
-        passed_keywords = keywords_df[(keywords_df['글자수'] == 'O') & (keywords_df['금지어'] == 'O')]
-        progress_updater.update_keywords_passed(passed_keywords['제목'].tolist())
-        progress_updater.update_keywords_processed(len(passed_keywords))
-        progress_updater.update_keywords_remaining(failed_keywords['제목'].tolist())
+        passed_mask = pd.Series(True, index=keywords_df.index)
+        for column in status_columns:
+            passed_mask &= keywords_df[column] == 'O'
+        passed_keywords = keywords_df[passed_mask]
+        events.emit("passed", keywords=passed_keywords['제목'].tolist())
+        events.emit("processed", processed=len(passed_keywords))
+        events.emit("remaining", keywords=failed_keywords['제목'].tolist())
 
         if iteration > 10:
-            progress_updater.update_progress("최대 반복 횟수 초과. 재작성 과정을 종료합니다.")
+            events.log("최대 반복 횟수 초과. 재작성 과정을 종료합니다.")
             break
 
-    progress_updater.update_progress("재작성 과정 완료")
+    events.log("재작성 과정 완료")
 
-def revision_process(model_name, progress_updater):
-    progress_updater.update_stage("수정")
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    revision_dir = os.path.join(base_dir, 'page2_checks', 'revision_scripts')
+def revision_process(engine, events, journal=None, resumed=False):
+    events.stage("수정")
     
-    for script in os.listdir(revision_dir):
-        if script.endswith('.py'):
-            script_path = os.path.join(revision_dir, script)
-            progress_updater.update_progress(f"실행 중: {script}")
-            result = run_script(script_path, model_name, progress_updater)
-            progress_updater.update_progress(f"{script} 실행 완료")
+    for script, module in engine.revision_scripts:
+        events.log(f"실행 중: {script}")
+        titles_to_revise = None
+        if resumed:
+            titles_to_revise = {title for title in engine.keyword_rows if not journal.is_revised(title, script)}
+        
+        def on_processed(title, script=script):
+            metrics.inc("stage_items_total", stage="revision")
+            events.emit("revised", keyword=title, script=script)
+            if journal:
+                journal.record_revised(title, script)
+        
+        # 검사 단계에서 읽어둔 문단을 넘겨 대체할 단어가 없는 문서는 다시 열지 않도록 한다
+        results = run_stage_script(engine, script, module, events, titles_to_revise, on_processed=on_processed,
+                                   paragraphs=engine.check_engine.paragraphs, workers=engine.check_workers)
+        events.log(f"{script} 실행 완료")
+        
+        if results is not None:
+            events.log(f"{len(results)}개 파일 처리 완료")
             
-            if "Processed and saved:" in result:
-                processed_files = result.count("Processed and saved:")
-                progress_updater.update_progress(f"{processed_files}개 파일 처리 완료")
-                
-                # 대체 단어 정보 추출 및 표시
-                substitutions = [line for line in result.split('\n') if "Substituted:" in line]
-                if substitutions:
-                    progress_updater.update_progress("대체된 단어:")
-                    for sub in substitutions:
-                        progress_updater.update_progress(sub)
-                else:
-                    progress_updater.update_progress("대체할 단어가 없습니다.")
+            # 대체 단어 정보 추출 및 표시
+            substitutions = [sub for _, file_substitutions in results for sub in file_substitutions]
+            if substitutions:
+                events.log("대체된 단어:")
+                for sub in substitutions:
+                    events.log(sub)
             else:
-                progress_updater.update_progress(f"Warning: {script} 실행 결과 확인 필요")
+                events.log("대체할 단어가 없습니다.")
+        else:
+            events.log(f"Warning: {script} 실행 결과 확인 필요")
     
-    progress_updater.update_progress("수정 과정 완료")
+    events.log("수정 과정 완료")
 
-def main(model_name):
-    clear_workspace()
+def main(model_name, resume=False, batch_mode=None):
+    journal = RunJournal(model_name)
+    resumed = journal.start(resume)
+    if not resumed:
+        clear_workspace()
     app = QApplication(sys.argv)
     window = ProgressWindow(model_name)
     progress_updater = ProgressUpdater(window)
+    event_bus.subscribe(progress_updater.handle_event)
     window.show()
 
-    worker = WorkerThread(model_name, progress_updater)
-    worker.finished.connect(lambda: window.set_finished_state())
+    worker = WorkerThread(model_name, event_bus, journal, resumed, batch_mode)
+    worker.finished.connect(lambda: (progress_updater.flush(), window.set_finished_state()))
     worker.start()
 
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python writing_sequence.py <model_name>")
+    args = [arg for arg in sys.argv[1:] if arg not in ('--resume', '--events', '--batch', '--batch-local')]
+    if len(args) != 1:
+        print("Usage: python writing_sequence.py <model_name> [--resume] [--events] [--batch | --batch-local]")
         sys.exit(1)
     
-    model_name = sys.argv[1]
-    main(model_name)
\ No newline at end of file
+    if '--events' in sys.argv:
+        # stdout은 JSON lines 이벤트 전용으로 쓰고, 일반 출력은 stderr로 보낸다
+        # (fd 수준에서 바꿔야 검사용 작업자 프로세스의 출력도 이벤트와 섞이지 않는다)
+        sys.stdout.flush()
+        events_stream = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8', buffering=1)
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        event_bus.subscribe(JsonLinesSink(events_stream))
+    
+    model_name = args[0]
+    batch_mode = "local" if '--batch-local' in sys.argv else ("on" if '--batch' in sys.argv else None)
+    main(model_name, resume='--resume' in sys.argv, batch_mode=batch_mode)
\ No newline at end of file
@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+import subprocess
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from scripts.benchmark_pipeline import BENCH_MODEL, COPY_IGNORE, make_keywords, make_model
+
+KEYWORD_COUNT = 12
+CONCURRENCY = 4
+
+# 복사한 프로젝트 안에서 실행한다 (데이터 경로가 모두 __file__ 기준이므로)
+DRAFT_SCRIPT = """
+import json, sys, threading
+sys.path.insert(0, '.')
+from scripts import writing_sequence as ws
+from scripts.progress_events import event_bus
+from scripts.pipeline_engine import PipelineEngine
+from scripts.workspace import get_workspace_dir, list_drafts
+from scripts.keyword_store import get_keyword_store
+from scripts.metrics import metrics
+
+ws.preprocess_keywords(event_bus)
+engine = PipelineEngine(sys.argv[1])
+titles = [title for title in engine.keywords_df['제목'] if title]
+lock = threading.Lock()
+state = {"in_flight": 0, "peak": 0, "done": [], "errors": {}}
+
+def on_start(title):
+    with lock:
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+
+def on_done(title, error):
+    with lock:
+        state["in_flight"] -= 1
+        state["done"].append(title)
+        if error:
+            state["errors"][title] = str(error)
+
+written = engine.write_drafts(titles, on_start=on_start, on_done=on_done)
+engine.run_checks()
+engine.close()
+rows = get_keyword_store().load_dataframe()
+print(json.dumps({"titles": titles, "written": written, "peak": state["peak"], "done": state["done"],
+                  "retries": metrics.counter_total("llm_retries_total"),
+                  "errors": state["errors"], "drafts": sorted(list_drafts(get_workspace_dir())),
+                  "status": {column: rows[column].tolist() for column in engine.check_engine.status_columns()}},
+                 ensure_ascii=False))
+"""
+
+def make_args(**overrides):
+    args = dict(backend="fake", concurrency=CONCURRENCY, check_workers="1", workspace_format="json", latency_ms=20,
+                distribution="fixed", error_rate=0.0, rate_limit_rate=0.0, response_length="900-1300", seed=0)
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+def run_drafts(tmp_path, args):
+    work_dir = str(tmp_path / os.path.basename(project_dir))
+    shutil.copytree(project_dir, work_dir,
+                    ignore=lambda directory, names: COPY_IGNORE(directory, names) | {'tests', '.pytest_cache'})
+    os.makedirs(os.path.join(work_dir, 'data', '작업대'), exist_ok=True)
+    make_model(os.path.join(work_dir, 'data', 'model', BENCH_MODEL), args)
+    make_keywords(KEYWORD_COUNT, args.seed).to_excel(os.path.join(work_dir, 'data', 'keywords.xlsx'), index=False)
+
+    completed = subprocess.run([sys.executable, '-c', DRAFT_SCRIPT, BENCH_MODEL], cwd=work_dir, capture_output=True,
+                               text=True, encoding='utf-8', env=dict(os.environ, PYTHONIOENCODING='utf-8'),
+                               timeout=120)
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def check_drafts(result):
+    assert len(result["titles"]) == KEYWORD_COUNT
+    assert result["errors"] == {}
+    assert sorted(result["written"]) == sorted(result["titles"])
+    assert sorted(result["done"]) == sorted(result["titles"])
+    assert result["drafts"] == sorted(result["titles"])
+    # 모든 키워드 행에 검사 결과가 기록되어야 한다
+    assert result["status"]
+    for column, values in result["status"].items():
+        assert len(values) == KEYWORD_COUNT
+        assert set(values) <= {'O', 'X'}, column
+
+def test_concurrent_drafts_with_fake_backend(tmp_path):
+    result = run_drafts(tmp_path, make_args())
+    check_drafts(result)
+    assert 1 < result["peak"] <= CONCURRENCY
+
+def test_concurrent_drafts_retry_rate_limits(tmp_path):
+    # 일부 요청이 429로 실패해도 재시도 후 모든 원고가 작성되어야 한다
+    result = run_drafts(tmp_path, make_args(rate_limit_rate=0.2))
+    check_drafts(result)
+    assert result["retries"] > 0
@@ -0,0 +1,70 @@
+import os
+import sys
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from scripts import docx_text
+
+def add_hyperlink(paragraph, text):
+    hyperlink = OxmlElement("w:hyperlink")
+    hyperlink.set(qn("w:anchor"), "target")
+    run = OxmlElement("w:r")
+    text_element = OxmlElement("w:t")
+    text_element.text = text
+    run.append(text_element)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+def make_document(path):
+    doc = Document()
+    doc.add_paragraph("한글 문단입니다. 가나다라마바사")
+    doc.add_paragraph("")
+    paragraph = doc.add_paragraph("탭")
+    paragraph.add_run().add_tab()
+    paragraph.add_run("다음\t글자")
+    paragraph = doc.add_paragraph("줄")
+    paragraph.add_run().add_break()
+    paragraph.add_run("바꿈 ")
+    paragraph.add_run().add_break(WD_BREAK.PAGE)
+    paragraph.add_run("페이지 나누기")
+    paragraph.add_run().add_break(WD_BREAK.COLUMN)
+    doc.add_paragraph("  앞뒤 공백  ")
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "표 안의 글"
+    table.cell(1, 1).text = "표\t셀"
+    paragraph = doc.add_paragraph("링크: ")
+    add_hyperlink(paragraph, "바로가기")
+    paragraph.add_run(" 끝")
+    doc.add_paragraph("표 다음 문단 😀 & <특수문자>")
+    for index in range(50):
+        doc.add_paragraph(f"{index}번째 반복 문단 " * 5)
+    doc.save(path)
+
+def test_matches_python_docx(tmp_path):
+    path = str(tmp_path / "원고.docx")
+    make_document(path)
+    expected = [paragraph.text for paragraph in Document(path).paragraphs]
+    assert docx_text.read_paragraphs(path) == expected
+    assert docx_text.read_text(path) == '\n'.join(expected)
+
+def test_special_characters(tmp_path):
+    path = str(tmp_path / "원고.docx")
+    make_document(path)
+    paragraphs = docx_text.read_paragraphs(path)
+    assert paragraphs[0] == "한글 문단입니다. 가나다라마바사"
+    assert paragraphs[1] == ""
+    assert paragraphs[2] == "탭\t다음\t글자"
+    # 줄바꿈만 "\n"이 되고 페이지/단 나누기는 빠진다
+    assert paragraphs[3] == "줄\n바꿈 페이지 나누기"
+    assert paragraphs[4] == "  앞뒤 공백  "
+    assert paragraphs[5] == "링크: 바로가기 끝"
+    # 표 안의 문단은 본문 문단에 들어가지 않는다
+    assert "표 안의 글" not in paragraphs and "표\t셀" not in paragraphs
+    assert paragraphs[6] == "표 다음 문단 😀 & <특수문자>"
@@ -0,0 +1,73 @@
+import os
+import sys
+from types import SimpleNamespace
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from scripts.draft_repair import (DEFAULT_REPAIR_PROMPTS, build_repair_instructions, build_repair_prompt,
+                                  get_repair_prompts, is_repair_mode, split_repaired_text)
+from page2_checks.rewrite_scripts import char_count_check, forbiddenword_check
+
+CHECK_LIST = {"char_count_check": {"min_length": 10, "max_length": 20},
+              "forbidden_words_check": {"forbidden_words": ["최고", "무료"]}}
+
+def failed_details(paragraphs, modules):
+    # 검사 엔진처럼 run_check의 두 번째 값을 검사 이름별로 모은다
+    details = {}
+    for module in modules:
+        passed, detail = module.run_check(paragraphs, CHECK_LIST[module.CHECK_NAME])
+        assert not passed
+        details[module.CHECK_NAME] = detail
+    return details
+
+def build(paragraphs, modules, repair_prompts=DEFAULT_REPAIR_PROMPTS):
+    return build_repair_instructions(modules, CHECK_LIST, failed_details(paragraphs, modules), paragraphs,
+                                     repair_prompts)
+
+def test_short_draft_asks_to_expand():
+    instructions = build(["짧은 글"], [char_count_check])
+    assert instructions == DEFAULT_REPAIR_PROMPTS["char_count_short"].format(char_count=4, min_length=10,
+                                                                              max_length=20)
+
+def test_long_draft_asks_to_shorten():
+    paragraphs = ["긴 글" * 10]
+    instructions = build(paragraphs, [char_count_check])
+    assert instructions == DEFAULT_REPAIR_PROMPTS["char_count_long"].format(char_count=len(paragraphs[0]),
+                                                                             min_length=10, max_length=20)
+
+def test_forbidden_words_list_words_and_sentences():
+    paragraphs = ["첫 문장은 괜찮습니다. 이 제품이 최고입니다!", "무료로 드려요. 마지막 문장"]
+    instructions = build(paragraphs, [forbiddenword_check])
+    assert instructions == DEFAULT_REPAIR_PROMPTS["forbidden_words"].format(
+        forbidden_words="최고, 무료", sentences="- 이 제품이 최고입니다!\n- 무료로 드려요.")
+
+def test_several_failures_are_combined():
+    paragraphs = ["최고"]
+    instructions = build(paragraphs, [char_count_check, forbiddenword_check])
+    lines = instructions.split("\n")
+    assert lines[0].startswith("글자수가 2자로 부족합니다.")
+    assert lines[1].startswith("다음 단어를 쓰지 말고") and lines[1].endswith("최고")
+
+def test_unrepairable_failure_falls_back_to_regeneration():
+    # 수정 지시를 만들 수 없는 검사가 하나라도 있으면 전체를 다시 생성한다
+    other_check = SimpleNamespace(CHECK_NAME="other_check")
+    assert build_repair_instructions([char_count_check, other_check], CHECK_LIST,
+                                     {"char_count_check": 4}, ["짧은 글"], DEFAULT_REPAIR_PROMPTS) is None
+    assert build_repair_instructions([char_count_check], CHECK_LIST, {}, ["짧은 글"], DEFAULT_REPAIR_PROMPTS) is None
+    repair_prompts = dict(DEFAULT_REPAIR_PROMPTS, char_count_short="")
+    assert build(["짧은 글"], [char_count_check], repair_prompts) is None
+
+def test_model_prompts_override_defaults():
+    repair_prompts = get_repair_prompts({"repair_prompts": {"char_count_short": "{char_count}자 -> {min_length}자"}})
+    assert repair_prompts["char_count_long"] == DEFAULT_REPAIR_PROMPTS["char_count_long"]
+    assert build(["짧은 글"], [char_count_check], repair_prompts) == "4자 -> 10자"
+    assert get_repair_prompts({}) == DEFAULT_REPAIR_PROMPTS
+    assert is_repair_mode({"rewrite_mode": " Repair "}) and not is_repair_mode({})
+
+def test_repair_prompt_round_trip():
+    prompt = build_repair_prompt("지시", ["첫 문단", " ", "둘째 문단"], DEFAULT_REPAIR_PROMPTS)
+    assert prompt.startswith("지시\n") and prompt.endswith("\n\n첫 문단\n\n둘째 문단")
+    assert split_repaired_text("첫 문단\n\n  \n둘째 문단\n") == ["첫 문단", "둘째 문단"]
@@ -0,0 +1,137 @@
+import os
+import sys
+import zipfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from page4_export import export_functions
+from page4_export.export_functions import TXT_NEWLINE, diff_target, export_drafts, open_archive
+from scripts.workspace import save_draft
+
+def setup_export(tmp_path, monkeypatch):
+    workspace_dir = tmp_path / "작업대"
+    txt_dir = tmp_path / "최종결과물"
+    workspace_dir.mkdir()
+    txt_dir.mkdir()
+    monkeypatch.setattr(export_functions, "get_workspace_dir", lambda: str(workspace_dir))
+    monkeypatch.setattr(export_functions, "get_data_dir", lambda: str(tmp_path))
+    return str(workspace_dir), str(tmp_path / "최종결과물.zip"), str(txt_dir)
+
+def export(archive_path, txt_dir, **options):
+    return export_drafts(archive_path=archive_path, txt_dir=txt_dir, workers=1, **options)
+
+def read_archive(archive_path):
+    with zipfile.ZipFile(archive_path) as archive:
+        return {name: archive.read(name).decode('utf-8') for name in archive.namelist()}
+
+def txt(*paragraphs):
+    return ''.join(paragraph + TXT_NEWLINE for paragraph in paragraphs)
+
+def test_unchanged_drafts_are_skipped(tmp_path, monkeypatch):
+    workspace_dir, archive_path, txt_dir = setup_export(tmp_path, monkeypatch)
+    save_draft(workspace_dir, "가", ["첫 문단", "둘째 문단"], "json")
+    save_draft(workspace_dir, "나", ["문단"], "docx")
+    result = export(archive_path, txt_dir)
+    assert (result["converted"], result["skipped"]) == (2, 0)
+    assert read_archive(archive_path) == {"가.txt": txt("첫 문단", "둘째 문단"), "나.txt": txt("문단")}
+
+    archive_stat = os.stat(archive_path)
+    result = export(archive_path, txt_dir)
+    assert (result["converted"], result["skipped"], result["removed"]) == (0, 2, 0)
+    # 바뀐 것이 없으면 zip을 다시 쓰지 않는다
+    assert os.stat(archive_path).st_mtime_ns == archive_stat.st_mtime_ns
+
+def test_added_draft_is_appended(tmp_path, monkeypatch):
+    workspace_dir, archive_path, txt_dir = setup_export(tmp_path, monkeypatch)
+    save_draft(workspace_dir, "가", ["문단"], "json")
+    export(archive_path, txt_dir)
+    inode = os.stat(archive_path).st_ino
+    save_draft(workspace_dir, "나", ["새 원고"], "json")
+    result = export(archive_path, txt_dir)
+    assert (result["converted"], result["skipped"]) == (1, 1)
+    # 덧붙이기는 같은 파일에 쓰고, 새로 만들면 임시 파일로 바뀐다
+    assert os.stat(archive_path).st_ino == inode
+    assert read_archive(archive_path) == {"가.txt": txt("문단"), "나.txt": txt("새 원고")}
+
+def test_changed_and_removed_drafts_rebuild(tmp_path, monkeypatch):
+    workspace_dir, archive_path, txt_dir = setup_export(tmp_path, monkeypatch)
+    for title in ("가", "나", "다"):
+        save_draft(workspace_dir, title, [f"{title} 원고"], "json")
+    export(archive_path, txt_dir)
+    inode = os.stat(archive_path).st_ino
+
+    save_draft(workspace_dir, "가", ["고친 가 원고입니다"], "json")
+    os.remove(os.path.join(workspace_dir, "다.json"))
+    result = export(archive_path, txt_dir)
+    assert (result["converted"], result["skipped"], result["removed"]) == (1, 1, 1)
+    assert os.stat(archive_path).st_ino != inode
+    assert read_archive(archive_path) == {"가.txt": txt("고친 가 원고입니다"), "나.txt": txt("나 원고")}
+    assert sorted(os.listdir(txt_dir)) == ["가.txt", "나.txt"]
+    with open(os.path.join(txt_dir, "가.txt"), 'rb') as f:
+        assert f.read().decode('utf-8') == txt("고친 가 원고입니다")
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+def test_renamed_outputs_replace_old_names(tmp_path, monkeypatch):
+    workspace_dir, archive_path, txt_dir = setup_export(tmp_path, monkeypatch)
+    save_draft(workspace_dir, "가", ["문단"], "json")
+    export(archive_path, txt_dir)
+    result = export(archive_path, txt_dir, prefix="[최종]")
+    assert result["converted"] == 1
+    assert list(read_archive(archive_path)) == ["[최종]가.txt"]
+    assert os.listdir(txt_dir) == ["[최종]가.txt"]
+
+def test_compression_change_rebuilds(tmp_path, monkeypatch):
+    workspace_dir, archive_path, txt_dir = setup_export(tmp_path, monkeypatch)
+    save_draft(workspace_dir, "가", ["반복 문단 " * 100], "json")
+    export(archive_path, None)
+    result = export(archive_path, None, compression="best")
+    # 원고는 다시 변환하지 않고 기존 항목을 새 압축 방식으로 옮긴다
+    assert result["converted"] == 0
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.getinfo("가.txt").compress_type == zipfile.ZIP_DEFLATED
+    assert read_archive(archive_path) == {"가.txt": txt("반복 문단 " * 100)}
+
+def test_full_export_ignores_manifest(tmp_path, monkeypatch):
+    workspace_dir, archive_path, txt_dir = setup_export(tmp_path, monkeypatch)
+    save_draft(workspace_dir, "가", ["문단"], "json")
+    export(archive_path, txt_dir)
+    result = export(archive_path, txt_dir, incremental=False)
+    assert (result["converted"], result["skipped"]) == (1, 0)
+
+def test_diff_target():
+    previous = {"가": {"hash": "1", "name": "가.txt"}, "나": {"hash": "2", "name": "나.txt"},
+                "다": {"hash": "3", "name": "다.txt"}, "라": {"hash": "4", "name": "라.txt"}}
+    sources = {"가": {"hash": "1"}, "나": {"hash": "9"}, "다": {"hash": "3"}, "마": {"hash": "5"}}
+    names = {"가": "가.txt", "나": "나.txt", "다": "새 다.txt", "마": "마.txt"}
+    kept, changed, stale = diff_target(previous, sources, names, lambda name: True)
+    assert kept == ["가"]
+    assert changed == ["나", "다", "마"]
+    assert stale == ["다.txt", "라.txt"]
+    # 이전 출력 파일이 없어졌으면 다시 만든다
+    assert diff_target(previous, {"가": {"hash": "1"}}, {"가": "가.txt"}, lambda name: False)[1] == ["가"]
+
+def test_open_archive_append_or_rebuild(tmp_path):
+    archive_path = str(tmp_path / "결과.zip")
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        archive.writestr("가.txt", "가")
+        archive.writestr("나.txt", "나")
+    previous = {"path": archive_path, "compression": "store",
+                "entries": {"가": {"hash": "1", "name": "가.txt"}, "나": {"hash": "2", "name": "나.txt"}}}
+
+    archive, temp_path = open_archive(archive_path, "store", previous, ["가", "나"], [])
+    archive.close()
+    assert temp_path is None
+
+    # 지울 항목, 다른 압축 방식, 다른 경로, 빠진 항목이 있으면 새 zip을 만들고 그대로인 항목만 옮긴다
+    for compression, kept, stale, other in (("store", ["가"], ["나.txt"], {}), ("best", ["가", "나"], [], {}),
+                                            ("store", ["가", "나"], [], {"path": "다른.zip"}),
+                                            ("store", ["가"], [], {})):
+        archive, temp_path = open_archive(archive_path, compression, dict(previous, **other), kept, stale)
+        archive.close()
+        assert temp_path is not None
+        with zipfile.ZipFile(temp_path) as rebuilt:
+            assert rebuilt.namelist() == [previous["entries"][title]["name"] for title in kept]
+        os.remove(temp_path)
@@ -0,0 +1,66 @@
+import os
+import sys
+import random
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from page2_checks.forbidden_matcher import AhoCorasickMatcher, compile_forbidden_words
+from page2_checks.rewrite_scripts.forbiddenword_check import find_forbidden_words
+
+WORDS = ["최고", "최고급", "고급", "무료", "료", "100%", "완벽", "완벽한 효과", "aa", "a"]
+
+def naive_hits(text, words):
+    # 예전 방식: 단어마다 부분 문자열을 찾는다 (겹치는 위치도 모두)
+    hits = []
+    for word in dict.fromkeys(words):
+        if not word:
+            continue
+        start = text.find(word)
+        while start >= 0:
+            hits.append((word, start, start + len(word)))
+            start = text.find(word, start + 1)
+    return sorted(hits)
+
+def make_texts():
+    alphabet = "최고급무료완벽한 효과100%a."
+    generator = random.Random(0)
+    texts = ["", "최고급 제품을 무료로 드립니다.", "완벽한 효과를 100% 보장", "aaaa", "아무 문제 없는 문장"]
+    texts += ["".join(generator.choice(alphabet) for _ in range(generator.randint(1, 60))) for _ in range(200)]
+    return texts
+
+def test_find_all_matches_substring_search():
+    matcher = AhoCorasickMatcher(WORDS)
+    for text in make_texts():
+        assert sorted(matcher.find_all(text)) == naive_hits(text, WORDS), text
+
+def test_found_words_match_old_check():
+    for text in make_texts():
+        is_valid, found_words = find_forbidden_words([text], WORDS)
+        expected = {word for word in WORDS if word in text}
+        assert set(found_words) == expected
+        assert is_valid == (not expected)
+
+def test_scan_across_chunks():
+    # 스트리밍 조각 경계에 걸친 단어도 찾아야 한다
+    matcher = AhoCorasickMatcher(WORDS)
+    generator = random.Random(1)
+    for text in make_texts():
+        node, found = 0, []
+        position = 0
+        while position < len(text):
+            size = generator.randint(1, 5)
+            node, chunk_found = matcher.scan(text[position:position + size], node)
+            found.extend(chunk_found)
+            position += size
+        assert sorted(found) == sorted(word for word, _, _ in naive_hits(text, WORDS))
+
+def test_empty_and_duplicate_words():
+    matcher = AhoCorasickMatcher(["", "무료", "무료"])
+    assert matcher.find_all("무료 무료") == [("무료", 0, 2), ("무료", 3, 5)]
+    assert AhoCorasickMatcher([]).find_all("아무 문장") == []
+
+def test_compiled_matcher_is_cached():
+    assert compile_forbidden_words(["무료", "최고"]) is compile_forbidden_words(["무료", "최고"])
@@ -0,0 +1,76 @@
+import os
+import sys
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from scripts.keyword_store import KeywordStore, KEYWORD_COLUMNS
+
+def make_keywords_df():
+    return pd.DataFrame([
+        ['첫 번째 제목', '사과', '배', None, 1200, '금지', None],
+        ['두 번째 제목', '포도', None, '귤', 900, None, '중복'],
+        ['세 번째 제목', '수박', '참외', '딸기', 1500, None, None],
+    ], columns=KEYWORD_COLUMNS)
+
+def make_store(tmp_path, keywords_df=None):
+    excel_path = str(tmp_path / 'keywords.xlsx')
+    if keywords_df is not None:
+        keywords_df.to_excel(excel_path, index=False)
+    return KeywordStore(str(tmp_path / 'keywords.db'), excel_path)
+
+def test_sync_imports_excel_once(tmp_path):
+    store = make_store(tmp_path, make_keywords_df())
+    assert store.sync_from_excel()
+    # 엑셀이 바뀌지 않았으면 다시 가져오지 않는다
+    store.update_status('첫 번째 제목', '검사', 'O')
+    assert not store.sync_from_excel()
+    assert store.load_dataframe().loc[0, '검사'] == 'O'
+    store.close()
+
+def test_sync_reimports_changed_excel(tmp_path):
+    store = make_store(tmp_path, make_keywords_df())
+    store.sync_from_excel()
+    changed_df = make_keywords_df().iloc[:2].copy()
+    changed_df.loc[0, '키워드1'] = '바나나'
+    changed_df.to_excel(store.excel_path, index=False)
+    os.utime(store.excel_path, (0, os.path.getmtime(store.excel_path) + 10))
+    assert store.sync_from_excel()
+    keywords_df = store.load_dataframe()
+    assert keywords_df['제목'].tolist() == ['첫 번째 제목', '두 번째 제목']
+    assert keywords_df.loc[0, '키워드1'] == '바나나'
+    store.close()
+
+def test_missing_excel_is_not_synced(tmp_path):
+    store = make_store(tmp_path)
+    assert not store.sync_from_excel()
+    assert store.is_empty()
+    store.close()
+
+def test_export_round_trip(tmp_path):
+    store = make_store(tmp_path, make_keywords_df())
+    store.sync_from_excel()
+    store.update_statuses('검사', {'첫 번째 제목': 'O', '세 번째 제목': 'X'})
+    store.update_titles({1: '바뀐 제목'})
+    store.update_cells([(3, '제목', '새 제목'), (0, '키워드2', None)])
+    store.export_excel()
+    # 내보낸 직후에는 자기 파일을 다시 가져오지 않는다
+    assert not store.sync_from_excel()
+
+    exported_df = pd.read_excel(store.excel_path)
+    loaded_df = store.load_dataframe().reset_index(drop=True)
+    assert exported_df['제목'].tolist() == ['첫 번째 제목', '바뀐 제목', '세 번째 제목', '새 제목']
+    assert exported_df['검사'].fillna('').tolist() == ['O', '', 'X', '']
+    assert pd.isna(exported_df.loc[0, '키워드2'])
+    assert exported_df['글자수'].tolist()[:3] == [1200, 900, 1500]
+    pd.testing.assert_frame_equal(exported_df, loaded_df, check_dtype=False)
+
+    # 내보낸 엑셀을 새 저장소로 가져오면 같은 내용이 된다
+    other = KeywordStore(str(tmp_path / 'other.db'), store.excel_path)
+    assert other.sync_from_excel()
+    pd.testing.assert_frame_equal(other.load_dataframe(), store.load_dataframe(), check_dtype=False)
+    other.close()
+    store.close()
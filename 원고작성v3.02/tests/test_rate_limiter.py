@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import asyncio
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from scripts import rate_limiter
+
+def test_adaptive_concurrency_aimd():
+    concurrency = rate_limiter.AdaptiveConcurrency(8)
+    concurrency.on_throttled()
+    assert concurrency.limit == 4
+    concurrency.on_throttled()
+    concurrency.on_throttled()
+    concurrency.on_throttled()
+    assert concurrency.limit == 1
+    # 한 창(window)의 요청이 모두 성공하면 1씩 늘어난다
+    for _ in range(3):
+        concurrency.on_success(0.1)
+    assert 2 <= concurrency.limit < 3
+    for _ in range(100):
+        concurrency.on_success(0.1)
+    assert concurrency.limit == 8
+
+def test_adaptive_concurrency_latency_target():
+    concurrency = rate_limiter.AdaptiveConcurrency(8, latency_target=1.0)
+    concurrency.on_success(0.5)
+    assert concurrency.limit == 8
+    concurrency.on_success(2.0)
+    assert concurrency.limit == 4
+
+def test_adaptive_concurrency_blocks_over_limit():
+    concurrency = rate_limiter.AdaptiveConcurrency(2)
+    concurrency.acquire()
+    concurrency.acquire()
+    assert not concurrency.has_capacity()
+    concurrency.release()
+    assert concurrency.has_capacity()
+
+def test_token_bucket_waits_when_empty(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'get_rate_limit_dir', lambda: str(tmp_path))
+    bucket = rate_limiter.SharedTokenBucket("test-model", requests_per_minute=2, tokens_per_minute=600)
+    assert bucket.try_consume(100) == 0
+    assert bucket.try_consume(100) == 0
+    # 요청 수를 다 쓰면 다음 요청 하나가 채워질 때까지 (약 30초) 기다려야 한다
+    assert 25 < bucket.try_consume(100) <= 30
+
+def test_token_bucket_limits_tokens(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'get_rate_limit_dir', lambda: str(tmp_path))
+    bucket = rate_limiter.SharedTokenBucket("test-model", tokens_per_minute=600)
+    assert bucket.try_consume(500) == 0
+    assert bucket.try_consume(200) > 0
+    # 같은 상태 파일을 쓰는 다른 인스턴스(다른 프로세스)도 같은 잔량을 본다
+    other = rate_limiter.SharedTokenBucket("test-model", tokens_per_minute=600)
+    assert other.try_consume(200) > 0
+    assert other.try_consume(50) == 0
+
+def test_token_bucket_block_for(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'get_rate_limit_dir', lambda: str(tmp_path))
+    bucket = rate_limiter.SharedTokenBucket("test-model", requests_per_minute=60)
+    bucket.block_for(5)
+    assert 4 < bucket.try_consume(1) <= 5
+
+def test_token_bucket_without_limits_skips_lock_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'get_rate_limit_dir', lambda: str(tmp_path))
+    bucket = rate_limiter.SharedTokenBucket("test-model")
+    assert bucket.try_consume(100) == 0
+    # 한도가 없어도 429 대기는 지켜야 한다
+    bucket.block_for(5)
+    assert 4 < bucket.try_consume(100) <= 5
+    bucket.adjust_tokens(50)
+    assert os.listdir(tmp_path) == []
+
+def test_call_async_keeps_event_loop_free(tmp_path, monkeypatch):
+    # 버킷이 lock을 오래 잡고 있어도 같은 이벤트 루프의 다른 작업은 계속 진행되어야 한다
+    monkeypatch.setattr(rate_limiter, 'get_rate_limit_dir', lambda: str(tmp_path))
+    limiter = rate_limiter.RateLimiter({"model": "test-model", "requests_per_minute": "600", "max_concurrency": "4"})
+    original = limiter.bucket.try_consume
+
+    def slow_consume(tokens):
+        time.sleep(0.3)
+        return original(tokens)
+    monkeypatch.setattr(limiter.bucket, 'try_consume', slow_consume)
+
+    state = {"ticks": 0}
+
+    async def request():
+        # 버킷을 기다리는 0.3초 동안 ticker가 돌았는지 요청 시점에 확인한다
+        return state["ticks"]
+
+    async def ticker():
+        for _ in range(5):
+            await asyncio.sleep(0.02)
+            state["ticks"] += 1
+
+    async def main():
+        ticks_at_request, _ = await asyncio.gather(limiter.call_async(request, 10), ticker())
+        return ticks_at_request
+
+    assert asyncio.run(main()) == 5
@@ -0,0 +1,65 @@
+import os
+import sys
+import itertools
+import types
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from scripts import response_cache
+from scripts.response_cache import ResponseCache, make_cache_key
+
+REQUEST = {"model": "gpt-4o", "temperature": 0.7, "messages": [{"role": "user", "content": "안녕"}]}
+
+def make_cache(tmp_path, monkeypatch, max_bytes):
+    # last_used가 같은 값이 되지 않도록 시계를 1초씩 늘린다
+    clock = itertools.count(1)
+    monkeypatch.setattr(response_cache, "time", types.SimpleNamespace(time=lambda: float(next(clock))))
+    return ResponseCache(str(tmp_path / "llm_cache.db"), max_bytes)
+
+def entry_size(key, response):
+    return len(key) + len(response.encode('utf-8'))
+
+def stored_stats(cache):
+    return cache.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, monkeypatch, entry_size("a", "응답") * 3)
+    cache.put("a", "응답")
+    cache.put("b", "응답")
+    cache.put("c", "응답")
+    assert cache.get("a") == "응답"
+    cache.put("d", "응답")
+    # b가 가장 오래 쓰이지 않았다
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["응답"] * 3
+    assert cache.stats() == {"hits": 4, "misses": 1, "entries": 3, "bytes": entry_size("a", "응답") * 3}
+
+def test_counters_match_table(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, monkeypatch, 200)
+    for index in range(30):
+        cache.put(f"key{index % 12}", "가" * (index % 7 + 1))
+        assert (cache.entries, cache.total_bytes) == stored_stats(cache)
+        assert cache.total_bytes <= cache.max_bytes
+    cache.connection.close()
+    # 다시 열면 저장된 내용으로 카운터를 세운다
+    reopened = ResponseCache(cache.path, cache.max_bytes)
+    assert (reopened.entries, reopened.total_bytes) == stored_stats(reopened)
+    assert (reopened.entries, reopened.total_bytes) == (cache.entries, cache.total_bytes)
+
+def test_replacing_entry_updates_size(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, monkeypatch, 1000)
+    cache.put("a", "짧은")
+    cache.put("a", "조금 더 긴 응답")
+    assert cache.get("a") == "조금 더 긴 응답"
+    assert (cache.entries, cache.total_bytes) == (1, entry_size("a", "조금 더 긴 응답"))
+
+def test_cache_key_includes_backend():
+    openai_key = make_cache_key(REQUEST, {"backend": "openai"})
+    assert make_cache_key(REQUEST) == openai_key
+    assert make_cache_key(REQUEST, {"backend": " OpenAI "}) == openai_key
+    assert make_cache_key(REQUEST, {"backend": "fake"}) != openai_key
+    assert make_cache_key(REQUEST, {"backend": "openai", "base_url": "http://127.0.0.1:8000/v1"}) != openai_key
+    assert make_cache_key(dict(REQUEST, temperature=0.2), {"backend": "openai"}) != openai_key
@@ -0,0 +1,118 @@
+import os
+import sys
+from types import SimpleNamespace
+import pandas as pd
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from scripts import chat_checkpoint
+from scripts.chat_checkpoint import get_rewrite_start_step, load_checkpoint, resume_chat_log, save_checkpoint
+from scripts.fake_llm_server import FakeBehavior, FakeChatClient
+from scripts.first_draft_writer import generate_article
+from scripts.progress_events import EventBus
+from scripts.run_journal import RunJournal
+from scripts.writing_sequence import first_draft_writing
+
+MODEL_CONFIG = {"model": "gpt-4o", "temperature": "0.7", "max_tokens": "100", "top_p": "1",
+                "frequency_penalty": "0", "presence_penalty": "0"}
+PROMPTS = ["{키워드1} 소개", "{키워드2} 장점", "{키워드3} 정리"]
+KEYWORD_PAIR = {"제목": "테스트 제목", "키워드1": "사과", "키워드2": "배", "키워드3": "귤"}
+
+class RecordingClient(FakeChatClient):
+    # 보낸 요청의 사용자 메시지를 기록한다
+    def __init__(self):
+        super().__init__(FakeBehavior(latency_ms=0, response_length=(50, 50)))
+        self.sent = []
+        create = self.chat.completions.create
+
+        def record(**request):
+            self.sent.append(request["messages"][-1]["content"])
+            return create(**request)
+        self.chat.completions.create = record
+
+def test_journal_resume_restores_finished_work(tmp_path):
+    path = str(tmp_path / "run_journal.jsonl")
+    journal = RunJournal("모델", path)
+    assert not journal.start()
+    journal.record_drafted("가")
+    journal.record_drafted("나")
+    journal.record_checks("char_count_check", {"가": "O", "나": "X"})
+    journal.record_revised("가", "substitution_check.py")
+    journal.close()
+    # 비정상 종료로 잘린 마지막 줄
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"stage": "drafted", "ti')
+
+    resumed = RunJournal("모델", path)
+    assert resumed.start(resume=True)
+    assert resumed.is_drafted("가") and resumed.is_drafted("나") and not resumed.is_drafted("다")
+    assert resumed.has_checks("가", ["char_count_check"])
+    assert not resumed.has_checks("가", ["char_count_check", "forbidden_words_check"])
+    assert resumed.is_revised("가", "substitution_check.py") and not resumed.is_revised("나", "substitution_check.py")
+    # 다시 작성된 문서는 이전 검사/수정 기록이 무효가 된다
+    resumed.record_drafted("가")
+    assert not resumed.has_checks("가", ["char_count_check"])
+    assert not resumed.is_revised("가", "substitution_check.py")
+    resumed.close()
+
+def test_journal_of_other_model_starts_new_run(tmp_path):
+    path = str(tmp_path / "run_journal.jsonl")
+    journal = RunJournal("모델", path)
+    journal.start()
+    journal.record_drafted("가")
+    journal.close()
+    other = RunJournal("다른 모델", path)
+    assert not other.start(resume=True)
+    assert not other.is_drafted("가")
+    other.close()
+
+def test_resumed_first_draft_skips_finished_keywords(tmp_path):
+    journal = RunJournal("모델", str(tmp_path / "run_journal.jsonl"))
+    journal.start()
+    journal.record_drafted("가")
+    journal.record_drafted("나")
+    written = []
+    engine = SimpleNamespace(
+        keywords_df=pd.DataFrame({"제목": ["가", "나", "다", "라"]}), batch_mode=None, max_concurrency=1,
+        # 저널에 있어도 원고 파일이 없으면 다시 쓴다
+        draft_exists=lambda title: title != "나",
+        write_drafts=lambda titles, **callbacks: written.extend(titles))
+    first_draft_writing(engine, EventBus(), journal, resumed=True)
+    assert written == ["나", "다", "라"]
+    journal.close()
+
+def test_rewrite_start_step():
+    assert get_rewrite_start_step({}, 3) == 0
+    assert get_rewrite_start_step({"rewrite_from_step": "2"}, 3) == 1
+    assert get_rewrite_start_step({"rewrite_from_step": "-1"}, 3) == 2
+    assert get_rewrite_start_step({"rewrite_from_step": "9"}, 3) == 2
+    assert get_rewrite_start_step({"rewrite_from_step": "-9"}, 3) == 0
+    assert get_rewrite_start_step({"rewrite_from_step": "abc"}, 3) == 0
+
+def test_rewrite_resumes_from_saved_chat_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(chat_checkpoint, "get_checkpoint_dir", lambda: str(tmp_path))
+    client = RecordingClient()
+    responses = generate_article(KEYWORD_PAIR, PROMPTS, MODEL_CONFIG, client)
+    assert client.sent == ["사과 소개", "배 장점", "귤 정리"]
+    assert len(load_checkpoint("테스트 제목")) == 6
+
+    # 마지막 단계만 다시 생성하고 앞 단계 응답은 저장된 것을 쓴다
+    client.sent = []
+    rewritten = generate_article(KEYWORD_PAIR, PROMPTS, MODEL_CONFIG, client, refresh=True, start_step=2)
+    assert client.sent == ["귤 정리"]
+    assert rewritten[:2] == responses[:2]
+
+    # 프롬프트가 바뀌었으면 저장된 대화를 쓰지 않는다
+    assert resume_chat_log("테스트 제목", ["사과 설명", "배 장점", "귤 정리"], 2) == ([], [])
+    client.sent = []
+    generate_article(dict(KEYWORD_PAIR, 키워드1="포도"), PROMPTS, MODEL_CONFIG, client, refresh=True, start_step=2)
+    assert client.sent == ["포도 소개", "배 장점", "귤 정리"]
+
+def test_short_checkpoint_is_not_resumed(tmp_path, monkeypatch):
+    monkeypatch.setattr(chat_checkpoint, "get_checkpoint_dir", lambda: str(tmp_path))
+    save_checkpoint("제목", [{"role": "user", "content": "사과 소개"}, {"role": "assistant", "content": "응답"}])
+    assert resume_chat_log("제목", ["사과 소개", "배 장점"], 1)[1] == ["응답"]
+    assert resume_chat_log("제목", ["사과 소개", "배 장점"], 2) == ([], [])
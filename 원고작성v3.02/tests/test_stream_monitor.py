@@ -0,0 +1,106 @@
+import os
+import sys
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from scripts.stream_monitor import DraftRejected, StreamMonitor, create_stream_monitor
+from scripts.fake_llm_server import AsyncFakeStream, FakeStream
+from scripts.first_draft_writer import chat_with_gpt_and_collect, stream_completion, stream_completion_async
+
+CHECK_LIST = {"char_count_check": {"min_length": 5, "max_length": 30},
+              "forbidden_words_check": {"forbidden_words": ["최고급", "무료"]}}
+MODEL_CONFIG = {"model": "gpt-4o", "temperature": "0.7", "max_tokens": "100", "top_p": "1",
+                "frequency_penalty": "0", "presence_penalty": "0", "stream": "true"}
+
+def make_chunks(deltas):
+    return [{"choices": [{"index": 0, "delta": {"content": delta}}]} for delta in deltas]
+
+class CountingStream(FakeStream):
+    # 받아간 조각 수를 센다
+    def __init__(self, chunks):
+        super().__init__(chunks)
+        self.consumed = 0
+
+    def __iter__(self):
+        for chunk in super().__iter__():
+            self.consumed += 1
+            yield chunk
+
+class ScriptedClient:
+    def __init__(self, deltas, stream_class=CountingStream):
+        self.stream = stream_class(make_chunks(deltas))
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, stream=False, **request):
+        assert stream
+        return self.stream
+
+class AsyncScriptedClient(ScriptedClient):
+    async def create(self, stream=False, **request):
+        return self.stream
+
+def test_monitor_counts_like_saved_draft():
+    monitor = StreamMonitor({"char_count_check": {"max_length": 7}})
+    # 앞뒤 공백과 줄바꿈이 섞인 공백은 세지 않는다
+    assert monitor.feed("  가나 ") is None
+    assert monitor.feed("\n\n다") is None
+    assert monitor.length == 3
+    assert monitor.feed(" 라 마") is None
+    assert monitor.feed("바") == "글자수 초과 (8자 > 7자)"
+
+def test_monitor_includes_previous_responses():
+    monitor = StreamMonitor({"char_count_check": {"max_length": 10}}, ["가나다라마", "바사"])
+    assert monitor.feed("아자차") is None
+    assert monitor.feed("카") == "글자수 초과 (11자 > 10자)"
+    monitor.commit("아자차")
+    assert monitor.prefix_length == 10 and monitor.length == 0
+
+def test_monitor_finds_forbidden_word_split_across_chunks():
+    monitor = StreamMonitor(CHECK_LIST)
+    assert monitor.feed("이 제품은 최고") is None
+    assert monitor.feed("급 원료") == "금지어 포함 (최고급)"
+
+def test_disabled_checks_are_not_monitored():
+    check_list = {"char_count_check": {"max_length": 1, "enabled": False},
+                  "forbidden_words_check": {"forbidden_words": ["무료"], "enabled": False}}
+    assert StreamMonitor(check_list).feed("무료로 드리는 긴 글") is None
+    assert create_stream_monitor(dict(MODEL_CONFIG, stream="false"), CHECK_LIST) is None
+    assert create_stream_monitor(MODEL_CONFIG, {}) is None
+
+def test_stream_stops_at_first_violation():
+    client = ScriptedClient(["좋은 제품을 ", "무", "료로 드립니다.", " 남은 내용", " 더 남은 내용"])
+    result = stream_completion(client, {}, StreamMonitor(CHECK_LIST))
+    assert result.violation == "금지어 포함 (무료)"
+    assert result.choices[0].message.content == "좋은 제품을 무료로 드립니다."
+    # 남은 조각은 받지 않고 스트림을 닫는다
+    assert client.stream.consumed == 3
+    assert client.stream.closed
+
+def test_async_stream_stops_at_first_violation():
+    client = AsyncScriptedClient(["가" * 20, "나" * 20, "다" * 20], AsyncFakeStream)
+    result = asyncio.run(stream_completion_async(client, {}, StreamMonitor(CHECK_LIST)))
+    assert result.violation == "글자수 초과 (40자 > 30자)"
+    assert result.choices[0].message.content == "가" * 20 + "나" * 20
+    assert client.stream.closed
+
+def test_stream_without_violation_is_complete():
+    client = ScriptedClient(["좋은 ", "제품", "입니다."])
+    result = stream_completion(client, {}, StreamMonitor(CHECK_LIST))
+    assert result.violation is None
+    assert result.choices[0].message.content == "좋은 제품입니다."
+    assert client.stream.consumed == 3
+
+def test_rejected_stream_rolls_back_chat_log():
+    client = ScriptedClient(["최고급 ", "제품", "입니다."])
+    chat_log = [{"role": "user", "content": "이전 질문"}, {"role": "assistant", "content": "이전 답"}]
+    monitor = create_stream_monitor(MODEL_CONFIG, CHECK_LIST)
+    with pytest.raises(DraftRejected):
+        chat_with_gpt_and_collect("새 질문", MODEL_CONFIG, chat_log, client, monitor=monitor)
+    assert client.stream.consumed == 1
+    assert chat_log == [{"role": "user", "content": "이전 질문"}, {"role": "assistant", "content": "이전 답"}]
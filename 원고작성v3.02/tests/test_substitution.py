@@ -0,0 +1,75 @@
+import os
+import sys
+from docx import Document
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from page2_checks.revision_scripts.substitution_check import Substituter, substitute_file
+from scripts.workspace import read_paragraphs, write_paragraphs
+
+SUBSTITUTION_LIST = [{"최고": "가장 좋은"}, {"최고급": "고급스러운"}, {"무료": "공짜"}, {"최고": "무시되는 값"}]
+
+def test_longest_match_wins():
+    substituter = Substituter(SUBSTITUTION_LIST)
+    paragraphs, substitutions = substituter.substitute_paragraphs(["최고급 제품이 최고이고 무료입니다.", "그대로"])
+    assert paragraphs == ["고급스러운 제품이 가장 좋은이고 공짜입니다.", "그대로"]
+    # 같은 단어가 두 번 있으면 앞의 대체어를 쓴다
+    assert sorted(substitutions) == sorted([
+        "Substituted: '최고급' with '고급스러운' (1 occurrences)",
+        "Substituted: '최고' with '가장 좋은' (1 occurrences)",
+        "Substituted: '무료' with '공짜' (1 occurrences)",
+    ])
+
+def test_replacements_are_not_substituted_again():
+    substituter = Substituter([{"가": "나"}, {"나": "다"}])
+    assert substituter.substitute_paragraphs(["가나"])[0] == ["나다"]
+
+def make_docx(path):
+    doc = Document()
+    paragraph = doc.add_paragraph()
+    paragraph.add_run("이 제품은 ")
+    bold = paragraph.add_run("최고급")
+    bold.bold = True
+    paragraph.add_run(" 원료로 만들어 ")
+    italic = paragraph.add_run("무")
+    italic.italic = True
+    paragraph.add_run("료로 드립니다.")
+    doc.add_paragraph("바꿀 단어가 없는 문단")
+    doc.save(path)
+
+def test_docx_keeps_run_formatting(tmp_path):
+    path = str(tmp_path / "초안.docx")
+    make_docx(path)
+    substitutions = substitute_file(Substituter(SUBSTITUTION_LIST), path)
+    assert len(substitutions) == 2
+
+    doc = Document(path)
+    assert [paragraph.text for paragraph in doc.paragraphs] == [
+        "이 제품은 고급스러운 원료로 만들어 공짜로 드립니다.", "바꿀 단어가 없는 문단"]
+    runs = doc.paragraphs[0].runs
+    assert [run.text for run in runs] == ["이 제품은 ", "고급스러운", " 원료로 만들어 ", "공짜", "로 드립니다."]
+    # 일치가 시작된 run의 서식을 따른다
+    assert runs[1].bold and not runs[0].bold
+    assert runs[3].italic and not runs[4].italic
+
+def test_documents_without_matches_are_not_saved(tmp_path):
+    substituter = Substituter(SUBSTITUTION_LIST)
+    docx_path = str(tmp_path / "그대로.docx")
+    doc = Document()
+    doc.add_paragraph("바꿀 단어가 없습니다.")
+    doc.save(docx_path)
+    json_path = str(tmp_path / "그대로.json")
+    write_paragraphs(json_path, ["바꿀 단어가 없습니다."])
+    for path in (docx_path, json_path):
+        os.utime(path, (0, 0))
+        assert substitute_file(substituter, path) == []
+        assert os.path.getmtime(path) == 0
+
+def test_json_draft_is_substituted(tmp_path):
+    path = str(tmp_path / "초안.json")
+    write_paragraphs(path, ["무료 체험", "최고의 선택"])
+    assert len(substitute_file(Substituter(SUBSTITUTION_LIST), path)) == 2
+    assert read_paragraphs(path) == ["공짜 체험", "가장 좋은의 선택"]
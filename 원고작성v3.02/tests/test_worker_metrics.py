@@ -0,0 +1,58 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from scripts.metrics import MetricsRegistry, metrics, collect_metrics
+from scripts.workspace import write_paragraphs
+from page2_checks.check_engine import check_documents
+
+CHECK_MODULES = ["page2_checks.rewrite_scripts.char_count_check", "page2_checks.rewrite_scripts.forbiddenword_check"]
+CHECK_LIST = {"char_count_check": {"min_length": 10, "max_length": 100},
+              "forbidden_words_check": {"forbidden_words": ["금지어"]}}
+
+def make_documents(tmp_path, count):
+    documents = []
+    for index in range(count):
+        path = str(tmp_path / f"doc{index}.json")
+        write_paragraphs(path, [f"{index}번 문서의 첫 문단입니다.", "금지어가 들어간 문단"])
+        documents.append((f"doc{index}", path))
+    return documents
+
+def test_merge_adds_counters_and_histograms():
+    first, second = MetricsRegistry(), MetricsRegistry()
+    first.inc("file_read_bytes_total", 10, kind="json")
+    first.observe("check_document_seconds", 0.01)
+    second.inc("file_read_bytes_total", 5, kind="json")
+    second.inc("file_read_bytes_total", 7, kind="docx")
+    second.observe("check_document_seconds", 0.02)
+    first.merge(second.dump())
+    assert first.counter_total("file_read_bytes_total", kind="json") == 15
+    assert first.counter_total("file_read_bytes_total") == 22
+    summary = first.histogram_summary("check_document_seconds")
+    assert summary["count"] == 2
+    assert abs(summary["sum"] - 0.03) < 1e-6
+
+def test_process_pool_check_metrics_reach_parent(tmp_path):
+    # 작업자 프로세스에서 기록한 검사 시간과 읽은 바이트가 부모 지표에 합쳐져야 한다
+    documents = make_documents(tmp_path, 6)
+    metrics.reset()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(collect_metrics, check_documents, CHECK_MODULES, CHECK_LIST, chunk)
+                   for chunk in (documents[:3], documents[3:])]
+        results = []
+        for future in futures:
+            chunk_results, worker_metrics = future.result()
+            metrics.merge(worker_metrics)
+            results.extend(chunk_results)
+
+    assert [title for title, *_ in results] == [title for title, _ in documents]
+    assert all(outcomes["forbidden_words_check"][0] == 'X' for *_, outcomes in results)
+    assert metrics.histogram_summary("check_document_seconds")["count"] == len(documents)
+    expected_bytes = sum(os.path.getsize(path) for _, path in documents)
+    assert metrics.counter_total("file_read_bytes_total", kind="json") == expected_bytes
+    metrics.reset()
@@ -0,0 +1,62 @@
+import os
+import sys
+from docx import Document
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(current_dir)
+if project_dir not in sys.path:
+    sys.path.append(project_dir)
+
+from scripts.workspace import (find_draft_path, get_workspace_format, list_drafts, read_paragraphs, read_text,
+                               render_docx, save_draft, write_paragraphs, write_text)
+
+PARAGRAPHS = ["첫 번째 문단입니다.", "", "따옴표 \"와 역슬래시 \\ 그리고 이모지 😀", "  앞뒤 공백  ", "마지막 문단"]
+
+def test_json_round_trip(tmp_path):
+    path = str(tmp_path / "원고.json")
+    write_paragraphs(path, PARAGRAPHS)
+    assert read_paragraphs(path) == PARAGRAPHS
+    # 임시 파일이 남지 않는다
+    assert os.listdir(tmp_path) == ["원고.json"]
+
+def test_docx_round_trip(tmp_path):
+    path = str(tmp_path / "원고.docx")
+    write_paragraphs(path, PARAGRAPHS)
+    assert read_paragraphs(path) == PARAGRAPHS
+    assert [paragraph.text for paragraph in Document(path).paragraphs] == PARAGRAPHS
+
+def test_text_round_trip(tmp_path):
+    for name in ("원고.json", "원고.docx"):
+        path = str(tmp_path / name)
+        write_text(path, "가\n나\n\n다")
+        assert read_text(path) == "가\n나\n\n다"
+
+def test_render_docx_from_json(tmp_path):
+    path = str(tmp_path / "원고.json")
+    write_paragraphs(path, PARAGRAPHS)
+    docx_path = render_docx(path, str(tmp_path / "내보내기.docx"))
+    assert [paragraph.text for paragraph in Document(docx_path).paragraphs] == PARAGRAPHS
+
+def test_save_draft_keeps_one_format(tmp_path):
+    workspace_dir = str(tmp_path)
+    save_draft(workspace_dir, "제목", ["예전 원고"], "docx")
+    assert find_draft_path(workspace_dir, "제목").endswith(".docx")
+    save_draft(workspace_dir, "제목", ["새 원고"], "json")
+    assert list_drafts(workspace_dir) == {"제목": os.path.join(workspace_dir, "제목.json")}
+    assert read_paragraphs(find_draft_path(workspace_dir, "제목")) == ["새 원고"]
+
+def test_list_drafts_prefers_json(tmp_path):
+    workspace_dir = str(tmp_path)
+    write_paragraphs(os.path.join(workspace_dir, "가.docx"), ["docx"])
+    write_paragraphs(os.path.join(workspace_dir, "가.json"), ["json"])
+    write_paragraphs(os.path.join(workspace_dir, "나.docx"), ["docx"])
+    (tmp_path / "메모.txt").write_text("원고 아님", encoding="utf-8")
+    drafts = list_drafts(workspace_dir)
+    assert sorted(drafts) == ["가", "나"]
+    assert drafts["가"].endswith(".json") and drafts["나"].endswith(".docx")
+
+def test_workspace_format_setting():
+    assert get_workspace_format({}) == "docx"
+    assert get_workspace_format({"workspace_format": " JSON "}) == "json"
+    assert get_workspace_format({"workspace_format": "text"}) == "json"
+    assert get_workspace_format({"workspace_format": "pdf"}) == "docx"